@@ -0,0 +1 @@
+"""Offline benchmarks of the query path, with in-memory stand-ins."""
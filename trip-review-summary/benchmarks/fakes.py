@@ -0,0 +1,135 @@
+"""Deterministic in-memory stand-ins for OpenAI, Neo4j and tiktoken."""
+
+import re
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from review_summary.models import Entity, Relationship
+from review_summary.tokenizer.tokenizer import Tokenizer
+
+ANSWER = (
+    "Visitors praise the views from the summit and the well kept trails, "
+    "while weekend queues at the cable car are the most common complaint."
+)
+
+
+class FakeEmbeddings(DeterministicFakeEmbedding):
+    """Embed texts into normal vectors seeded by their hash, on the event loop."""
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return self.embed_query(text)
+
+
+class FakeChatModel(BaseChatModel):
+    """Answer every prompt with `answer`, streamed word by word with the usage
+    metadata in the last chunk, like ChatOpenAI with `stream_usage`."""
+
+    model_name: str = "fake-chat"
+    answer: str = ANSWER
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _usage(self, messages: list[BaseMessage]) -> dict[str, int]:
+        input_tokens = sum(len(message.text.split()) for message in messages)
+        output_tokens = len(self.answer.split())
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = AIMessage(
+            content=self.answer,
+            usage_metadata=self._usage(messages),  # type: ignore[arg-type]
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        yield from self._chunks(messages)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        for chunk in self._chunks(messages):
+            if run_manager is not None:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    def _chunks(self, messages: list[BaseMessage]) -> Iterator[ChatGenerationChunk]:
+        for token in re.split(r"(\s)", self.answer):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+        yield ChatGenerationChunk(
+            message=AIMessageChunk(
+                content="",
+                usage_metadata=self._usage(messages),  # type: ignore[arg-type]
+            )
+        )
+
+
+class InMemoryRelationshipStore:
+    """Serve relationships from memory, indexed by the ID of both their entities.
+
+    Implements the `RelationshipStore` contract of `fetch_relationships_for_entities`
+    for a single target.
+    """
+
+    def __init__(self, entities: list[Entity], relationships: list[Relationship]):
+        ids_by_title = {entity.title: entity.id for entity in entities}
+        self._by_entity: dict[str, list[Relationship]] = {}
+        for relationship in relationships:
+            endpoints = (
+                ids_by_title[relationship.source],
+                ids_by_title[relationship.target],
+            )
+            for entity_id in dict.fromkeys(endpoints):
+                self._by_entity.setdefault(entity_id, []).append(relationship)
+
+    async def fetch(self, entities: list[Entity], target_id: str) -> list[Relationship]:
+        relationships: dict[str, Relationship] = {}
+        for entity in entities:
+            for relationship in self._by_entity.get(entity.id, []):
+                relationships.setdefault(relationship.id, relationship)
+        return list(relationships.values())
+
+
+class WhitespaceTokenizer(Tokenizer):
+    """Count one token per word, for machines without the tiktoken encodings."""
+
+    encoding_name = "whitespace"
+
+    def encode(self, text: str) -> list[int]:
+        return [len(word) for word in text.split()]
+
+    def decode(self, tokens: list[int]) -> str:
+        return " ".join("x" * token for token in tokens)
@@ -0,0 +1,300 @@
+"""Offline benchmark of the local search query path.
+
+Synthetic targets of several sizes are loaded into an in-memory Qdrant, the
+relationships are served from memory and the embedding and chat models are
+deterministic fakes, so LocalSearch runs without OpenAI, Qdrant or Neo4j. Each
+target answers distinct queries, reporting the p50, p95 and p99 of every stage
+and the memory allocated per query, which are compared with a stored baseline.
+
+Usage: python -m benchmarks.local_search --sizes 1000 10000 100000
+       python -m benchmarks.local_search --save-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+
+from benchmarks.fakes import (
+    FakeChatModel,
+    FakeEmbeddings,
+    InMemoryRelationshipStore,
+    WhitespaceTokenizer,
+)
+from benchmarks.synthetic import VOCABULARY, generate_target, load_target
+from review_summary.config.embedding import EmbeddingProfile
+from review_summary.query.structured_search.local_search.mixed_content import (
+    LocalSearchMixedContext,
+)
+from review_summary.query.structured_search.local_search.search import LocalSearch
+from review_summary.tokenizer.tokenizer import Tokenizer
+from review_summary.vector_stores.entity import EntityVectorStore
+from review_summary.vector_stores.text_unit import TextUnitVectorStore
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "local_search.json"
+PERCENTILES = {"p50": 50, "p95": 95, "p99": 99}
+# Percentiles compared with the baseline, p99 is too noisy for a few hundred runs
+COMPARED_PERCENTILES = ("p50", "p95")
+
+# Stage -> percentile -> milliseconds, and the allocation percentiles in KiB
+SizeReport = dict[str, Any]
+
+
+async def benchmark_size(
+    num_text_units: int,
+    tokenizer: Tokenizer,
+    vector_dim: int,
+    num_queries: int,
+    num_warmup: int,
+    num_alloc_queries: int,
+) -> SizeReport:
+    """Benchmark LocalSearch over a synthetic target of `num_text_units`."""
+    target = generate_target(num_text_units, vector_dim)
+    profile = EmbeddingProfile(model="fake-embedding", dimensions=vector_dim)
+    client = AsyncQdrantClient(":memory:")
+    try:
+        entity_vector_store = await EntityVectorStore.create_vector_store(
+            client, profile=profile
+        )
+        text_unit_vector_store = await TextUnitVectorStore.create_vector_store(
+            client, profile=profile
+        )
+        start = time.perf_counter()
+        await load_target(target, entity_vector_store, text_unit_vector_store)
+        logger.info(
+            f"Loaded {len(target.text_units)} text units, {len(target.entities)} "
+            f"entities in {time.perf_counter() - start:.1f}s."
+        )
+
+        search = LocalSearch(
+            chat_model=FakeChatModel(),  # type: ignore
+            context_builder=LocalSearchMixedContext(
+                entity_vector_store=entity_vector_store,
+                text_unit_vector_store=text_unit_vector_store,
+                embedding_model=FakeEmbeddings(size=vector_dim),  # type: ignore
+                tokenizer=tokenizer,
+                neo4j_driver=None,  # type: ignore
+                relationship_cache=InMemoryRelationshipStore(
+                    target.entities, target.relationships
+                ),
+            ),
+            tokenizer=tokenizer,
+        )
+        queries = _queries(num_warmup + num_queries + num_alloc_queries)
+
+        for query in queries[:num_warmup]:
+            await search.search(query, target_id=target.target_id)
+
+        timings: dict[str, list[float]] = {}
+        for query in queries[num_warmup : num_warmup + num_queries]:
+            result = await search.search(query, target_id=target.target_id)
+            for stage, elapsed in {
+                **(result.timings or {}),
+                "total": result.completion_time,
+            }.items():
+                timings.setdefault(stage, []).append(elapsed * 1000)
+
+        # Allocations are traced in a separate pass, tracing slows every stage down
+        peaks: list[float] = []
+        tracemalloc.start()
+        try:
+            for query in queries[num_warmup + num_queries :]:
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                await search.search(query, target_id=target.target_id)
+                _, peak = tracemalloc.get_traced_memory()
+                peaks.append((peak - before) / 1024)
+        finally:
+            tracemalloc.stop()
+    finally:
+        await client.close()
+
+    return {
+        "stages": {stage: _percentiles(values) for stage, values in timings.items()},
+        "alloc_peak_kib": _percentiles(peaks),
+    }
+
+
+def compare(
+    report: dict[str, SizeReport],
+    baseline: dict[str, SizeReport],
+    tolerance: float,
+    min_delta_ms: float,
+) -> list[str]:
+    """Return the stages slower (or allocating more) than the baseline by more than
+    `tolerance`. Stages faster than `min_delta_ms` are too noisy to fail on."""
+    regressions: list[str] = []
+    for size, size_report in report.items():
+        if size not in baseline:
+            continue
+        base = baseline[size]
+        for stage, stats in size_report["stages"].items():
+            base_stats = base["stages"].get(stage)
+            if base_stats is None:
+                continue
+            for name in COMPARED_PERCENTILES:
+                current, previous = stats[name], base_stats[name]
+                if (
+                    current > previous * (1 + tolerance)
+                    and current - previous > min_delta_ms
+                ):
+                    regressions.append(
+                        f"{size} text units, {stage} {name}: "
+                        f"{current:.2f}ms vs {previous:.2f}ms"
+                    )
+        current, previous = (
+            size_report["alloc_peak_kib"]["p50"],
+            base["alloc_peak_kib"]["p50"],
+        )
+        if current > previous * (1 + tolerance):
+            regressions.append(
+                f"{size} text units, allocations p50: "
+                f"{current:.0f}KiB vs {previous:.0f}KiB"
+            )
+    return regressions
+
+
+def format_report(report: dict[str, SizeReport]) -> str:
+    lines: list[str] = []
+    for size, size_report in report.items():
+        lines.append(f"\n{size} text units")
+        lines.append(f"  {'stage':<30}{'p50':>10}{'p95':>10}{'p99':>10}")
+        for stage, stats in size_report["stages"].items():
+            lines.append(
+                f"  {stage:<30}"
+                + "".join(f"{stats[name]:>8.2f}ms" for name in PERCENTILES)
+            )
+        allocations = size_report["alloc_peak_kib"]
+        lines.append(
+            f"  {'allocated per query':<30}"
+            + "".join(f"{allocations[name]:>7.0f}KiB" for name in PERCENTILES)
+        )
+    return "\n".join(lines)
+
+
+async def main(args: argparse.Namespace) -> int:
+    tokenizer = _tokenizer(args.tokenizer)
+    config = {"tokenizer": args.tokenizer, "dim": args.dim}
+    report: dict[str, SizeReport] = {}
+    for size in args.sizes:
+        report[str(size)] = await benchmark_size(
+            size,
+            tokenizer=tokenizer,
+            vector_dim=args.dim,
+            num_queries=args.queries,
+            num_warmup=args.warmup,
+            num_alloc_queries=args.alloc_queries,
+        )
+    print(format_report(report))
+
+    baseline_path: Path = args.baseline
+    if args.save_baseline:
+        saved = _load(baseline_path)
+        if saved.get("config") != config:
+            saved = {"config": config, "sizes": {}}
+        saved["sizes"].update(report)
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(saved, indent=2) + "\n")
+        print(f"\nSaved the baseline to {baseline_path}.")
+        return 0
+
+    baseline = _load(baseline_path)
+    if not baseline:
+        print(f"\nNo baseline at {baseline_path}, run with --save-baseline.")
+        return 0
+    if baseline["config"] != config:
+        print(f"\nThe baseline was measured with {baseline['config']}, skip it.")
+        return 0
+    regressions = compare(report, baseline["sizes"], args.tolerance, args.min_delta)
+    if regressions:
+        print("\nRegressions against the baseline:")
+        print("\n".join(f"  {regression}" for regression in regressions))
+        return 1
+    print("\nNo regression against the baseline.")
+    return 0
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    return {
+        name: round(float(np.percentile(values, q)), 4)
+        for name, q in PERCENTILES.items()
+    }
+
+
+def _queries(count: int) -> list[str]:
+    """Distinct queries, so that no query embedding is served from the cache."""
+    rng = np.random.default_rng(42)
+    return [
+        f"What do visitors say about the {' and the '.join(rng.choice(VOCABULARY, 2))}"
+        f" (question {index})?"
+        for index in range(count)
+    ]
+
+
+def _tokenizer(name: str) -> Tokenizer:
+    if name == "whitespace":
+        return WhitespaceTokenizer()
+    from review_summary.tokenizer.tiktoken import TiktokenTokenizer
+
+    return TiktokenTokenizer(name)
+
+
+def _load(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="Numbers of text units of the synthetic targets.",
+    )
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument(
+        "--alloc-queries",
+        type=int,
+        default=20,
+        help="Queries run with tracemalloc to measure the allocations.",
+    )
+    parser.add_argument(
+        "--tokenizer",
+        default="whitespace",
+        help="'whitespace' to count words offline, or a tiktoken encoding.",
+    )
+    parser.add_argument("--dim", type=int, default=256, help="Vector dimensions.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the results as the baseline instead of comparing with it.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Relative slowdown over the baseline reported as a regression.",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.5,
+        help="Slowdowns below this many milliseconds are never regressions.",
+    )
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(main(parser.parse_args())))
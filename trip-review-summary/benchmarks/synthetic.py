@@ -0,0 +1,141 @@
+"""Synthetic targets of a given number of text units."""
+
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+from review_summary.models import Entity, Relationship, TextUnit
+from review_summary.vector_stores.entity import EntityVectorStore
+from review_summary.vector_stores.text_unit import TextUnitVectorStore
+
+VOCABULARY = (
+    "view summit trail queue ticket guide museum garden lake temple bridge tower "
+    "crowd weekend morning sunset price staff clean quiet busy family photo cable "
+    "car boat hike path local food market night light history old new long short"
+).split()
+ENTITY_TYPES = ["place", "facility", "activity", "service", "event"]
+
+# Shape of the graph extracted from reviews, per text unit
+ENTITIES_PER_TEXT_UNIT = 0.1
+TEXT_UNITS_PER_ENTITY = 8
+RELATIONSHIPS_PER_ENTITY = 3
+WORDS_PER_TEXT_UNIT = 120
+WORDS_PER_DESCRIPTION = 40
+# Token counts are word counts, trusted by the whitespace tokenizer only
+COUNTED_ENCODING = "whitespace"
+
+
+@dataclass
+class SyntheticTarget:
+    """The graph index of a target."""
+
+    target_id: str
+    text_units: list[TextUnit]
+    entities: list[Entity]
+    relationships: list[Relationship]
+
+
+def generate_target(
+    num_text_units: int, vector_dim: int, seed: int = 0
+) -> SyntheticTarget:
+    """Generate the text units, entities and relationships of a target, with
+    random unit vectors as embeddings."""
+    rng = np.random.default_rng(seed)
+    target_id = f"attraction-{num_text_units}"
+    attributes = {"target_id": target_id, "target_type": "attraction"}
+
+    text_units = [
+        TextUnit(
+            id=_uuid(rng),
+            readable_id=str(index),
+            text=_text(rng, WORDS_PER_TEXT_UNIT),
+            embedding=embedding,
+            n_tokens=WORDS_PER_TEXT_UNIT,
+            n_tokens_encoding=COUNTED_ENCODING,
+            attributes=attributes,
+        )
+        for index, embedding in enumerate(
+            _unit_vectors(rng, num_text_units, vector_dim)
+        )
+    ]
+
+    num_entities = max(int(num_text_units * ENTITIES_PER_TEXT_UNIT), 1)
+    description_embeddings = _unit_vectors(rng, num_entities, vector_dim)
+    title_embeddings = _unit_vectors(rng, num_entities, vector_dim)
+    entities: list[Entity] = []
+    for index in range(num_entities):
+        text_unit_indices = rng.choice(
+            num_text_units,
+            size=min(TEXT_UNITS_PER_ENTITY, num_text_units),
+            replace=False,
+        )
+        entities.append(
+            Entity(
+                id=_uuid(rng),
+                readable_id=str(index),
+                title=f"ENTITY {index}",
+                type=ENTITY_TYPES[index % len(ENTITY_TYPES)],
+                description=_text(rng, WORDS_PER_DESCRIPTION),
+                description_embedding=description_embeddings[index],
+                title_embedding=title_embeddings[index],
+                text_unit_ids=[text_units[i].id for i in text_unit_indices],
+                n_tokens=WORDS_PER_DESCRIPTION,
+                n_tokens_encoding=COUNTED_ENCODING,
+                rank=int(rng.integers(1, 20)),
+                attributes=attributes,
+            )
+        )
+
+    relationships: list[Relationship] = []
+    for index in range(num_entities * RELATIONSHIPS_PER_ENTITY):
+        source, target = rng.choice(num_entities, size=2, replace=num_entities < 2)
+        relationships.append(
+            Relationship(
+                id=_uuid(rng),
+                readable_id=str(index),
+                source=entities[source].title,
+                target=entities[target].title,
+                weight=float(rng.uniform(1, 10)),
+                description=_text(rng, WORDS_PER_DESCRIPTION),
+                n_tokens=WORDS_PER_DESCRIPTION,
+                n_tokens_encoding=COUNTED_ENCODING,
+                rank=int(rng.integers(1, 20)),
+                attributes=attributes,
+            )
+        )
+
+    return SyntheticTarget(target_id, text_units, entities, relationships)
+
+
+async def load_target(
+    target: SyntheticTarget,
+    entity_vector_store: EntityVectorStore,
+    text_unit_vector_store: TextUnitVectorStore,
+    batch_size: int = 1024,
+) -> None:
+    """Save the entities and text units of a target into the vector stores."""
+    for start in range(0, len(target.entities), batch_size):
+        await entity_vector_store.save_multiple(
+            target.entities[start : start + batch_size]
+        )
+    for start in range(0, len(target.text_units), batch_size):
+        await text_unit_vector_store.save_multiple(
+            target.text_units[start : start + batch_size]
+        )
+
+
+def _unit_vectors(
+    rng: np.random.Generator, count: int, dim: int
+) -> npt.NDArray[np.float32]:
+    vectors = rng.normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _text(rng: np.random.Generator, num_words: int) -> str:
+    return " ".join(rng.choice(VOCABULARY, size=num_words))
+
+
+def _uuid(rng: np.random.Generator) -> str:
+    value = rng.bytes(16).hex()
+    return f"{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}"
@@ -1,6 +1,8 @@
 import asyncio
 import logging
+import time
 from typing import Any
+from uuid import uuid4
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
@@ -13,11 +15,14 @@ from qdrant_client import AsyncQdrantClient
 from tiktoken import encoding_name_for_model
 
 from review_summary.config.settings import get_settings
+from review_summary.query.answer_cache import SemanticAnswerCache
 from review_summary.query.base import SearchResult
+from review_summary.query.fetch_data.fetch_relationship import RelationshipCache
 from review_summary.query.structured_search.local_search.mixed_content import (
     LocalSearchMixedContext,
 )
 from review_summary.query.structured_search.local_search.search import LocalSearch
+from review_summary.query.target_snapshot import TargetSnapshotCache
 from review_summary.tokenizer.tiktoken import TiktokenTokenizer
 from review_summary.vector_stores.entity import EntityVectorStore
 from review_summary.vector_stores.text_unit import TextUnitVectorStore
@@ -25,11 +30,70 @@ from review_summary.vector_stores.text_unit import TextUnitVectorStore
 logger = logging.getLogger(__name__)
 
 
+class ArtifactStreamer:
+    """Stream answer tokens as appended chunks of a single A2A artifact.
+
+    Tokens are buffered and flushed every `flush_tokens` chunks or once
+    `flush_interval` seconds have passed since the previous flush, so that clients
+    see the first tokens quickly without one event per token.
+    """
+
+    def __init__(
+        self,
+        updater: TaskUpdater,
+        flush_tokens: int = 16,
+        flush_interval: float = 0.1,
+    ):
+        self.updater = updater
+        self.flush_tokens = flush_tokens
+        self.flush_interval = flush_interval
+        self.artifact_id = str(uuid4())
+        self._buffer: list[str] = []
+        self._chunks = 0
+        self._last_flush = time.monotonic()
+
+    @property
+    def started(self) -> bool:
+        """Whether a chunk of the artifact was sent or is pending."""
+        return self._chunks > 0 or len(self._buffer) > 0
+
+    async def on_token(self, token: str) -> None:
+        """Buffer a token, flushing the buffer when it is due."""
+        self._buffer.append(token)
+        if (
+            len(self._buffer) >= self.flush_tokens
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            await self.flush()
+
+    async def flush(
+        self, last_chunk: bool = False, metadata: dict[str, Any] | None = None
+    ) -> None:
+        """Send the buffered tokens as the next chunk of the artifact."""
+        text = "".join(self._buffer)
+        self._buffer.clear()
+        self._last_flush = time.monotonic()
+        await self.updater.add_artifact(
+            parts=[Part(root=TextPart(text=text))],
+            artifact_id=self.artifact_id,
+            append=self._chunks > 0,
+            last_chunk=last_chunk,
+            metadata=metadata,
+        )
+        self._chunks += 1
+
+    async def close(self, metadata: dict[str, Any]) -> None:
+        """Send the remaining tokens with the final metadata as the last chunk."""
+        await self.flush(last_chunk=True, metadata=metadata)
+
+
 class A2aAgentExecutor(AgentExecutor):
     # Model configuration constants
     CHAT_MODEL = "gpt-4o-mini"
     CHAT_TEMPERATURE = 0.0
-    EMBEDDING_MODEL = "text-embedding-3-large"
+    # Answer streaming, flush buffered tokens every N chunks or seconds
+    STREAM_FLUSH_TOKENS = 16
+    STREAM_FLUSH_INTERVAL = 0.1
 
     def __init__(
         self, neo4j_driver: AsyncDriver, qdrant_client: AsyncQdrantClient
@@ -45,6 +109,7 @@ class A2aAgentExecutor(AgentExecutor):
 
         # Cache settings to avoid repeated calls
         self.openai_settings = get_settings().openai
+        self.embedding_profile = get_settings().embedding
 
         # Initialize core components (lazy initialization on first use)
         # These are cached across requests for better performance
@@ -52,6 +117,7 @@ class A2aAgentExecutor(AgentExecutor):
         self._embedding_model: OpenAIEmbeddings | None = None
         self._tokenizer: TiktokenTokenizer | None = None
         self._search_engine: LocalSearch | None = None
+        self._answer_cache = SemanticAnswerCache()
 
         logger.info("A2aAgentExecutor initialized successfully")
 
@@ -62,8 +128,13 @@ class A2aAgentExecutor(AgentExecutor):
 
         try:
             query, target_id = self._validate_context(context)
-            result = await self._execute_search(query, target_id, updater)
-            await self._handle_success(result, updater)
+            streamer = ArtifactStreamer(
+                updater,
+                flush_tokens=self.STREAM_FLUSH_TOKENS,
+                flush_interval=self.STREAM_FLUSH_INTERVAL,
+            )
+            result = await self._execute_search(query, target_id, updater, streamer)
+            await self._handle_success(result, updater, streamer)
 
         except Exception as e:
             # Handle any errors that occur during execution
@@ -92,8 +163,12 @@ class A2aAgentExecutor(AgentExecutor):
         """Initialize vector stores concurrently."""
         logger.debug("Initializing vector stores concurrently")
         entity_vector_store, text_unit_vector_store = await asyncio.gather(
-            EntityVectorStore.create_vector_store(client=self.qdrant_client),
-            TextUnitVectorStore.create_vector_store(client=self.qdrant_client),
+            EntityVectorStore.create_vector_store(
+                client=self.qdrant_client, profile=self.embedding_profile
+            ),
+            TextUnitVectorStore.create_vector_store(
+                client=self.qdrant_client, profile=self.embedding_profile
+            ),
         )
         logger.debug("Vector stores are initialized successfully")
         return entity_vector_store, text_unit_vector_store
@@ -114,10 +189,10 @@ class A2aAgentExecutor(AgentExecutor):
         """Get or create the embedding_model instance (lazy initialization)."""
         if self._embedding_model is None:
             logger.debug(
-                f"Initializing OpenAIEmbeddings with model: {self.EMBEDDING_MODEL}"
+                f"Initializing OpenAIEmbeddings with profile: {self.embedding_profile}"
             )
             self._embedding_model = OpenAIEmbeddings(
-                model=self.EMBEDDING_MODEL,
+                **self.embedding_profile.embedding_model_config(),
                 api_key=self.openai_settings.api_key,
                 base_url=self.openai_settings.base_url,
             )
@@ -157,6 +232,12 @@ class A2aAgentExecutor(AgentExecutor):
                 embedding_model=embedding_model,
                 tokenizer=tokenizer,
                 neo4j_driver=self.neo4j_driver,
+                snapshot_cache=TargetSnapshotCache(
+                    entity_vector_store=entity_vector_store,
+                    text_unit_vector_store=text_unit_vector_store,
+                    neo4j_driver=self.neo4j_driver,
+                ),
+                relationship_cache=RelationshipCache(self.neo4j_driver),
             )
 
             # Initialize search and cache it
@@ -164,6 +245,7 @@ class A2aAgentExecutor(AgentExecutor):
                 chat_model=chat_model,
                 context_builder=context_builder,
                 tokenizer=tokenizer,
+                answer_cache=self._answer_cache,
             )
             logger.debug("LocalSearch initialized and cached successfully")
         else:
@@ -205,9 +287,14 @@ class A2aAgentExecutor(AgentExecutor):
         return task
 
     async def _execute_search(
-        self, query: str, target_id: str, updater: TaskUpdater
+        self,
+        query: str,
+        target_id: str,
+        updater: TaskUpdater,
+        streamer: ArtifactStreamer | None = None,
     ) -> SearchResult:
-        """Execute the search operation with progress updates."""
+        """Execute the search operation with progress updates, streaming the answer
+        tokens through `streamer` as they are generated."""
         await updater.update_status(
             TaskState.working,
             new_agent_text_message(
@@ -231,7 +318,15 @@ class A2aAgentExecutor(AgentExecutor):
 
         # Execute search
         logger.info(f"Executing search for target_id: {target_id}")
-        result = await search.search(query=query, target_id=target_id)
+        result = await search.search(
+            query=query,
+            target_id=target_id,
+            on_token=streamer.on_token if streamer is not None else None,
+        )
+        if not result.response:
+            # LocalSearch answers "" when generation fails, possibly after part of
+            # the answer was streamed: fail the task instead of completing it
+            raise RuntimeError("Failed to generate the answer.")
         logger.info(
             f"Search completed - "
             f"tokens: {result.prompt_tokens + result.output_tokens}, "
@@ -239,15 +334,31 @@ class A2aAgentExecutor(AgentExecutor):
         )
         return result
 
-    async def _handle_success(self, result: SearchResult, updater: TaskUpdater) -> None:
-        """Handle successful search result."""
+    async def _handle_success(
+        self,
+        result: SearchResult,
+        updater: TaskUpdater,
+        streamer: ArtifactStreamer | None = None,
+    ) -> None:
+        """Handle successful search result.
+
+        A streamed answer is closed with a last chunk carrying the metadata,
+        otherwise the whole answer is sent as one artifact.
+        """
         metadata: dict[str, Any] = {
             "completion_time": result.completion_time,
             "llm_calls": result.llm_calls,
             "prompt_tokens": result.prompt_tokens,
             "output_tokens": result.output_tokens,
+            "answer_cache_similarity": result.answer_cache_similarity,
         }
 
+        if streamer is not None and streamer.started:
+            await streamer.close(metadata)
+            await updater.complete()
+            logger.info(f"Task {updater.task_id} completed successfully")
+            return
+
         if isinstance(result.response, str):
             parts = [Part(root=TextPart(text=result.response))]
         elif isinstance(result.response, dict):
@@ -28,3 +28,6 @@ class QueryCallbacks(BaseLLMCallback):
 
     def on_llm_new_token(self, token: str) -> None:
         """Handle when a new token is generated."""
+
+    def on_timings(self, timings: dict[str, float]) -> None:
+        """Handle the seconds spent in each stage of the query, once answered."""
@@ -0,0 +1,171 @@
+import re
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+from qdrant_client import models
+
+# Native output dimensions of the OpenAI embedding models
+NATIVE_DIMENSIONS = {
+    "text-embedding-3-large": 3072,
+    "text-embedding-3-small": 1536,
+    "text-embedding-ada-002": 1536,
+}
+
+
+class EmbeddingProfile(BaseModel):
+    """The embedding model, vector dimensions and storage dtype of the indices.
+
+    Shared by the index tasks, the query side and the vector stores, so that the
+    stored vectors and the query vectors always come from the same model.
+    """
+
+    model: str = Field(
+        default="text-embedding-3-large",
+        description="The OpenAI embedding model.",
+    )
+    dimensions: int | None = Field(
+        default=None,
+        description="The reduced output dimensions of text-embedding-3 models, "
+        "None for the native dimensions of the model.",
+    )
+    dtype: Literal["float32", "float16"] = Field(
+        default="float32",
+        description="The datatype the vectors are stored with in Qdrant.",
+    )
+
+    @property
+    def vector_dim(self) -> int:
+        """The dimensions of the vectors produced by the profile."""
+        if self.dimensions is not None:
+            return self.dimensions
+        if self.model not in NATIVE_DIMENSIONS:
+            raise ValueError(f"Set the dimensions of embedding model {self.model}.")
+        return NATIVE_DIMENSIONS[self.model]
+
+    @property
+    def datatype(self) -> models.Datatype:
+        return models.Datatype(self.dtype)
+
+    def embedding_model_config(self) -> dict[str, Any]:
+        """Return the OpenAIEmbeddings arguments of the profile."""
+        config: dict[str, Any] = {"model": self.model}
+        if self.dimensions is not None:
+            config["dimensions"] = self.dimensions
+        return config
+
+    def collection_name(self, base_name: str) -> str:
+        """Return the name of the collection holding the vectors of the profile.
+
+        The default profile keeps the base name of the existing collections, other
+        profiles get their own collections so that they can be filled side by side.
+        """
+        if (self.model, self.vector_dim, self.dtype) == (
+            "text-embedding-3-large",
+            3072,
+            "float32",
+        ):
+            return base_name
+        suffix = re.sub(r"[^0-9a-zA-Z]+", "_", self.model)
+        return f"{base_name}_{suffix}_{self.vector_dim}_{self.dtype}"
+
+
+class CollectionConfig(BaseModel):
+    """Storage and search options of the Qdrant collections."""
+
+    quantization: Literal["none", "scalar", "binary"] = Field(
+        default="scalar",
+        description="Quantization of the vectors, int8 scalar or 1-bit binary.",
+    )
+    quantization_always_ram: bool = Field(
+        default=True,
+        description="Whether to keep the quantized vectors in RAM.",
+    )
+    rescore: bool = Field(
+        default=True,
+        description="Whether to rescore quantized search results "
+        "with the original vectors.",
+    )
+    oversampling: float = Field(
+        default=2.0,
+        description="The factor of candidates fetched with quantized vectors "
+        "before rescoring.",
+    )
+    on_disk: bool = Field(
+        default=True,
+        description="Whether to store the original vectors on disk (memmap).",
+    )
+    hnsw_m: int = Field(
+        default=16,
+        description="The number of edges per node in the HNSW graph.",
+    )
+    hnsw_ef_construct: int = Field(
+        default=100,
+        description="The number of neighbours considered when building HNSW.",
+    )
+    hnsw_payload_m: int | None = Field(
+        default=16,
+        description="The number of edges per node in the per-tenant HNSW graphs.",
+    )
+    hnsw_ef: int | None = Field(
+        default=None,
+        description="The size of the HNSW search beam, None for the server default.",
+    )
+
+    query_batch_window: float | None = Field(
+        default=0.001,
+        description="Seconds to gather concurrent searches into one batch request, "
+        "None to send each search alone.",
+    )
+    query_batch_size: int = Field(
+        default=64,
+        description="The maximum number of searches in one batch request.",
+    )
+
+    def vector_params(
+        self, size: int, datatype: models.Datatype = models.Datatype.FLOAT32
+    ) -> models.VectorParams:
+        return models.VectorParams(
+            size=size,
+            distance=models.Distance.COSINE,
+            on_disk=self.on_disk,
+            datatype=datatype,
+        )
+
+    def hnsw_config(self) -> models.HnswConfigDiff:
+        return models.HnswConfigDiff(
+            m=self.hnsw_m,
+            ef_construct=self.hnsw_ef_construct,
+            payload_m=self.hnsw_payload_m,
+        )
+
+    def quantization_config(self) -> models.QuantizationConfig | None:
+        if self.quantization == "scalar":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=self.quantization_always_ram,
+                )
+            )
+        if self.quantization == "binary":
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(
+                    always_ram=self.quantization_always_ram
+                )
+            )
+        return None
+
+    def search_params(self) -> models.SearchParams | None:
+        """Search parameters of the queries, None when the defaults apply."""
+        if self.quantization == "none" and self.hnsw_ef is None:
+            return None
+        return models.SearchParams(
+            hnsw_ef=self.hnsw_ef,
+            quantization=(
+                models.QuantizationSearchParams(
+                    rescore=self.rescore, oversampling=self.oversampling
+                )
+                if self.quantization != "none"
+                else None
+            ),
+        )
@@ -0,0 +1,58 @@
+from pydantic import BaseModel, Field
+
+
+class CollectTextUnitsConfig(BaseModel):
+    """Configuration for collect_text_units task."""
+
+    max_text_units: int = Field(
+        default=1024,
+        description="The maximum number of text units to collect for a target. "
+        "With sampling enabled, all text units are collected and this is the "
+        "maximum number of sampled ones.",
+    )
+
+    # For deduplicate_text_units operation
+    dedup_enabled: bool = Field(
+        default=True,
+        description="A flag indicating whether to drop near-duplicate text units.",
+    )
+    dedup_threshold: float = Field(
+        default=0.8,
+        ge=0.0,
+        le=1.0,
+        description="The estimated Jaccard similarity at which units are duplicates.",
+    )
+    dedup_num_perm: int = Field(
+        default=128,
+        description="The number of MinHash permutations (signature length).",
+    )
+    dedup_num_bands: int = Field(
+        default=32,
+        description="The number of LSH bands, must divide dedup_num_perm.",
+    )
+    dedup_shingle_size: int = Field(
+        default=3,
+        description="The number of consecutive tokens in each shingle.",
+    )
+
+    # For sample_text_units operation
+    sampling_enabled: bool = Field(
+        default=False,
+        description="A flag indicating whether to sample representative text units.",
+    )
+    sampling_token_budget: int = Field(
+        default=200_000,
+        description="The maximum total tokens of the sampled text units.",
+    )
+    sampling_num_clusters: int = Field(
+        default=32,
+        description="The number of k-means clusters used to cover review themes.",
+    )
+    sampling_batch_size: int = Field(
+        default=256,
+        description="The mini-batch size of the k-means clustering.",
+    )
+    sampling_max_iter: int = Field(
+        default=100,
+        description="The maximum number of mini-batch k-means iterations.",
+    )
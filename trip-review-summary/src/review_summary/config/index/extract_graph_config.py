@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -22,6 +22,13 @@ class ExtractGraphConfig(BaseModel):
         default=4,
         description="The number of coroutines used for parallel processing.",
     )
+    extraction_mode: Literal["text", "structured"] = Field(
+        default="text",
+        description=(
+            "The graph extraction output format, either delimited text records or "
+            "JSON structured output with a fallback to text records."
+        ),
+    )
 
     # For summarize_descriptions operation
     summary_llm_config: dict[str, Any] = Field(
@@ -39,3 +46,40 @@ class ExtractGraphConfig(BaseModel):
         default=4,
         description="The number of coroutines used for parallel processing.",
     )
+    summary_tiered: bool = Field(
+        default=True,
+        description=(
+            "A flag indicating whether to concatenate or extract short description "
+            "sets and only call the LLM for large or conflicting ones."
+        ),
+    )
+    summary_extractive_max_length: int = Field(
+        default=2000,
+        description="Maximum combined words summarized extractively without the LLM.",
+    )
+    summary_conflict_threshold: float = Field(
+        default=0.2,
+        description=(
+            "Minimum TF-IDF similarity between every description and their centroid "
+            "below which descriptions are considered conflicting."
+        ),
+    )
+    summary_batched: bool = Field(
+        default=False,
+        description=(
+            "A flag indicating whether to summarize several entities and "
+            "relationships in one structured output LLM call."
+        ),
+    )
+    summary_batch_max_tokens: int = Field(
+        default=8000,
+        description="Maximum description tokens packed into one batched LLM call.",
+    )
+    summary_batch_max_size: int = Field(
+        default=10,
+        description="Maximum number of items summarized in one batched LLM call.",
+    )
+    summary_batch_max_retries: int = Field(
+        default=1,
+        description="The number of retries for items missing from a batch response.",
+    )
@@ -4,6 +4,13 @@ from pydantic import BaseModel, Field
 class FinalizeGraphConfig(BaseModel):
     """Configuration for finalize_graph task."""
 
+    encoding_name: str = Field(
+        default="o200k_base",
+        description="The tiktoken encoding used to count description tokens. "
+        "Queries only use the stored counts when their chat model has the same "
+        "encoding (o200k_base for gpt-4o-mini).",
+    )
+
     # For embed_graph operation
     embed_graph_enabled: bool = Field(
         default=False,
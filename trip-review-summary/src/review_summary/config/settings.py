@@ -4,6 +4,8 @@ from typing import Any, Literal
 from pydantic import BaseModel, Field, SecretStr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from review_summary.config.embedding import CollectionConfig, EmbeddingProfile
+
 
 class AppSettings(BaseModel):
     name: str = Field(default="trip-review-summary")
@@ -27,7 +29,13 @@ class NacosSettings(BaseModel):
 
 
 class QdrantSettings(BaseModel):
+    """Loaded from environment variables:
+    - QDRANT_URL
+    - QDRANT_COLLECTION, as JSON, e.g. {"quantization": "binary"}
+    """
+
     url: str = Field(default="http://localhost:6333")
+    collection: CollectionConfig = Field(default_factory=CollectionConfig)
 
 
 class Neo4jSettings(BaseModel):
@@ -89,6 +97,8 @@ class Settings(BaseSettings):
     neo4j: Neo4jSettings = Field(default_factory=Neo4jSettings)
     rocketmq: RocketmqSettings = Field(default_factory=RocketmqSettings)
     openai: OpenAISettings = Field(default_factory=OpenAISettings)
+    # EMBEDDING_MODEL, EMBEDDING_DIMENSIONS and EMBEDDING_DTYPE
+    embedding: EmbeddingProfile = Field(default_factory=EmbeddingProfile)
     log: LogSettings = Field(default_factory=LogSettings)
     celery: CelerySettings = Field(default_factory=CelerySettings)
     minio: MinioSettings = Field(default_factory=MinioSettings)
@@ -0,0 +1,49 @@
+"""Parquet checkpoints passed between the indexing tasks through MinIO."""
+
+import logging
+from typing import Any, cast
+
+import fsspec  # type: ignore  # pyright: ignore[reportMissingTypeStubs]
+import pandas as pd
+
+from review_summary.index.profiler import is_profiling, record
+from review_summary.utils.storage import get_storage_options
+
+logger = logging.getLogger(__name__)
+
+BUCKET = "review-summary"
+
+
+def read_checkpoint(filename: str) -> pd.DataFrame:
+    """Read a checkpoint with the pyarrow dtype backend."""
+    df = pd.read_parquet(
+        f"s3://{BUCKET}/{filename}",
+        storage_options=get_storage_options(),
+        dtype_backend="pyarrow",
+    )
+    if is_profiling():
+        record(bytes_read=_checkpoint_size(filename), rows_in=len(df))
+    return df
+
+
+def write_checkpoint(df: pd.DataFrame, filename: str) -> None:
+    """Write a checkpoint."""
+    df.to_parquet(f"s3://{BUCKET}/{filename}", storage_options=get_storage_options())
+    if is_profiling():
+        record(bytes_written=_checkpoint_size(filename), rows_out=len(df))
+
+
+def _checkpoint_size(filename: str) -> int:
+    """Return the size of a checkpoint in bytes, 0 if it cannot be stat'ed."""
+    try:
+        # pandas reads and writes s3:// paths with fsspec (s3fs) as well
+        fs, path = cast(
+            "tuple[Any, str]",
+            fsspec.core.url_to_fs(  # pyright: ignore[reportUnknownMemberType]
+                f"s3://{BUCKET}/{filename}", **get_storage_options()
+            ),
+        )
+        return int(fs.size(path))
+    except Exception as e:
+        logger.warning(f"Failed to get the size of checkpoint {filename}: {e}")
+        return 0
@@ -24,6 +24,11 @@ def create_graph(
     edges["target"] = edges["target"].map(title_to_id)
 
     with neo4j_driver.session() as session:  # pyright: ignore
+        # Unique entity IDs back the index seeks of relationship queries
+        session.run(
+            "CREATE CONSTRAINT entity_id "
+            "IF NOT EXISTS FOR (n:Entity) REQUIRE n.id IS UNIQUE"
+        )
         # Create indexes to optimize queries by target_id
         session.run(
             "CREATE INDEX entity_target_id "
@@ -50,6 +55,8 @@ def create_graph(
                 n.type = entity.type,
                 n.description = entity.description,
                 n.frequency = entity.frequency,
+                n.n_tokens = entity.n_tokens,
+                n.n_tokens_encoding = entity.n_tokens_encoding,
                 n.target_id = entity.target_id,
                 n.target_type = entity.target_type
             """,
@@ -69,6 +76,8 @@ def create_graph(
             SET r.readable_id = rel.readable_id,
                 r.description = rel.description,
                 r.weight = rel.weight,
+                r.n_tokens = rel.n_tokens,
+                r.n_tokens_encoding = rel.n_tokens_encoding,
                 r.target_id = rel.target_id,
                 r.target_type = rel.target_type
             """,
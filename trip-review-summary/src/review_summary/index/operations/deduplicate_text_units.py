@@ -0,0 +1,153 @@
+import logging
+import re
+import zlib
+from collections import defaultdict
+from typing import Any, cast
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime used by the universal hash family (a * x + b) mod p.
+# Both a and x stay below 2**32, so the product never overflows uint64.
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def deduplicate_text_units(
+    text_units: pd.DataFrame,
+    text_column: str = "text",
+    id_column: str = "id",
+    threshold: float = 0.8,
+    num_perm: int = 128,
+    num_bands: int = 32,
+    shingle_size: int = 3,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """Drop near-duplicate text units using MinHash signatures and LSH banding.
+
+    The first text unit of every duplicate group is kept; the IDs of the dropped
+    units are recorded in its `attributes` as `duplicate_ids`, together with a
+    `duplicate_count` that downstream steps can use as a weight.
+    """
+    if len(text_units) == 0:
+        return text_units
+
+    signatures = compute_minhash_signatures(
+        texts=[str(text) for text in text_units[text_column]],
+        num_perm=num_perm,
+        shingle_size=shingle_size,
+        seed=seed,
+    )
+    duplicates = find_near_duplicates(
+        signatures, num_bands=num_bands, threshold=threshold
+    )
+
+    ids = [str(id) for id in text_units[id_column]]
+    duplicate_ids: defaultdict[int, list[str]] = defaultdict(list)
+    for duplicate, representative in duplicates.items():
+        duplicate_ids[representative].append(ids[duplicate])
+
+    attributes: list[dict[str, Any]] = []
+    for index, value in enumerate(text_units["attributes"]):
+        attribute: dict[str, Any] = (
+            dict(cast("dict[str, Any]", value)) if isinstance(value, dict) else {}
+        )
+        attribute["duplicate_ids"] = duplicate_ids.get(index, [])
+        attribute["duplicate_count"] = len(attribute["duplicate_ids"])
+        attributes.append(attribute)
+
+    keep = np.ones(len(text_units), dtype=bool)
+    keep[list(duplicates.keys())] = False
+    deduplicated = text_units.assign(
+        attributes=pd.Series(attributes, index=text_units.index, dtype=object)
+    ).loc[keep]
+    logger.info(
+        f"Dropped {len(duplicates)} near-duplicate text units out of {len(text_units)}."
+    )
+    return deduplicated.reset_index(drop=True)
+
+
+def compute_minhash_signatures(
+    texts: list[str], num_perm: int = 128, shingle_size: int = 3, seed: int = 42
+) -> npt.NDArray[np.uint64]:
+    """Compute a (len(texts), num_perm) matrix of MinHash signatures."""
+    generator = np.random.default_rng(seed)
+    a = generator.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    b = generator.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    signatures = np.full((len(texts), num_perm), _MAX_HASH, dtype=np.uint64)
+    for index, text in enumerate(texts):
+        hashes = _shingle_hashes(text, shingle_size)
+        if hashes.size == 0:
+            continue
+        permuted = (hashes[:, np.newaxis] * a + b) % _MERSENNE_PRIME
+        signatures[index] = permuted.min(axis=0)
+    return signatures
+
+
+def find_near_duplicates(
+    signatures: npt.NDArray[np.uint64], num_bands: int = 32, threshold: float = 0.8
+) -> dict[int, int]:
+    """Map the row index of every near-duplicate to its representative row index.
+
+    Rows sharing an identical band slice land in the same LSH bucket. Every pair of
+    bucket members is confirmed by the estimated Jaccard similarity (the fraction of
+    equal MinHash values), and confirmed pairs are merged with union-find so that
+    every duplicate group is represented by its lowest row index.
+    """
+    num_rows, num_perm = signatures.shape
+    if num_perm % num_bands != 0:
+        raise ValueError(
+            f"num_bands ({num_bands}) must divide the signature length ({num_perm})."
+        )
+    rows_per_band = num_perm // num_bands
+
+    parents = list(range(num_rows))
+
+    def _find(row: int) -> int:
+        while parents[row] != row:
+            parents[row] = parents[parents[row]]
+            row = parents[row]
+        return row
+
+    checked: set[tuple[int, int]] = set()
+    for band in range(num_bands):
+        buckets: defaultdict[bytes, list[int]] = defaultdict(list)
+        band_slice = signatures[:, band * rows_per_band : (band + 1) * rows_per_band]
+        for row in range(num_rows):
+            buckets[band_slice[row].tobytes()].append(row)
+
+        for bucket in buckets.values():
+            for position, row in enumerate(bucket):
+                for other in bucket[position + 1 :]:
+                    root_row, root_other = _find(row), _find(other)
+                    if root_row == root_other or (row, other) in checked:
+                        continue
+                    checked.add((row, other))
+                    equal = np.count_nonzero(signatures[row] == signatures[other])
+                    similarity = equal / num_perm
+                    if similarity >= threshold:
+                        parents[max(root_row, root_other)] = min(root_row, root_other)
+
+    duplicates: dict[int, int] = {}
+    for row in range(num_rows):
+        representative = _find(row)
+        if representative != row:
+            duplicates[row] = representative
+    return duplicates
+
+
+def _shingle_hashes(text: str, shingle_size: int) -> npt.NDArray[np.uint64]:
+    tokens = re.findall(r"\w+", text.lower())
+    if len(tokens) == 0:
+        return np.empty(0, dtype=np.uint64)
+    size = min(shingle_size, len(tokens))
+    shingles = {" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+    return np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
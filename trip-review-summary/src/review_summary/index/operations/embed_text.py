@@ -5,22 +5,32 @@ import asyncio
 from typing import Any
 
 import numpy as np
+import numpy.typing as npt
 from langchain_openai.embeddings import OpenAIEmbeddings
 from tiktoken import encoding_name_for_model
 
 from review_summary.config.settings import get_settings
+from review_summary.index.profiler import record
 from review_summary.index.text_splitting import TokenTextSplitter
 from review_summary.tokenizer.tiktoken import TiktokenTokenizer
 
 
 async def embed_text(
     texts: list[str],
-    embedding_model_config: dict[str, Any],
+    embedding_model_config: dict[str, Any] | None = None,
     batch_size: int = 16,
     batch_max_tokens: int = 8191,
     num_concurrency: int = 4,
-) -> list[list[float] | None]:
-    openai_settings = get_settings().openai
+) -> list[npt.NDArray[np.float32] | None]:
+    """Embed texts, with the configured embedding profile by default.
+
+    Every embedding is a float32 row view of the matrix of its request batch.
+    """
+    settings = get_settings()
+    embedding_model_config = dict(
+        embedding_model_config or settings.embedding.embedding_model_config()
+    )
+    openai_settings = settings.openai
     if "api_key" not in embedding_model_config:
         embedding_model_config["api_key"] = openai_settings.api_key
     if "base_url" not in embedding_model_config:
@@ -36,24 +46,32 @@ async def embed_text(
     # Break up the input texts. The sizes here indicate
     # how many snippets are in each input text
     texts, input_sizes = _prepare_embed_texts(texts, splitter)
-    text_batches = _create_text_batches(texts, batch_size, batch_max_tokens, splitter)
+    text_batches, batch_tokens = _create_text_batches(
+        texts, batch_size, batch_max_tokens, splitter
+    )
 
     # Embed each chunk of snippets
-    embeddings = await _execute(model, text_batches, semaphore)
+    embeddings = await _execute(model, text_batches, batch_tokens, semaphore)
     return _reconstitute_embeddings(embeddings, input_sizes)
 
 
 async def _execute(
-    model: OpenAIEmbeddings, chunks: list[list[str]], semaphore: asyncio.Semaphore
-) -> list[list[float]]:
-    async def embed(chunk: list[str]) -> np.ndarray:
+    model: OpenAIEmbeddings,
+    chunks: list[list[str]],
+    chunk_tokens: list[int],
+    semaphore: asyncio.Semaphore,
+) -> list[npt.NDArray[np.float32]]:
+    async def embed(chunk: list[str], tokens: int) -> npt.NDArray[np.float32]:
         async with semaphore:
             chunk_embeddings = await model.aembed_documents(chunk)
-        return np.array(chunk_embeddings)
+        record(llm_calls=1, prompt_tokens=tokens)
+        return np.array(chunk_embeddings, dtype=np.float32)
 
-    futures = [embed(chunk) for chunk in chunks]
+    futures = [
+        embed(chunk, tokens) for chunk, tokens in zip(chunks, chunk_tokens, strict=True)
+    ]
     results = await asyncio.gather(*futures)
-    # merge results in a single list of lists (reduce the collect dimension)
+    # merge results in a single list of vectors (reduce the collect dimension)
     return [item for sublist in results for item in sublist]
 
 
@@ -62,12 +80,13 @@ def _create_text_batches(
     max_batch_size: int,
     max_batch_tokens: int,
     splitter: TokenTextSplitter,
-) -> list[list[str]]:
-    """Create batches of texts to embed."""
+) -> tuple[list[list[str]], list[int]]:
+    """Create batches of texts to embed, return them with their token counts."""
     # https://learn.microsoft.com/en-us/azure/ai-services/openai/reference
     # According to this embeddings reference, Azure limits us to
     # 16 concurrent embeddings and 8191 tokens per request
     result: list[list[str]] = []
+    result_tokens: list[int] = []
     current_batch: list[str] = []
     current_batch_tokens = 0
 
@@ -78,6 +97,7 @@ def _create_text_batches(
             or current_batch_tokens + token_count > max_batch_tokens
         ):
             result.append(current_batch)
+            result_tokens.append(current_batch_tokens)
             current_batch = []
             current_batch_tokens = 0
 
@@ -86,8 +106,9 @@ def _create_text_batches(
 
     if len(current_batch) > 0:
         result.append(current_batch)
+        result_tokens.append(current_batch_tokens)
 
-    return result
+    return result, result_tokens
 
 
 def _prepare_embed_texts(
@@ -110,10 +131,10 @@ def _prepare_embed_texts(
 
 
 def _reconstitute_embeddings(
-    raw_embeddings: list[list[float]], sizes: list[int]
-) -> list[list[float] | None]:
+    raw_embeddings: list[npt.NDArray[np.float32]], sizes: list[int]
+) -> list[npt.NDArray[np.float32] | None]:
     """Reconstitute the embeddings into the original input texts."""
-    embeddings: list[list[float] | None] = []
+    embeddings: list[npt.NDArray[np.float32] | None] = []
     cursor = 0
     for size in sizes:
         if size == 0:
@@ -126,6 +147,6 @@ def _reconstitute_embeddings(
             chunk = raw_embeddings[cursor : cursor + size]
             average = np.average(chunk, axis=0)
             normalized = average / np.linalg.norm(average)
-            embeddings.append(normalized.tolist())
+            embeddings.append(normalized.astype(np.float32))
             cursor += size
     return embeddings
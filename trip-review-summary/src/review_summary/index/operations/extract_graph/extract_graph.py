@@ -7,7 +7,10 @@ import pandas as pd
 from langchain_openai import ChatOpenAI
 
 from review_summary.config.settings import get_settings
-from review_summary.index.operations.extract_graph.graph_extractor import GraphExtractor
+from review_summary.index.operations.extract_graph.graph_extractor import (
+    ExtractionMode,
+    GraphExtractor,
+)
 from review_summary.index.operations.extract_graph.typing import ExtractionResult, Unit
 
 logger = logging.getLogger(__name__)
@@ -25,6 +28,7 @@ async def extract_graph(
     completion_delimiter: str | None = None,
     extraction_prompt: str | None = None,
     num_concurrency: int = 4,
+    extraction_mode: ExtractionMode = "text",
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
     semaphore = asyncio.Semaphore(num_concurrency)
 
@@ -50,6 +54,7 @@ async def extract_graph(
                 record_delimiter=record_delimiter,
                 completion_delimiter=completion_delimiter,
                 extraction_prompt=extraction_prompt,
+                extraction_mode=extraction_mode,
             )
 
     text_units_df = text_units[[id_column, text_column]]
@@ -106,9 +111,13 @@ async def _run_graph_extraction(
     record_delimiter: str | None = None,
     completion_delimiter: str | None = None,
     extraction_prompt: str | None = None,
+    extraction_mode: ExtractionMode = "text",
 ) -> ExtractionResult:
     extractor = GraphExtractor(
-        chat_model=chat_model, prompt=extraction_prompt, max_gleanings=max_gleanings
+        chat_model=chat_model,
+        prompt=extraction_prompt,
+        max_gleanings=max_gleanings,
+        mode=extraction_mode,
     )
     text_list = [unit.text.strip() for unit in units]
 
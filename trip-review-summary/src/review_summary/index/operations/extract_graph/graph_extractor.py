@@ -8,16 +8,21 @@ from __future__ import annotations
 import logging
 import re
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Literal
 
 import networkx as nx
-from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.runnables import Runnable
 from langchain_openai import ChatOpenAI
+from pydantic import BaseModel, Field
 
 from review_summary.prompts.index.extract_graph import (
     CONTINUE_PROMPT,
     GRAPH_EXTRACTION_PROMPT,
     LOOP_PROMPT,
+    STRUCTURED_CONTINUE_PROMPT,
+    STRUCTURED_GRAPH_EXTRACTION_PROMPT,
 )
 from review_summary.utils.string import clean_str
 
@@ -25,9 +30,37 @@ DEFAULT_TUPLE_DELIMITER = "<|>"
 DEFAULT_RECORD_DELIMITER = "##"
 DEFAULT_COMPLETION_DELIMITER = "<|COMPLETE|>"
 
+ExtractionMode = Literal["text", "structured"]
+
 logger = logging.getLogger(__name__)
 
 
+class ExtractedEntity(BaseModel):
+    name: str = Field(..., description="Name of the entity, capitalized.")
+    type: str = Field(..., description="One of the requested entity types.")
+    description: str = Field(
+        ..., description="Comprehensive description of the entity."
+    )
+
+
+class ExtractedRelationship(BaseModel):
+    source: str = Field(..., description="Name of the source entity.")
+    target: str = Field(..., description="Name of the target entity.")
+    description: str = Field(
+        ..., description="Why the source and target entities are related."
+    )
+    strength: float = Field(
+        default=1.0, description="Strength of the relationship between entities."
+    )
+
+
+class ExtractedGraph(BaseModel):
+    entities: list[ExtractedEntity] = Field(default_factory=list[ExtractedEntity])
+    relationships: list[ExtractedRelationship] = Field(
+        default_factory=list[ExtractedRelationship]
+    )
+
+
 @dataclass
 class GraphExtractionResult:
     """Unipartite graph extraction result class definition."""
@@ -37,7 +70,13 @@ class GraphExtractionResult:
 
 
 class GraphExtractor:
-    """Unipartite graph extractor class definition."""
+    """Unipartite graph extractor class definition.
+
+    In `text` mode the LLM emits delimited `("entity"<|>...)` records which are
+    parsed by string splitting. In `structured` mode the LLM answers with JSON
+    structured output validated against `ExtractedGraph` in one pass; documents
+    whose structured extraction fails fall back to the text mode.
+    """
 
     def __init__(
         self,
@@ -50,6 +89,8 @@ class GraphExtractor:
         prompt: str | None = None,
         join_descriptions: bool = True,
         max_gleanings: int | None = None,
+        mode: ExtractionMode = "text",
+        structured_prompt: str | None = None,
     ):
         """Init method definition."""
         self._model = chat_model
@@ -63,6 +104,17 @@ class GraphExtractor:
         self._entity_types_key = entity_types_key or "entity_types"
         self._extraction_prompt = prompt or GRAPH_EXTRACTION_PROMPT
         self._max_gleanings = max_gleanings if max_gleanings is not None else 1
+        self._mode: ExtractionMode = mode
+        self._structured_prompt = (
+            structured_prompt or STRUCTURED_GRAPH_EXTRACTION_PROMPT
+        )
+        self._structured_model: Runnable[LanguageModelInput, Any] | None = (
+            chat_model.with_structured_output(  # pyright: ignore[reportUnknownMemberType]
+                ExtractedGraph, method="json_schema"
+            )
+            if mode == "structured"
+            else None
+        )
 
     async def __call__(
         self, texts: list[str], prompt_variables: dict[str, Any] | None = None
@@ -71,6 +123,7 @@ class GraphExtractor:
         if prompt_variables is None:
             prompt_variables = {}
         all_records: dict[int, str] = {}
+        all_graphs: dict[int, ExtractedGraph] = {}
         source_doc_map: dict[int, str] = {}
 
         # Wire defaults into the prompt variables
@@ -88,6 +141,18 @@ class GraphExtractor:
         }
 
         for doc_index, text in enumerate(texts):
+            if self._structured_model is not None:
+                try:
+                    extracted = await self._process_document_structured(
+                        text, prompt_variables
+                    )
+                    source_doc_map[doc_index] = text
+                    all_graphs[doc_index] = extracted
+                    continue
+                except Exception as e:
+                    logger.warning(
+                        f"Structured graph extraction failed, fall back to text: {e}"
+                    )
             try:
                 # Invoke the entity extraction
                 result = await self._process_document(text, prompt_variables)
@@ -101,6 +166,7 @@ class GraphExtractor:
             prompt_variables.get(self._tuple_delimiter_key, DEFAULT_TUPLE_DELIMITER),
             prompt_variables.get(self._record_delimiter_key, DEFAULT_RECORD_DELIMITER),
         )
+        self._process_structured_results(all_graphs, output)
 
         return GraphExtractionResult(
             output=output,
@@ -144,6 +210,66 @@ class GraphExtractor:
 
         return results
 
+    async def _process_document_structured(
+        self, text: str, prompt_variables: dict[str, str]
+    ) -> ExtractedGraph:
+        assert self._structured_model is not None
+        history: list[BaseMessage] = [
+            HumanMessage(
+                self._structured_prompt.format(
+                    **{**prompt_variables, self._input_text_key: text}
+                ),
+            )
+        ]
+        extracted = ExtractedGraph.model_validate(
+            await self._structured_model.ainvoke(history)
+        )
+        history.append(AIMessage(extracted.model_dump_json()))
+
+        # Same exit criteria as the text mode gleaning loop
+        for i in range(self._max_gleanings):
+            history.append(HumanMessage(STRUCTURED_CONTINUE_PROMPT))
+            gleaned = ExtractedGraph.model_validate(
+                await self._structured_model.ainvoke(history)
+            )
+            history.append(AIMessage(gleaned.model_dump_json()))
+            extracted.entities.extend(gleaned.entities)
+            extracted.relationships.extend(gleaned.relationships)
+
+            if i >= self._max_gleanings - 1:
+                break
+
+            history.append(HumanMessage(LOOP_PROMPT))
+            response = await self._model.ainvoke(history)
+            history.append(response)
+            if response.text != "Y":
+                break
+
+        return extracted
+
+    def _process_structured_results(
+        self, results: dict[int, ExtractedGraph], graph: nx.Graph[str]
+    ) -> None:
+        """Merge validated structured extraction results into the graph."""
+        for source_doc_id, extracted in results.items():
+            for entity in extracted.entities:
+                self._add_entity(
+                    graph,
+                    entity_name=clean_str(entity.name.upper()),
+                    entity_type=clean_str(entity.type.upper()),
+                    entity_description=clean_str(entity.description),
+                    source_doc_id=source_doc_id,
+                )
+            for relationship in extracted.relationships:
+                self._add_relationship(
+                    graph,
+                    source=clean_str(relationship.source.upper()),
+                    target=clean_str(relationship.target.upper()),
+                    edge_description=clean_str(relationship.description),
+                    weight=relationship.strength,
+                    source_doc_id=source_doc_id,
+                )
+
     async def _process_results(
         self, results: dict[int, str], tuple_delimiter: str, record_delimiter: str
     ) -> nx.Graph[str]:
@@ -168,83 +294,96 @@ class GraphExtractor:
 
                 if record_attributes[0] == '"entity"' and len(record_attributes) >= 4:
                     # add this record as a node in the G
-                    entity_name = clean_str(record_attributes[1].upper())
-                    entity_type = clean_str(record_attributes[2].upper())
-                    entity_description = clean_str(record_attributes[3])
-
-                    if entity_name in graph.nodes():
-                        node = graph.nodes[entity_name]
-                        if self._join_descriptions:
-                            node["description"] = "\n".join(
-                                list({*_unpack_descriptions(node), entity_description})
-                            )
-                        else:
-                            if len(entity_description) > len(node["description"]):
-                                node["description"] = entity_description
-                        node["source_id"] = ", ".join(
-                            list({*_unpack_source_ids(node), str(source_doc_id)})
-                        )
-                        node["type"] = (
-                            entity_type if entity_type != "" else node["type"]
-                        )
-                    else:
-                        graph.add_node(
-                            entity_name,
-                            type=entity_type,
-                            description=entity_description,
-                            source_id=str(source_doc_id),
-                        )
+                    self._add_entity(
+                        graph,
+                        entity_name=clean_str(record_attributes[1].upper()),
+                        entity_type=clean_str(record_attributes[2].upper()),
+                        entity_description=clean_str(record_attributes[3]),
+                        source_doc_id=source_doc_id,
+                    )
 
                 if (
                     record_attributes[0] == '"relationship"'
                     and len(record_attributes) >= 5
                 ):
                     # add this record as edge
-                    source = clean_str(record_attributes[1].upper())
-                    target = clean_str(record_attributes[2].upper())
-                    edge_description = clean_str(record_attributes[3])
-                    edge_source_id = clean_str(str(source_doc_id))
                     try:
                         weight = float(record_attributes[-1])
                     except ValueError:
                         weight = 1.0
-
-                    if source not in graph.nodes():
-                        graph.add_node(
-                            source, type="", description="", source_id=edge_source_id
-                        )
-                    if target not in graph.nodes():
-                        graph.add_node(
-                            target, type="", description="", source_id=edge_source_id
-                        )
-                    if graph.has_edge(source, target):
-                        edge_data = graph.get_edge_data(source, target)
-                        if edge_data:
-                            weight += edge_data["weight"]
-                            if self._join_descriptions:
-                                edge_description = "\n".join(
-                                    list(
-                                        {
-                                            *_unpack_descriptions(edge_data),
-                                            edge_description,
-                                        }
-                                    )
-                                )
-                            edge_source_id = ", ".join(
-                                list(
-                                    {*_unpack_source_ids(edge_data), str(source_doc_id)}
-                                )
-                            )
-                    graph.add_edge(
-                        source,
-                        target,
+                    self._add_relationship(
+                        graph,
+                        source=clean_str(record_attributes[1].upper()),
+                        target=clean_str(record_attributes[2].upper()),
+                        edge_description=clean_str(record_attributes[3]),
                         weight=weight,
-                        description=edge_description,
-                        source_id=edge_source_id,
+                        source_doc_id=source_doc_id,
                     )
 
         return graph
 
+    def _add_entity(
+        self,
+        graph: nx.Graph[str],
+        entity_name: str,
+        entity_type: str,
+        entity_description: str,
+        source_doc_id: int,
+    ) -> None:
+        if entity_name in graph.nodes():
+            node = graph.nodes[entity_name]
+            if self._join_descriptions:
+                node["description"] = "\n".join(
+                    list({*_unpack_descriptions(node), entity_description})
+                )
+            else:
+                if len(entity_description) > len(node["description"]):
+                    node["description"] = entity_description
+            node["source_id"] = ", ".join(
+                list({*_unpack_source_ids(node), str(source_doc_id)})
+            )
+            node["type"] = entity_type if entity_type != "" else node["type"]
+        else:
+            graph.add_node(
+                entity_name,
+                type=entity_type,
+                description=entity_description,
+                source_id=str(source_doc_id),
+            )
+
+    def _add_relationship(
+        self,
+        graph: nx.Graph[str],
+        source: str,
+        target: str,
+        edge_description: str,
+        weight: float,
+        source_doc_id: int,
+    ) -> None:
+        edge_source_id = clean_str(str(source_doc_id))
+        if source not in graph.nodes():
+            graph.add_node(source, type="", description="", source_id=edge_source_id)
+        if target not in graph.nodes():
+            graph.add_node(target, type="", description="", source_id=edge_source_id)
+        if graph.has_edge(source, target):
+            edge_data = graph.get_edge_data(source, target)
+            if edge_data:
+                weight += edge_data["weight"]
+                if self._join_descriptions:
+                    edge_description = "\n".join(
+                        list({*_unpack_descriptions(edge_data), edge_description})
+                    )
+                edge_source_id = ", ".join(
+                    list({*_unpack_source_ids(edge_data), str(source_doc_id)})
+                )
+        graph.add_edge(
+            source,
+            target,
+            weight=weight,
+            description=edge_description,
+            source_id=edge_source_id,
+        )
+
 
 def _unpack_descriptions(data: dict[str, Any]) -> list[str]:
     value = data.get("description", None)
@@ -0,0 +1,248 @@
+import logging
+from collections import deque
+from typing import Any, cast
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import pyarrow as pa
+
+from review_summary.utils.vector import vectors_from_arrow
+
+logger = logging.getLogger(__name__)
+
+
+def sample_text_units(
+    text_units: pd.DataFrame,
+    token_budget: int,
+    max_samples: int | None = None,
+    embedding_column: str = "embedding",
+    token_column: str = "n_tokens",
+    text_column: str = "text",
+    num_clusters: int = 32,
+    batch_size: int = 256,
+    max_iter: int = 100,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """Select at most `max_samples` representative text units within a token budget.
+
+    Text unit embeddings are clustered with mini-batch k-means. Every cluster gets a
+    share of the token budget (and of `max_samples`) proportional to its size, and
+    is filled with the text units closest to its centroid, so that themes stay
+    covered while the number of tokens sent to graph extraction stays bounded.
+    """
+    if len(text_units) == 0:
+        return text_units
+
+    n_tokens = _token_counts(text_units, token_column, text_column)
+    if int(n_tokens.sum()) <= token_budget and (
+        max_samples is None or len(text_units) <= max_samples
+    ):
+        logger.info("Text units already fit the budget, skip sampling.")
+        return text_units
+
+    column = text_units[embedding_column]
+    matrix: npt.NDArray[np.float32] | None = None
+    if isinstance(column.dtype, pd.ArrowDtype) and pa.types.is_fixed_size_list(
+        column.dtype.pyarrow_dtype
+    ):
+        # Read the contiguous vectors of a fixed_size_list column without copying
+        arrow = cast("pa.Array[Any]", pa.array(column.array))
+        matrix, has_embedding = vectors_from_arrow(arrow)
+    else:
+        has_embedding = column.map(_is_vector).to_numpy(dtype=bool)
+    if not has_embedding.any():
+        raise ValueError("Cannot sample text units without embeddings.")
+    if not has_embedding.all():
+        logger.warning(
+            f"Skip {int((~has_embedding).sum())} text units without embedding."
+        )
+    candidates = np.flatnonzero(has_embedding)
+    vectors = (
+        matrix[candidates]
+        if matrix is not None
+        else np.asarray([column.iloc[i] for i in candidates], dtype=np.float32)
+    )
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+    centroids, labels = mini_batch_kmeans(
+        vectors,
+        num_clusters=min(num_clusters, len(candidates)),
+        batch_size=batch_size,
+        max_iter=max_iter,
+        seed=seed,
+    )
+    distances = np.linalg.norm(vectors - centroids[labels], axis=1).astype(
+        np.float32, copy=False
+    )
+
+    selected = _select_representatives(
+        labels=labels,
+        distances=distances,
+        n_tokens=n_tokens[candidates],
+        token_budget=token_budget,
+        max_samples=max_samples if max_samples is not None else len(candidates),
+    )
+    sampled = text_units.iloc[np.sort(candidates[selected])]
+    logger.info(
+        f"Sampled {len(sampled)} out of {len(text_units)} text units "
+        f"({int(n_tokens[candidates[selected]].sum())} tokens) "
+        f"from {len(centroids)} clusters."
+    )
+    return sampled.reset_index(drop=True)
+
+
+def mini_batch_kmeans(
+    vectors: npt.NDArray[np.float32],
+    num_clusters: int,
+    batch_size: int = 256,
+    max_iter: int = 100,
+    tolerance: float = 1e-4,
+    seed: int = 42,
+) -> tuple[npt.NDArray[np.float32], npt.NDArray[np.intp]]:
+    """Cluster vectors with mini-batch k-means (Sculley, 2010).
+
+    Returns the (num_clusters, dim) centroids and the cluster label of each vector.
+    """
+    generator = np.random.default_rng(seed)
+    num_vectors = len(vectors)
+    centroids = _kmeans_plus_plus(vectors, num_clusters, generator)
+    counts = np.zeros(num_clusters, dtype=np.int64)
+
+    for _ in range(max_iter):
+        batch = vectors[
+            generator.choice(num_vectors, min(batch_size, num_vectors), replace=False)
+        ]
+        nearest = _assign(batch, centroids)
+        previous = centroids.copy()
+        for vector, cluster in zip(batch, nearest, strict=True):
+            counts[cluster] += 1
+            learning_rate = 1.0 / counts[cluster]
+            centroids[cluster] += learning_rate * (vector - centroids[cluster])
+        if float(np.max(np.abs(centroids - previous))) < tolerance:
+            break
+
+    return centroids, _assign(vectors, centroids)
+
+
+def _kmeans_plus_plus(
+    vectors: npt.NDArray[np.float32],
+    num_clusters: int,
+    generator: np.random.Generator,
+) -> npt.NDArray[np.float32]:
+    """Seed centroids with the k-means++ strategy."""
+    centroids = np.empty((num_clusters, vectors.shape[1]), dtype=np.float32)
+    centroids[0] = vectors[generator.integers(len(vectors))]
+    closest = _squared_distances(vectors, centroids[0])
+    for i in range(1, num_clusters):
+        total = float(closest.sum())
+        if total <= 0:
+            # All remaining vectors coincide with a centroid
+            index = int(generator.integers(len(vectors)))
+        else:
+            index = int(generator.choice(len(vectors), p=closest / total))
+        centroids[i] = vectors[index]
+        closest = np.minimum(closest, _squared_distances(vectors, centroids[i]))
+    return centroids
+
+
+def _squared_distances(
+    vectors: npt.NDArray[np.float32], centroid: npt.NDArray[np.float32]
+) -> npt.NDArray[np.float32]:
+    return np.sum((vectors - centroid) ** 2, axis=1)
+
+
+def _assign(
+    vectors: npt.NDArray[np.float32], centroids: npt.NDArray[np.float32]
+) -> npt.NDArray[np.intp]:
+    # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2, the first term is constant per row
+    scores = vectors @ centroids.T
+    scores -= 0.5 * np.sum(centroids**2, axis=1)
+    return np.argmax(scores, axis=1)
+
+
+def _select_representatives(
+    labels: npt.NDArray[np.intp],
+    distances: npt.NDArray[np.float32],
+    n_tokens: npt.NDArray[np.int64],
+    token_budget: int,
+    max_samples: int,
+) -> npt.NDArray[np.intp]:
+    """Pick the text units closest to each centroid, proportionally to cluster size.
+
+    Each cluster first receives a token and a sample quota proportional to its
+    size; the budget left over by small clusters is then spent round-robin on the
+    remaining units.
+    """
+    ordered: dict[int, deque[int]] = {}
+    quotas: dict[int, float] = {}
+    sample_quotas: dict[int, float] = {}
+    for cluster in np.unique(labels):
+        members = np.flatnonzero(labels == cluster)
+        closest_first = members[np.argsort(distances[members])]
+        ordered[int(cluster)] = deque(int(member) for member in closest_first)
+        quotas[int(cluster)] = token_budget * len(members) / len(labels)
+        sample_quotas[int(cluster)] = max_samples * len(members) / len(labels)
+
+    selected: list[int] = []
+    remaining = token_budget
+    spent: dict[int, int] = {cluster: 0 for cluster in ordered}
+    sampled: dict[int, int] = {cluster: 0 for cluster in ordered}
+    # Largest clusters first, so that the most common themes are never starved
+    for cluster in sorted(ordered, key=lambda c: len(ordered[c]), reverse=True):
+        queue = ordered[cluster]
+        while queue and len(selected) < max_samples:
+            tokens = int(n_tokens[queue[0]])
+            within_quota = (
+                spent[cluster] + tokens <= quotas[cluster]
+                and sampled[cluster] + 1 <= sample_quotas[cluster]
+            )
+            if tokens > remaining or (spent[cluster] > 0 and not within_quota):
+                break
+            selected.append(queue.popleft())
+            spent[cluster] += tokens
+            sampled[cluster] += 1
+            remaining -= tokens
+
+    # Spend the leftover budget round-robin over the clusters
+    exhausted: set[int] = set()
+    while (
+        remaining > 0 and len(selected) < max_samples and len(exhausted) < len(ordered)
+    ):
+        for cluster, queue in ordered.items():
+            if cluster in exhausted:
+                continue
+            if len(selected) >= max_samples:
+                break
+            if not queue or int(n_tokens[queue[0]]) > remaining:
+                exhausted.add(cluster)
+                continue
+            member = queue.popleft()
+            selected.append(member)
+            remaining -= int(n_tokens[member])
+
+    return np.asarray(selected, dtype=np.intp)
+
+
+def _token_counts(
+    text_units: pd.DataFrame, token_column: str, text_column: str
+) -> npt.NDArray[np.int64]:
+    """Use stored token counts, approximating missing ones by word count."""
+    if token_column not in text_units.columns:
+        return np.asarray(
+            [len(str(text).split()) for text in text_units[text_column]],
+            dtype=np.int64,
+        )
+    return np.asarray(
+        [
+            int(n) if pd.notna(n) else len(str(text).split())
+            for n, text in zip(
+                text_units[token_column], text_units[text_column], strict=True
+            )
+        ],
+        dtype=np.int64,
+    )
+
+
+def _is_vector(value: Any) -> bool:
+    return isinstance(value, (list, np.ndarray)) and len(value) > 0  # pyright: ignore
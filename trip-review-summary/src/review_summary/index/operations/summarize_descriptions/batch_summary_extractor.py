@@ -0,0 +1,156 @@
+import json
+import logging
+from typing import Any
+
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.runnables import Runnable
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel, Field
+
+from review_summary.index.operations.summarize_descriptions.typing import (
+    SummarizationResult,
+)
+from review_summary.prompts.index.summarize_descriptions import (
+    BATCH_SUMMARIZE_PROMPT,
+)
+from review_summary.tokenizer.tokenizer import Tokenizer
+
+# These tokens are used in the prompt
+ITEMS_KEY = "items"
+MAX_LENGTH_KEY = "max_length"
+
+SummaryItemId = str | tuple[str, str]
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryItem(BaseModel):
+    name: list[str] = Field(
+        ...,
+        description=(
+            "The entity name, or the source and target entity names "
+            "of the relationship, exactly as given in the input item."
+        ),
+    )
+    description: str = Field(..., description="The summarized description.")
+
+
+class SummaryBatch(BaseModel):
+    summaries: list[SummaryItem] = Field(
+        ..., description="One summary for every input item."
+    )
+
+
+def create_summary_batches(
+    items: list[tuple[SummaryItemId, list[str]]],
+    tokenizer: Tokenizer,
+    max_batch_tokens: int,
+    max_batch_size: int,
+) -> list[list[tuple[SummaryItemId, list[str]]]]:
+    """Pack items into batches under a token budget and a maximum batch size."""
+    batches: list[list[tuple[SummaryItemId, list[str]]]] = []
+    current_batch: list[tuple[SummaryItemId, list[str]]] = []
+    current_batch_tokens = 0
+
+    for item in items:
+        item_tokens = tokenizer.num_tokens(_format_item(*item))
+        if current_batch and (
+            len(current_batch) >= max_batch_size
+            or current_batch_tokens + item_tokens > max_batch_tokens
+        ):
+            batches.append(current_batch)
+            current_batch = []
+            current_batch_tokens = 0
+
+        current_batch.append(item)
+        current_batch_tokens += item_tokens
+
+    if len(current_batch) > 0:
+        batches.append(current_batch)
+    return batches
+
+
+class BatchSummaryExtractor:
+    """Summarize the descriptions of many entities and relationships in one call.
+
+    The LLM answers with JSON structured output keyed by the entity title or the
+    (source, target) pair. Items missing from the response are asked for again in
+    one batch of their own, up to `max_retries` times. The items still missing are
+    returned to the caller, which summarizes each of them with a single call.
+    """
+
+    def __init__(
+        self,
+        chat_model: ChatOpenAI,
+        max_summary_length: int,
+        max_retries: int = 1,
+        summarization_prompt: str | None = None,
+    ):
+        """Init method definition."""
+        self._model: Runnable[LanguageModelInput, Any] = (
+            chat_model.with_structured_output(  # pyright: ignore[reportUnknownMemberType]
+                SummaryBatch, method="json_schema"
+            )
+        )
+        self._max_summary_length = max_summary_length
+        self._max_retries = max_retries
+        self._summarization_prompt = summarization_prompt or BATCH_SUMMARIZE_PROMPT
+
+    async def __call__(
+        self, items: list[tuple[SummaryItemId, list[str]]]
+    ) -> tuple[list[SummarizationResult], list[tuple[SummaryItemId, list[str]]]]:
+        """Return the summarized results and the items that could not be summarized."""
+        results: list[SummarizationResult] = []
+        pending = items
+        for attempt in range(self._max_retries + 1):
+            if len(pending) == 0:
+                break
+            if attempt > 0:
+                logger.warning(
+                    f"Retrying {len(pending)} items missing from the batch response."
+                )
+            try:
+                summaries = await self._summarize_batch(pending)
+            except Exception as e:
+                logger.exception("error summarizing description batch", exc_info=e)
+                continue
+
+            missing: list[tuple[SummaryItemId, list[str]]] = []
+            for id, descriptions in pending:
+                summary = summaries.get(_item_key(id))
+                if summary:
+                    results.append(SummarizationResult(id=id, description=summary))
+                else:
+                    missing.append((id, descriptions))
+            pending = missing
+
+        return results, pending
+
+    async def _summarize_batch(
+        self, items: list[tuple[SummaryItemId, list[str]]]
+    ) -> dict[tuple[str, ...], str]:
+        """Summarize a batch and index the validated summaries by item key."""
+        response: Any = await self._model.ainvoke(
+            self._summarization_prompt.format(
+                **{
+                    ITEMS_KEY: "\n".join(_format_item(*item) for item in items),
+                    MAX_LENGTH_KEY: self._max_summary_length,
+                }
+            ),
+        )
+        batch = SummaryBatch.model_validate(response)
+        return {
+            tuple(summary.name): summary.description.strip()
+            for summary in batch.summaries
+        }
+
+
+def _item_key(id: SummaryItemId) -> tuple[str, ...]:
+    return (id,) if isinstance(id, str) else tuple(id)
+
+
+def _format_item(id: SummaryItemId, descriptions: list[str]) -> str:
+    return json.dumps(
+        {"name": list(_item_key(id)), "descriptions": sorted(descriptions)},
+        ensure_ascii=False,
+    )
@@ -0,0 +1,109 @@
+"""Extractive (TF-IDF centroid) summarization of entity/relationship descriptions."""
+
+import re
+from collections.abc import Callable
+
+import numpy as np
+import numpy.typing as npt
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?;])\s+|(?<=[。！？；])")
+_TOKEN = re.compile(r"\w+")
+
+
+def num_words(text: str) -> int:
+    """Count the words in a text, as used by the `max_length` prompt limit."""
+    return len(text.split())
+
+
+def split_sentences(descriptions: list[str]) -> list[str]:
+    """Split descriptions into unique, non-empty sentences preserving order."""
+    sentences: dict[str, None] = {}
+    for description in descriptions:
+        for sentence in _SENTENCE_SPLIT.split(description):
+            sentence = sentence.strip()
+            if sentence:
+                sentences.setdefault(sentence, None)
+    return list(sentences)
+
+
+def tfidf_matrix(texts: list[str]) -> npt.NDArray[np.float64]:
+    """Build a L2-normalized TF-IDF matrix with one row per text."""
+    tokenized = [_TOKEN.findall(text.lower()) for text in texts]
+    vocabulary: dict[str, int] = {}
+    for tokens in tokenized:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+
+    matrix = np.zeros((len(texts), len(vocabulary)), dtype=np.float64)
+    for row, tokens in enumerate(tokenized):
+        for token in tokens:
+            matrix[row, vocabulary[token]] += 1.0
+
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    idf: npt.NDArray[np.float64] = (
+        np.log((1 + len(texts)) / (1 + document_frequency)) + 1.0
+    )
+    matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def min_centroid_similarity(descriptions: list[str]) -> float:
+    """Return the lowest cosine similarity between a description and the centroid.
+
+    A low value means that at least one description diverges from the others,
+    e.g. contradicting reviews, which is better reconciled by the LLM.
+    """
+    if len(descriptions) < 2:
+        return 1.0
+    matrix = tfidf_matrix(descriptions)
+    centroid = matrix.mean(axis=0)
+    centroid /= max(float(np.linalg.norm(centroid)), 1e-12)
+    return float(np.min(matrix @ centroid))
+
+
+def select_sentences(
+    descriptions: list[str],
+    max_length: int,
+    length_fn: Callable[[str], int] = num_words,
+    redundancy_threshold: float = 0.8,
+) -> list[str]:
+    """Select the sentences closest to the TF-IDF centroid within `max_length`.
+
+    Sentences are picked by decreasing centroid similarity, skipping those too
+    similar to an already selected sentence, and returned in their original order.
+    """
+    sentences = split_sentences(descriptions)
+    if len(sentences) == 0:
+        return []
+
+    matrix = tfidf_matrix(sentences)
+    centroid = matrix.mean(axis=0)
+    scores = matrix @ centroid
+
+    selected: list[int] = []
+    total_length = 0
+    for index in map(int, np.argsort(-scores, kind="stable")):
+        length = length_fn(sentences[index])
+        if total_length + length > max_length:
+            continue
+        if selected and float(np.max(matrix[selected] @ matrix[index])) >= (
+            redundancy_threshold
+        ):
+            continue
+        selected.append(index)
+        total_length += length
+
+    if not selected:
+        # Even the best sentence exceeds the limit, keep it rather than nothing
+        selected.append(int(np.argmax(scores)))
+    return [sentences[index] for index in sorted(selected)]
+
+
+def extractive_summarize(
+    descriptions: list[str],
+    max_length: int,
+    length_fn: Callable[[str], int] = num_words,
+) -> str:
+    """Summarize descriptions by joining their most central sentences."""
+    return " ".join(select_sentences(descriptions, max_length, length_fn))
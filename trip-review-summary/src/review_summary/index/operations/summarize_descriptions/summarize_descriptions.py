@@ -1,11 +1,18 @@
 import asyncio
 import logging
+from collections.abc import Awaitable, Callable
+from itertools import zip_longest
 from typing import Any
 
 import pandas as pd
 from langchain_openai import ChatOpenAI
 
 from review_summary.config.settings import get_settings
+from review_summary.index.operations.summarize_descriptions.batch_summary_extractor import (  # noqa: E501
+    BatchSummaryExtractor,
+    SummaryItemId,
+    create_summary_batches,
+)
 from review_summary.index.operations.summarize_descriptions.summary_extractor import (
     SummaryExtractor,
 )
@@ -24,8 +31,20 @@ async def summarize_descriptions(
     max_summary_length: int,
     summarization_prompt: str | None = None,
     num_concurrency: int = 4,
+    tiered: bool = False,
+    extractive_max_length: int = 2000,
+    conflict_threshold: float = 0.2,
+    batched: bool = False,
+    batch_max_tokens: int = 8000,
+    batch_max_size: int = 10,
+    batch_max_retries: int = 1,
+    batch_summarization_prompt: str | None = None,
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Summarize entity and relationship descriptions using a llm."""
+    """Summarize entity and relationship descriptions using a llm.
+
+    Entities and relationships share a single work queue. In batched mode, the
+    items that need the LLM are packed into multi-item structured output calls.
+    """
     semaphore = asyncio.Semaphore(num_concurrency)
 
     # Initialize ChatOpenAI model with provided config
@@ -37,37 +56,65 @@ async def summarize_descriptions(
     chat_model = ChatOpenAI(**chat_model_config)
     logger.info("Initialized ChatOpenAI model for description summarization.")
 
+    # Interleave entities and relationships into a single work queue
+    entity_items: list[tuple[SummaryItemId, list[str]]] = [
+        (str(row.title), sorted(set[str](row.description)))  # type: ignore
+        for row in entities.itertuples(index=False)
+    ]
+    relationship_items: list[tuple[SummaryItemId, list[str]]] = [
+        ((str(row.source), str(row.target)), sorted(set[str](row.description)))  # type: ignore
+        for row in relationships.itertuples(index=False)
+    ]
+    items = [
+        item
+        for pair in zip_longest(entity_items, relationship_items)
+        for item in pair
+        if item is not None
+    ]
+
+    extractor = SummaryExtractor(
+        chat_model=chat_model,
+        summarization_prompt=summarization_prompt,
+        max_summary_length=max_summary_length,
+        max_input_tokens=max_input_tokens,
+        tiered=tiered,
+        extractive_max_length=extractive_max_length,
+        conflict_threshold=conflict_threshold,
+    )
+
     async def _summarize_descriptions(
-        id: str | tuple[str, str], descriptions: list[str]
+        id: SummaryItemId, descriptions: list[str]
     ) -> SummarizationResult:
         async with semaphore:
-            return await _run_summary_extraction(
-                id=id,
-                descriptions=descriptions,
+            result = await extractor(id=id, descriptions=descriptions)
+            return SummarizationResult(id=result.id, description=result.description)
+
+    if batched:
+        logger.info("Starting batched summarization of descriptions.")
+        results = await _summarize_batched(
+            items=items,
+            extractor=extractor,
+            batch_extractor=BatchSummaryExtractor(
                 chat_model=chat_model,
-                max_input_tokens=max_input_tokens,
                 max_summary_length=max_summary_length,
-                summarization_prompt=summarization_prompt,
-            )
-
-    # Process entities
-    entity_futures = [
-        _summarize_descriptions(str(row.title), sorted(set[str](row.description)))  # type: ignore
-        for row in entities.itertuples(index=False)
-    ]
-    logger.info("Starting summarization of entity descriptions.")
-    entity_results = await asyncio.gather(*entity_futures)
-
-    # Process relationships
-    relationship_futures = [
-        _summarize_descriptions(
-            (str(row.source), str(row.target)),
-            sorted(set[str](row.description)),  # type: ignore
+                max_retries=batch_max_retries,
+                summarization_prompt=batch_summarization_prompt,
+            ),
+            summarize_single=_summarize_descriptions,
+            semaphore=semaphore,
+            batch_max_tokens=batch_max_tokens,
+            batch_max_size=batch_max_size,
         )
-        for row in relationships.itertuples(index=False)
+    else:
+        logger.info("Starting summarization of descriptions.")
+        results = await asyncio.gather(
+            *[_summarize_descriptions(id, descriptions) for id, descriptions in items]
+        )
+
+    entity_results = [result for result in results if isinstance(result.id, str)]
+    relationship_results = [
+        result for result in results if not isinstance(result.id, str)
     ]
-    logger.info("Starting summarization of relationship descriptions.")
-    relationship_results = await asyncio.gather(*relationship_futures)
 
     # Build DataFrames using Polars-native construction
     entity_descriptions = pd.DataFrame(
@@ -87,20 +134,56 @@ async def summarize_descriptions(
     return entity_descriptions, relationship_descriptions
 
 
-async def _run_summary_extraction(
-    id: str | tuple[str, str],
-    descriptions: list[str],
-    chat_model: ChatOpenAI,
-    max_input_tokens: int,
-    max_summary_length: int,
-    summarization_prompt: str | None = None,
-) -> SummarizationResult:
-    extractor = SummaryExtractor(
-        chat_model=chat_model,
-        summarization_prompt=summarization_prompt,
-        max_summary_length=max_summary_length,
-        max_input_tokens=max_input_tokens,
+async def _summarize_batched(
+    items: list[tuple[SummaryItemId, list[str]]],
+    extractor: SummaryExtractor,
+    batch_extractor: BatchSummaryExtractor,
+    summarize_single: Callable[
+        [SummaryItemId, list[str]], Awaitable[SummarizationResult]
+    ],
+    semaphore: asyncio.Semaphore,
+    batch_max_tokens: int,
+    batch_max_size: int,
+) -> list[SummarizationResult]:
+    results: list[SummarizationResult] = []
+    llm_items: list[tuple[SummaryItemId, list[str]]] = []
+    for id, descriptions in items:
+        summary = extractor.summarize_without_llm(id, descriptions)
+        if summary is not None:
+            results.append(SummarizationResult(id=id, description=summary))
+        else:
+            llm_items.append((id, extractor.fit_input_tokens(descriptions)))
+
+    batches = create_summary_batches(
+        llm_items,
+        tokenizer=extractor.tokenizer,
+        max_batch_tokens=batch_max_tokens,
+        max_batch_size=batch_max_size,
     )
+    logger.info(
+        f"Summarized {len(results)} items locally, "
+        f"packed {len(llm_items)} items into {len(batches)} LLM batches."
+    )
+
+    async def _summarize_batch(
+        batch: list[tuple[SummaryItemId, list[str]]],
+    ) -> list[SummarizationResult]:
+        async with semaphore:
+            batch_results, missing = await batch_extractor(batch)
+        if missing:
+            logger.warning(f"Falling back to single calls for {len(missing)} items.")
+            batch_results.extend(
+                await asyncio.gather(
+                    *[
+                        summarize_single(id, descriptions)
+                        for id, descriptions in missing
+                    ]
+                )
+            )
+        return batch_results
 
-    result = await extractor(id=id, descriptions=descriptions)
-    return SummarizationResult(id=result.id, description=result.description)
+    for batch_results in await asyncio.gather(
+        *[_summarize_batch(batch) for batch in batches]
+    ):
+        results.extend(batch_results)
+    return results
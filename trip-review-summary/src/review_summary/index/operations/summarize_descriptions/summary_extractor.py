@@ -1,17 +1,27 @@
 import json
+import logging
 from dataclasses import dataclass
 
 from langchain_openai import ChatOpenAI
 from tiktoken import encoding_name_for_model
 
+from review_summary.index.operations.summarize_descriptions.extractive_summary import (
+    extractive_summarize,
+    min_centroid_similarity,
+    num_words,
+    select_sentences,
+)
 from review_summary.prompts.index.summarize_descriptions import SUMMARIZE_PROMPT
 from review_summary.tokenizer.tiktoken import TiktokenTokenizer
+from review_summary.tokenizer.tokenizer import Tokenizer
 
 # These tokens are used in the prompt
 ENTITY_NAME_KEY = "entity_name"
 DESCRIPTION_LIST_KEY = "description_list"
 MAX_LENGTH_KEY = "max_length"
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class SummarizationResult:
@@ -26,29 +36,92 @@ class SummaryExtractor:
         max_summary_length: int,
         max_input_tokens: int,
         summarization_prompt: str | None = None,
+        tiered: bool = False,
+        extractive_max_length: int = 2000,
+        conflict_threshold: float = 0.2,
+        tokenizer: Tokenizer | None = None,
     ):
         """Init method definition."""
         self._model = chat_model
-        encoding_name = encoding_name_for_model(chat_model.model_name)
-        self._tokenizer = TiktokenTokenizer(encoding_name)
+        if tokenizer is None:
+            encoding_name = encoding_name_for_model(chat_model.model_name)
+            tokenizer = TiktokenTokenizer(encoding_name)
+        self._tokenizer = tokenizer
         self._summarization_prompt = summarization_prompt or SUMMARIZE_PROMPT
         self._max_summary_length = max_summary_length
         self._max_input_tokens = max_input_tokens
+        self._tiered = tiered
+        self._extractive_max_length = extractive_max_length
+        self._conflict_threshold = conflict_threshold
+
+    @property
+    def tokenizer(self) -> Tokenizer:
+        """The tokenizer used to fit descriptions into the input token limit."""
+        return self._tokenizer
 
     async def __call__(
         self, id: str | tuple[str, str], descriptions: list[str]
     ) -> SummarizationResult:
         """Call method definition."""
-        result = ""
-        if len(descriptions) == 0:
-            result = ""
-        elif len(descriptions) == 1:
-            result = descriptions[0]
-        else:
+        result = self.summarize_without_llm(id, descriptions)
+        if result is None and self._tiered:
+            result = await self._summarize_descriptions_with_llm(
+                id, self.fit_input_tokens(descriptions)
+            )
+        elif result is None:
             result = await self._summarize_descriptions(id, descriptions)
 
         return SummarizationResult(id=id, description=result or "")
 
+    def summarize_without_llm(
+        self, id: str | tuple[str, str], descriptions: list[str]
+    ) -> str | None:
+        """Summarize descriptions locally, or return None if the LLM is needed.
+
+        Besides the trivial empty and single description cases, tiered mode:
+        1. Concatenates when the combined descriptions fit `max_summary_length`.
+        2. Selects central sentences (TF-IDF centroid) for medium sets, unless some
+           description diverges from the others and needs reconciliation.
+        Large or conflicting sets are left to the LLM.
+        """
+        if len(descriptions) == 0:
+            return ""
+        if len(descriptions) == 1:
+            return descriptions[0]
+        if not self._tiered:
+            return None
+
+        descriptions = sorted(descriptions)
+        combined_length = sum(num_words(description) for description in descriptions)
+        if combined_length <= self._max_summary_length:
+            logger.debug(f"Concatenate {len(descriptions)} descriptions of {id}.")
+            return " ".join(descriptions)
+
+        if (
+            combined_length <= self._extractive_max_length
+            and min_centroid_similarity(descriptions) >= self._conflict_threshold
+        ):
+            logger.debug(f"Extract summary from {len(descriptions)} descriptions.")
+            return extractive_summarize(descriptions, self._max_summary_length)
+        return None
+
+    def fit_input_tokens(
+        self, descriptions: list[str], max_input_tokens: int | None = None
+    ) -> list[str]:
+        """Pre-select central sentences when descriptions overflow the token buffer,
+        so that a single LLM call suffices instead of iterative re-summarization."""
+        usable_tokens = (
+            max_input_tokens or self._max_input_tokens
+        ) - self._tokenizer.num_tokens(self._summarization_prompt)
+        input_tokens = sum(
+            self._tokenizer.num_tokens(description) for description in descriptions
+        )
+        if input_tokens <= usable_tokens:
+            return sorted(descriptions)
+        return select_sentences(
+            sorted(descriptions), usable_tokens, length_fn=self._tokenizer.num_tokens
+        )
+
     async def _summarize_descriptions(
         self, id: str | tuple[str, str], descriptions: list[str]
     ) -> str:
@@ -0,0 +1,173 @@
+"""Profile the stages of an indexing run.
+
+Each task of the indexing chain runs inside `profile_stage`, which collects the
+wall time, LLM calls and tokens, MinIO bytes and rows of the stage into a
+`StageProfile`. The profiles accumulate in `context["profile"]` along the chain and
+are reported as the progress of the run, see `GET /api/v1/indices/tasks/{task_id}`.
+Tasks report their own progress with `update_progress`, which keeps the profiles.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Self
+
+from celery import Task
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.tracers.context import register_configure_hook
+from pydantic import BaseModel, Field
+
+
+class StageProfile(BaseModel):
+    """Resources spent by a stage of an indexing run."""
+
+    stage: str = Field(..., description="Name of the indexing task.")
+    wall_time: float = Field(default=0.0, description="Seconds spent in the stage.")
+    llm_calls: int = Field(default=0, description="Chat and embedding requests.")
+    prompt_tokens: int = Field(default=0, description="Input tokens of the requests.")
+    completion_tokens: int = Field(
+        default=0, description="Output tokens of the chat requests."
+    )
+    cache_hits: int = Field(
+        default=0, description="Chat requests served in part from the prompt cache."
+    )
+    cached_tokens: int = Field(
+        default=0, description="Input tokens read from the prompt cache."
+    )
+    bytes_read: int = Field(default=0, description="Bytes read from MinIO.")
+    bytes_written: int = Field(default=0, description="Bytes written to MinIO.")
+    rows_in: int = Field(
+        default=0, description="Rows loaded from MinIO and the vector stores."
+    )
+    rows_out: int = Field(
+        default=0, description="Rows saved to MinIO and the vector stores."
+    )
+
+    @classmethod
+    def total(cls, profiles: list[Self], stage: str = "total") -> Self:
+        """Sum the profiles of several stages."""
+        total = cls(stage=stage)
+        for profile in profiles:
+            for name in cls.model_fields:
+                if name != "stage":
+                    setattr(total, name, getattr(total, name) + getattr(profile, name))
+        return total
+
+
+class _UsageCallbackHandler(BaseCallbackHandler):
+    """Count the chat model calls and tokens of a stage."""
+
+    # Count on the event loop, instead of in an executor thread
+    run_inline = True
+
+    def __init__(self, profile: StageProfile):
+        self.profile = profile
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        self.profile.llm_calls += 1
+        generation = response.generations[0][0] if response.generations else None
+        if not isinstance(generation, ChatGeneration):
+            return
+        message = generation.message
+        if not isinstance(message, AIMessage) or message.usage_metadata is None:
+            return
+        usage = message.usage_metadata
+        self.profile.prompt_tokens += usage["input_tokens"]
+        self.profile.completion_tokens += usage["output_tokens"]
+        cached_tokens = usage.get("input_token_details", {}).get("cache_read", 0)
+        if cached_tokens > 0:
+            self.profile.cache_hits += 1
+            self.profile.cached_tokens += cached_tokens
+
+
+_current_profile: ContextVar[StageProfile | None] = ContextVar(
+    "index_stage_profile", default=None
+)
+# Attached to every chat model run started while a stage is profiled
+_usage_handler: ContextVar[_UsageCallbackHandler | None] = ContextVar(
+    "index_stage_usage_handler", default=None
+)
+register_configure_hook(_usage_handler, inheritable=True)
+
+
+def is_profiling() -> bool:
+    """Whether a stage is being profiled."""
+    return _current_profile.get() is not None
+
+
+def record(**counts: int | float) -> None:
+    """Add to the fields of the stage being profiled, e.g. `record(rows_in=10)`.
+
+    Does nothing outside of `profile_stage`.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    for name, count in counts.items():
+        setattr(profile, name, getattr(profile, name) + count)
+
+
+@contextmanager
+def profile_stage(
+    task: Task[Any, Any], context: dict[str, Any], stage: str
+) -> Generator[StageProfile, None, None]:
+    """Profile a stage of the indexing chain and append it to `context["profile"]`.
+
+    The stage and the profiles of the previous stages are reported as the
+    PROGRESS of `context["task_id"]`, the last task of the chain which the run is
+    tracked by.
+    """
+    profiles: list[dict[str, Any]] = context.setdefault("profile", [])
+    _report_progress(task, context, stage)
+
+    profile = StageProfile(stage=stage)
+    profile_token = _current_profile.set(profile)
+    handler_token = _usage_handler.set(_UsageCallbackHandler(profile))
+    start = time.perf_counter()
+    try:
+        yield profile
+    finally:
+        profile.wall_time += time.perf_counter() - start
+        _usage_handler.reset(handler_token)
+        _current_profile.reset(profile_token)
+
+    profiles.append(profile.model_dump())
+    if context.get("task_id") != task.request.id:
+        # The result of the last task is the context, profiles included
+        _report_progress(task, context, None)
+
+
+def update_progress(
+    task: Task[Any, Any], context: dict[str, Any], meta: dict[str, Any]
+) -> None:
+    """Report the PROGRESS of a task with `meta`.
+
+    On the task the run is tracked by, the stage being profiled and the profiles
+    are merged into `meta` instead of being replaced by it.
+    """
+    if context.get("task_id") == task.request.id:
+        profile = _current_profile.get()
+        meta = {
+            **meta,
+            "stage": profile.stage if profile is not None else None,
+            "profile": list(context.get("profile", [])),
+        }
+    task.update_state(state="PROGRESS", meta=meta)
+
+
+def _report_progress(
+    task: Task[Any, Any], context: dict[str, Any], stage: str | None
+) -> None:
+    task_id = context.get("task_id")
+    if task_id is None:
+        return
+    task.update_state(
+        task_id=task_id,
+        state="PROGRESS",
+        meta={"stage": stage, "profile": list(context["profile"])},
+    )
@@ -9,21 +9,38 @@ from asgiref.sync import async_to_sync
 from celery import Task, shared_task
 from qdrant_client import AsyncQdrantClient
 
+from review_summary.config.embedding import EmbeddingProfile
+from review_summary.config.index.collect_text_units_config import (
+    CollectTextUnitsConfig,
+)
 from review_summary.config.settings import get_settings
-from review_summary.utils.storage import get_storage_options
+from review_summary.index.checkpoints import write_checkpoint
+from review_summary.index.operations.deduplicate_text_units import (
+    deduplicate_text_units,
+)
+from review_summary.index.operations.sample_text_units import sample_text_units
+from review_summary.index.profiler import profile_stage, record, update_progress
 from review_summary.utils.uuid import uuid7
+from review_summary.utils.vector import vectors_to_arrow
 from review_summary.vector_stores.text_unit import TextUnitVectorStore
 
 logger = logging.getLogger(__name__)
 
 
 @shared_task(bind=True)
-def run_workflow(self: Task[Any, Any], context: dict[str, Any]) -> dict[str, Any]:
-    async_to_sync(_collect_text_units)(self, context)
+def run_workflow(
+    self: Task[Any, Any], context: dict[str, Any], config: dict[str, Any]
+) -> dict[str, Any]:
+    with profile_stage(self, context, "collect_text_units"):
+        async_to_sync(_collect_text_units)(
+            self, context, CollectTextUnitsConfig.model_validate(config)
+        )
     return context
 
 
-async def _collect_text_units(task: Task[Any, Any], context: dict[str, Any]) -> None:
+async def _collect_text_units(
+    task: Task[Any, Any], context: dict[str, Any], config: CollectTextUnitsConfig
+) -> None:
     """Collected `text_units` pyarrow schema:
     | Column           | Type         | Description                                      |
     | :--------------- | :----------- | :----------------------------------------------- |
@@ -35,15 +52,15 @@ async def _collect_text_units(task: Task[Any, Any], context: dict[str, Any]) ->
     | relationship_ids | list<string> | IDs of Relationships extracted from the TextUnit |
     | n_tokens         | int64        | Number of tokens of the text content             |
     | document_id      | string       | ID of the source Document of the TextUnit        |
-    | attributes       | struct       | Attributes including target information          |
+    | attributes       | struct       | Target information and near-duplicate provenance |
     """  # noqa: E501
     qdrant_settings = get_settings().qdrant
     qdrant_client = AsyncQdrantClient(url=qdrant_settings.url)
     try:
         text_unit_vector_store = await TextUnitVectorStore.create_vector_store(
-            client=qdrant_client, vector_dim=context.get("vector_dim", 3072)
+            client=qdrant_client, profile=_embedding_profile(context)
         )
-        await _internal(task, context, text_unit_vector_store)
+        await _internal(task, context, config, text_unit_vector_store)
 
     finally:
         await qdrant_client.close()  # Ensure the client is closed properly
@@ -52,6 +69,7 @@ async def _collect_text_units(task: Task[Any, Any], context: dict[str, Any]) ->
 async def _internal(
     task: Task[Any, Any],
     context: dict[str, Any],
+    config: CollectTextUnitsConfig,
     text_unit_vector_store: TextUnitVectorStore,
 ) -> None:
     target_id = context["target_id"]
@@ -60,13 +78,22 @@ async def _internal(
         # Currently, we only support attraction reviews
         raise ValueError(f"Unsupported target type: {target_type}")
 
-    text_units = await text_unit_vector_store.find_by_target(target_id, target_type)
+    # Sampling clusters all text units of the target, so that the sample covers
+    # the themes of the whole review set, and keeps at most max_text_units
+    text_units = await text_unit_vector_store.find_by_target(
+        target_id,
+        target_type,
+        limit=None if config.sampling_enabled else config.max_text_units,
+        with_embedding=config.sampling_enabled,  # Embeddings are used for clustering
+    )
 
+    record(rows_in=len(text_units))
     msg = f"Collected {len(text_units)} text units for {target_type} {target_id}."
     logger.info(msg)
-    task.update_state(
-        state="PROGRESS",
-        meta={
+    update_progress(
+        task,
+        context,
+        {
             "description": msg,
             "target_id": target_id,
             "target_type": target_type,
@@ -79,11 +106,73 @@ async def _internal(
     df[list_string_columns] = df[list_string_columns].astype(
         pd.ArrowDtype(pa.list_(pa.string()))
     )
+    if config.sampling_enabled:
+        # One contiguous float32 buffer instead of an object column of arrays
+        df["embedding"] = pd.Series(
+            pd.arrays.ArrowExtensionArray(
+                vectors_to_arrow(
+                    df["embedding"].tolist(),
+                    dim=text_unit_vector_store.profile.vector_dim,
+                )
+            ),
+            index=df.index,
+        )
+
+    if config.dedup_enabled:
+        collected = len(df)
+        df = deduplicate_text_units(
+            df,
+            text_column="text",
+            id_column="id",
+            threshold=config.dedup_threshold,
+            num_perm=config.dedup_num_perm,
+            num_bands=config.dedup_num_bands,
+            shingle_size=config.dedup_shingle_size,
+        )
+        msg = f"Dropped {collected - len(df)} near-duplicate text units."
+        update_progress(
+            task,
+            context,
+            {
+                "description": msg,
+                "target_id": target_id,
+                "target_type": target_type,
+                "deduplicated_text_units": len(df),
+            },
+        )
+
+    if config.sampling_enabled:
+        df = sample_text_units(
+            df,
+            token_budget=config.sampling_token_budget,
+            max_samples=config.max_text_units,
+            embedding_column="embedding",
+            token_column="n_tokens",
+            num_clusters=config.sampling_num_clusters,
+            batch_size=config.sampling_batch_size,
+            max_iter=config.sampling_max_iter,
+        )
+        df = df.assign(embedding=None)  # Embeddings are not needed downstream
+        msg = f"Sampled {len(df)} representative text units."
+        update_progress(
+            task,
+            context,
+            {
+                "description": msg,
+                "target_id": target_id,
+                "target_type": target_type,
+                "sampled_text_units": len(df),
+            },
+        )
 
     filename = f"text_units_{uuid7()}.parquet"
-    df.to_parquet(
-        f"s3://review-summary/{filename}",
-        storage_options=get_storage_options(),
-    )
+    write_checkpoint(df, filename)
     context["text_units"] = filename
     logger.info(f"Saved text units to 's3://review-summary/{filename}'.")
+
+
+def _embedding_profile(context: dict[str, Any]) -> EmbeddingProfile:
+    """The embedding profile the pipeline was started with."""
+    return EmbeddingProfile.model_validate(
+        context.get("embedding_profile") or get_settings().embedding
+    )
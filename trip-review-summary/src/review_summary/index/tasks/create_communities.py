@@ -4,7 +4,11 @@ from typing import Any
 
 from celery import Task, shared_task
 
+from review_summary.index.profiler import profile_stage
+
 
 @shared_task(bind=True)
 def run_workflow(self: Task[Any, Any], context: dict[str, Any]) -> dict[str, Any]:
+    with profile_stage(self, context, "create_communities"):
+        pass
     return context
@@ -9,8 +9,10 @@ from asgiref.sync import async_to_sync
 from celery import Task, shared_task
 from qdrant_client import AsyncQdrantClient
 
+from review_summary.config.embedding import EmbeddingProfile
 from review_summary.config.settings import get_settings
-from review_summary.utils.storage import get_storage_options
+from review_summary.index.checkpoints import read_checkpoint
+from review_summary.index.profiler import profile_stage, record, update_progress
 from review_summary.vector_stores.text_unit import TextUnitVectorStore
 
 logger = logging.getLogger(__name__)
@@ -18,7 +20,8 @@ logger = logging.getLogger(__name__)
 
 @shared_task(bind=True)
 def run_workflow(self: Task[Any, Any], context: dict[str, Any]) -> dict[str, Any]:
-    async_to_sync(_create_final_text_units)(self, context)
+    with profile_stage(self, context, "create_final_text_units"):
+        async_to_sync(_create_final_text_units)(self, context)
     return context
 
 
@@ -42,7 +45,7 @@ async def _create_final_text_units(
     qdrant_client = AsyncQdrantClient(url=qdrant_settings.url)
     try:
         text_unit_vector_store = await TextUnitVectorStore.create_vector_store(
-            client=qdrant_client, vector_dim=context.get("vector_dim", 3072)
+            client=qdrant_client, profile=_embedding_profile(context)
         )
         await _internal(task, context, text_unit_vector_store)
 
@@ -58,21 +61,9 @@ async def _internal(
     text_units_filename = context["text_units"]
     entities_filename = context["entities"]
     relationships_filename = context["relationships"]
-    text_units = pd.read_parquet(
-        f"s3://review-summary/{text_units_filename}",
-        storage_options=get_storage_options(),
-        dtype_backend="pyarrow",
-    )
-    final_entities = pd.read_parquet(
-        f"s3://review-summary/{entities_filename}",
-        storage_options=get_storage_options(),
-        dtype_backend="pyarrow",
-    )
-    final_relationships = pd.read_parquet(
-        f"s3://review-summary/{relationships_filename}",
-        storage_options=get_storage_options(),
-        dtype_backend="pyarrow",
-    )
+    text_units = read_checkpoint(text_units_filename)
+    final_entities = read_checkpoint(entities_filename)
+    final_relationships = read_checkpoint(relationships_filename)
 
     logger.info("Joining final entities and relationships to text units.")
     entity_join = _entities(final_entities)
@@ -102,10 +93,11 @@ async def _internal(
 
     message = f"Aggregated {len(aggregated)} final text units."
     logger.info(message)
-    task.update_state(state="PROGRESS", meta={"description": message})
+    update_progress(task, context, {"description": message})
 
     # Save final text units into Qdrant vector store
     await text_unit_vector_store.update_final_text_units(aggregated)
+    record(rows_out=len(aggregated))
     logger.info("Final text units saved to vector store.")
 
 
@@ -135,3 +127,10 @@ def _relationships(df: pd.DataFrame) -> pd.DataFrame:
 
 def _join(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
     return left.merge(right, on="id", how="left", suffixes=["_1", "_2"])
+
+
+def _embedding_profile(context: dict[str, Any]) -> EmbeddingProfile:
+    """The embedding profile the pipeline was started with."""
+    return EmbeddingProfile.model_validate(
+        context.get("embedding_profile") or get_settings().embedding
+    )
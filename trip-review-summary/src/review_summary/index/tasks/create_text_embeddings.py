@@ -7,13 +7,15 @@ from asgiref.sync import async_to_sync
 from celery import Task, shared_task
 from qdrant_client import AsyncQdrantClient
 
+from review_summary.config.embedding import EmbeddingProfile
 from review_summary.config.index.create_text_embeddings_config import (
     CreateTextEmbeddingsConfig,
 )
 from review_summary.config.settings import get_settings
+from review_summary.index.checkpoints import read_checkpoint
 from review_summary.index.operations.embed_text import embed_text
-from review_summary.models import Entity
-from review_summary.utils.storage import get_storage_options
+from review_summary.index.profiler import profile_stage, record
+from review_summary.models import ENTITIES_ADAPTER
 from review_summary.vector_stores.entity import EntityVectorStore
 
 
@@ -21,9 +23,10 @@ from review_summary.vector_stores.entity import EntityVectorStore
 def run_workflow(
     self: Task[Any, Any], context: dict[str, Any], config: dict[str, Any]
 ) -> dict[str, Any]:
-    async_to_sync(_create_text_embeddings)(
-        self, context, CreateTextEmbeddingsConfig.model_validate(config)
-    )
+    with profile_stage(self, context, "create_text_embeddings"):
+        async_to_sync(_create_text_embeddings)(
+            self, context, CreateTextEmbeddingsConfig.model_validate(config)
+        )
     return context
 
 
@@ -34,7 +37,7 @@ async def _create_text_embeddings(
     qdrant_client = AsyncQdrantClient(url=qdrant_settings.url)
     try:
         entity_vector_store = await EntityVectorStore.create_vector_store(
-            client=qdrant_client, vector_dim=context.get("vector_dim", 3072)
+            client=qdrant_client, profile=_embedding_profile(context)
         )
         await _internal(task, context, config, entity_vector_store)
 
@@ -51,11 +54,7 @@ async def _internal(
     entities: pd.DataFrame | None = None
     if "entities" in config.fields_to_embed:
         entities_filename = context["entities"]
-        entities = pd.read_parquet(
-            f"s3://review-summary/{entities_filename}",
-            storage_options=get_storage_options(),
-            dtype_backend="pyarrow",
-        )
+        entities = read_checkpoint(entities_filename)
 
     if entities is not None:
         for column_name in config.fields_to_embed.get("entities", []):
@@ -63,11 +62,22 @@ async def _internal(
                 texts=entities[column_name].tolist(),
                 batch_size=config.batch_size,
                 batch_max_tokens=config.batch_max_tokens,
-                embedding_model_config=config.embedding_llm_config,
+                embedding_model_config={
+                    **config.embedding_llm_config,
+                    **entity_vector_store.profile.embedding_model_config(),
+                },
             )
 
     # Save entities with embeddings to vector store
     if entities is not None:
         await entity_vector_store.save_multiple(
-            [Entity.model_validate(row.to_dict()) for _, row in entities.iterrows()]
+            ENTITIES_ADAPTER.validate_python(entities.to_dict(orient="records"))
         )
+        record(rows_out=len(entities))
+
+
+def _embedding_profile(context: dict[str, Any]) -> EmbeddingProfile:
+    """The embedding profile the pipeline was started with."""
+    return EmbeddingProfile.model_validate(
+        context.get("embedding_profile") or get_settings().embedding
+    )
@@ -3,16 +3,16 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import pandas as pd
 from asgiref.sync import async_to_sync
 from celery import Task, shared_task
 
 from review_summary.config.index.extract_graph_config import ExtractGraphConfig
+from review_summary.index.checkpoints import read_checkpoint, write_checkpoint
 from review_summary.index.operations.extract_graph import extract_graph
 from review_summary.index.operations.summarize_descriptions import (
     summarize_descriptions,
 )
-from review_summary.utils.storage import get_storage_options
+from review_summary.index.profiler import profile_stage, update_progress
 from review_summary.utils.uuid import uuid7
 
 logger = logging.getLogger(__name__)
@@ -22,9 +22,10 @@ logger = logging.getLogger(__name__)
 def run_workflow(
     self: Task[Any, Any], context: dict[str, Any], config: dict[str, Any]
 ) -> dict[str, Any]:
-    async_to_sync(_extract_graph)(
-        self, context, ExtractGraphConfig.model_validate(config)
-    )
+    with profile_stage(self, context, "extract_graph"):
+        async_to_sync(_extract_graph)(
+            self, context, ExtractGraphConfig.model_validate(config)
+        )
     return context
 
 
@@ -52,11 +53,7 @@ async def _extract_graph(
     """  # noqa: E501
     # Load text units DataFrame from storage
     text_units_filename = context["text_units"]
-    text_units = pd.read_parquet(
-        f"s3://review-summary/{text_units_filename}",
-        storage_options=get_storage_options(),
-        dtype_backend="pyarrow",
-    )
+    text_units = read_checkpoint(text_units_filename)
     logger.info(f"Loaded text units from {text_units_filename}.")
 
     extracted_entities, extracted_relationships = await extract_graph(
@@ -67,6 +64,7 @@ async def _extract_graph(
         chat_model_config=config.graph_llm_config,
         max_gleanings=config.max_gleanings,
         num_concurrency=config.graph_num_concurrency,
+        extraction_mode=config.extraction_mode,
     )
 
     if len(extracted_entities) == 0:
@@ -83,9 +81,10 @@ async def _extract_graph(
 
     logger.info(f"Extracted {len(extracted_relationships)} raw relationships.")
 
-    task.update_state(
-        state="PROGRESS",
-        meta={
+    update_progress(
+        task,
+        context,
+        {
             "description": "Graph extraction completed.",
             "extracted_entities": len(extracted_entities),
             "extracted_relationships": len(extracted_relationships),
@@ -99,6 +98,13 @@ async def _extract_graph(
         max_input_tokens=config.max_input_tokens,
         max_summary_length=config.max_length,
         num_concurrency=config.summary_num_concurrency,
+        tiered=config.summary_tiered,
+        extractive_max_length=config.summary_extractive_max_length,
+        conflict_threshold=config.summary_conflict_threshold,
+        batched=config.summary_batched,
+        batch_max_tokens=config.summary_batch_max_tokens,
+        batch_max_size=config.summary_batch_max_size,
+        batch_max_retries=config.summary_batch_max_retries,
     )
 
     relationships = extracted_relationships.drop(columns=["description"]).merge(
@@ -114,15 +120,9 @@ async def _extract_graph(
     # Save entities and relationships to storage
     checkpoint_id = uuid7()
     entities_filename = f"entities_{checkpoint_id}.parquet"
-    entities.to_parquet(
-        f"s3://review-summary/{entities_filename}",
-        storage_options=get_storage_options(),
-    )
+    write_checkpoint(entities, entities_filename)
     relationships_filename = f"relationships_{checkpoint_id}.parquet"
-    relationships.to_parquet(
-        f"s3://review-summary/{relationships_filename}",
-        storage_options=get_storage_options(),
-    )
+    write_checkpoint(relationships, relationships_filename)
 
     # Update context with filenames
     context["entities"] = entities_filename
@@ -10,8 +10,11 @@ from neo4j import Driver, GraphDatabase
 
 from review_summary.config.index.finalize_graph_config import FinalizeGraphConfig
 from review_summary.config.settings import get_settings
+from review_summary.index.checkpoints import read_checkpoint, write_checkpoint
 from review_summary.index.operations.create_graph import create_graph
-from review_summary.utils.storage import get_storage_options
+from review_summary.index.profiler import profile_stage, update_progress
+from review_summary.tokenizer.tiktoken import TiktokenTokenizer
+from review_summary.tokenizer.tokenizer import Tokenizer
 from review_summary.utils.uuid import uuid7
 
 logger = logging.getLogger(__name__)
@@ -21,7 +24,8 @@ logger = logging.getLogger(__name__)
 def run_workflow(
     self: Task[Any, Any], context: dict[str, Any], config: dict[str, Any]
 ) -> dict[str, Any]:
-    _finalize_graph(self, context, FinalizeGraphConfig.model_validate(config))
+    with profile_stage(self, context, "finalize_graph"):
+        _finalize_graph(self, context, FinalizeGraphConfig.model_validate(config))
     return context
 
 
@@ -29,29 +33,33 @@ def _finalize_graph(
     task: Task[Any, Any], context: dict[str, Any], config: FinalizeGraphConfig
 ) -> None:
     """Final `entities` pyarrow schema:
-    | Column        | Type         | Description                                          |
-    | :------------ | :----------- | :--------------------------------------------------- |
-    | id            | string       | ID of the Entity                                     |
-    | readable_id   | string       | Human-friendly ID of the Entity                      |
-    | title         | string       | Name of the Entity                                   |
-    | type          | string       | Type of the Entity                                   |
-    | description   | string       | Description of the Entity                            |
-    | text_unit_ids | list<string> | IDs of TextUnits from which the Entity was extracted |
-    | frequency     | int64        | Frequency of the Entity appearance in all TextUnits  |
-    | attributes    | struct       | Attributes including target information              |
+    | Column            | Type         | Description                                          |
+    | :---------------- | :----------- | :--------------------------------------------------- |
+    | id                | string       | ID of the Entity                                     |
+    | readable_id       | string       | Human-friendly ID of the Entity                      |
+    | title             | string       | Name of the Entity                                   |
+    | type              | string       | Type of the Entity                                   |
+    | description       | string       | Description of the Entity                            |
+    | text_unit_ids     | list<string> | IDs of TextUnits from which the Entity was extracted |
+    | frequency         | int64        | Frequency of the Entity appearance in all TextUnits  |
+    | n_tokens          | int64        | Number of tokens of the description                  |
+    | n_tokens_encoding | string       | Tiktoken encoding of n_tokens                        |
+    | attributes        | struct       | Attributes including target information              |
 
     ---
     Final `relationships` pyarrow schema:
-    | Column        | Type         | Description                                                |
-    | :------------ | :----------- | :--------------------------------------------------------- |
-    | id            | string       | ID of the Relationship                                     |
-    | readable_id   | string       | Human-friendly ID of the Relationship                      |
-    | source        | string       | Source Entity name of the Relationship                     |
-    | target        | string       | Target Entity name of the Relationship                     |
-    | description   | string       | Description of the Relationship                            |
-    | text_unit_ids | list<string> | IDs of TextUnits from which the Relationship was extracted |
-    | weight        | double       | Weight of the Relationship                                 |
-    | attributes    | struct       | Attributes including target information                    |
+    | Column            | Type         | Description                                                |
+    | :---------------- | :----------- | :--------------------------------------------------------- |
+    | id                | string       | ID of the Relationship                                     |
+    | readable_id       | string       | Human-friendly ID of the Relationship                      |
+    | source            | string       | Source Entity name of the Relationship                     |
+    | target            | string       | Target Entity name of the Relationship                     |
+    | description       | string       | Description of the Relationship                            |
+    | text_unit_ids     | list<string> | IDs of TextUnits from which the Relationship was extracted |
+    | weight            | double       | Weight of the Relationship                                 |
+    | n_tokens          | int64        | Number of tokens of the description                        |
+    | n_tokens_encoding | string       | Tiktoken encoding of n_tokens                              |
+    | attributes        | struct       | Attributes including target information                    |
     """  # noqa: E501
     settings = get_settings()
     neo4j_driver = GraphDatabase.driver(  # pyright: ignore
@@ -82,16 +90,8 @@ def _internal(
 ) -> None:
     entities_filename = context["entities"]
     relationships_filename = context["relationships"]
-    entities = pd.read_parquet(
-        f"s3://review-summary/{entities_filename}",
-        storage_options=get_storage_options(),
-        dtype_backend="pyarrow",
-    )
-    relationships = pd.read_parquet(
-        f"s3://review-summary/{relationships_filename}",
-        storage_options=get_storage_options(),
-        dtype_backend="pyarrow",
-    )
+    entities = read_checkpoint(entities_filename)
+    relationships = read_checkpoint(relationships_filename)
     logger.info(
         f"Loaded entities from {entities_filename} and "
         f"relationships from {relationships_filename}."
@@ -99,6 +99,9 @@ def _internal(
 
     target_id = context["target_id"]
     target_type = context["target_type"]
+    attributes: dict[str, Any] = {"target_id": target_id, "target_type": target_type}
+    if "index_version" in context:
+        attributes["index_version"] = context["index_version"]
 
     # Finalize entities by adding columns: id, readable_id, and attributes
     final_entities = entities.drop_duplicates(subset="title")
@@ -106,10 +109,7 @@ def _internal(
     final_entities = final_entities.assign(
         id=[str(uuid7()) for _ in range(len(final_entities))],
         readable_id=final_entities.index.astype(str),
-        attributes=pd.Series(
-            {"target_id": target_id, "target_type": target_type}
-            for _ in range(len(final_entities))
-        ),
+        attributes=pd.Series(dict(attributes) for _ in range(len(final_entities))),
     )[["id", "readable_id", *entities.columns, "attributes"]]
 
     # Finalize relationships by adding columns: id, readable_id, and attributes
@@ -118,31 +118,31 @@ def _internal(
     final_relationships = final_relationships.assign(
         id=[str(uuid7()) for _ in range(len(final_relationships))],
         readable_id=final_relationships.index.astype(str),
-        attributes=pd.Series(
-            {"target_id": target_id, "target_type": target_type}
-            for _ in range(len(final_relationships))
-        ),
+        attributes=pd.Series(dict(attributes) for _ in range(len(final_relationships))),
     )[["id", "readable_id", *relationships.columns, "attributes"]]
 
+    # Count description tokens once at index time, for query context budgeting
+    tokenizer = TiktokenTokenizer(config.encoding_name)
+    final_entities["n_tokens"] = _count_tokens(tokenizer, final_entities["description"])
+    final_relationships["n_tokens"] = _count_tokens(
+        tokenizer, final_relationships["description"]
+    )
+    final_entities["n_tokens_encoding"] = config.encoding_name
+    final_relationships["n_tokens_encoding"] = config.encoding_name
+
     message = (
         f"Finalized {len(final_entities)} entities and "
         f"{len(final_relationships)} relationships."
     )
     logger.info(message)
-    task.update_state(state="PROGRESS", meta={"description": message})
+    update_progress(task, context, {"description": message})
 
     # Save entities and relationships to storage
     checkpoint_id = checkpoint_id or str(uuid7())
     entities_filename = f"entities_{checkpoint_id}.parquet"
-    final_entities.to_parquet(
-        f"s3://review-summary/{entities_filename}",
-        storage_options=get_storage_options(),
-    )
+    write_checkpoint(final_entities, entities_filename)
     relationships_filename = f"relationships_{checkpoint_id}.parquet"
-    final_relationships.to_parquet(
-        f"s3://review-summary/{relationships_filename}",
-        storage_options=get_storage_options(),
-    )
+    write_checkpoint(final_relationships, relationships_filename)
 
     # Update context with filenames
     context["entities"] = entities_filename
@@ -165,3 +165,14 @@ def _internal(
 
     if config.embed_graph_enabled and isinstance(gds, GraphDataScience):
         raise NotImplementedError("Graph embedding is coming soon!")
+
+
+def _count_tokens(tokenizer: Tokenizer, descriptions: pd.Series) -> pd.Series:
+    return pd.Series(
+        [
+            tokenizer.num_tokens(description) if isinstance(description, str) else 0
+            for description in descriptions
+        ],
+        index=descriptions.index,
+        dtype="int64[pyarrow]",
+    )
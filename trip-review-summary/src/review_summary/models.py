@@ -1,8 +1,11 @@
-from typing import Any
+from typing import Any, Self, cast
 
-from pydantic import BaseModel, Field
+import numpy as np
+import numpy.typing as npt
+from pydantic import BaseModel, Field, TypeAdapter
 
 from review_summary.utils.uuid import uuid7
+from review_summary.utils.vector import Vector
 
 
 class Identified(BaseModel):
@@ -17,6 +20,25 @@ class Identified(BaseModel):
         "such as in a report text.",
     )
 
+    @classmethod
+    def from_store(cls, data: dict[str, Any]) -> Self:
+        """Build the model from a record read back from Qdrant or Neo4j.
+
+        The records were dumped from these models by this service, so validation
+        (of every float of the embeddings, among others) is skipped. Missing fields
+        take their defaults.
+        """
+        return cls.model_construct(**data)
+
+    def __eq__(self, other: object) -> bool:
+        # Compare vectors by value, ndarray == is elementwise
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(
+            _field_equal(getattr(self, name), getattr(other, name))
+            for name in type(self).model_fields
+        )
+
 
 class Named(Identified):
     title: str = Field(..., description="The name/title of the item.")
@@ -36,7 +58,7 @@ class Document(Named):
 
 class TextUnit(Identified):
     text: str = Field(..., description="The text of the unit.")
-    embedding: list[float] | None = Field(
+    embedding: Vector | None = Field(
         default=None, description="The semantic (i.e. text) embedding of the text unit."
     )
     entity_ids: list[str] | None = Field(
@@ -48,6 +70,9 @@ class TextUnit(Identified):
     n_tokens: int | None = Field(
         default=None, description="The number of tokens in the text."
     )
+    n_tokens_encoding: str | None = Field(
+        default=None, description="The tiktoken encoding n_tokens was counted in."
+    )
     document_id: str | None = Field(
         default=None, description="The document ID in which the text unit appears."
     )
@@ -62,11 +87,11 @@ class Entity(Named):
     description: str | None = Field(
         default=None, description="The description of the entity."
     )
-    description_embedding: list[float] | None = Field(
+    description_embedding: Vector | None = Field(
         default=None,
         description="The semantic (i.e. text) embedding of the description.",
     )
-    title_embedding: list[float] | None = Field(
+    title_embedding: Vector | None = Field(
         default=None, description="The semantic (i.e. text) embedding of the entity."
     )
     community_ids: list[str] | None = Field(
@@ -76,6 +101,12 @@ class Entity(Named):
         default=None,
         description="List of text unit IDs in which the entity appears.",
     )
+    n_tokens: int | None = Field(
+        default=None, description="The number of tokens in the description."
+    )
+    n_tokens_encoding: str | None = Field(
+        default=None, description="The tiktoken encoding n_tokens was counted in."
+    )
     rank: int | None = Field(
         default=1,
         description=(
@@ -96,7 +127,7 @@ class Relationship(Identified):
     description: str | None = Field(
         default=None, description="The description of the relationship."
     )
-    description_embedding: list[float] | None = Field(
+    description_embedding: Vector | None = Field(
         default=None,
         description="The semantic embedding for the relationship description.",
     )
@@ -104,6 +135,12 @@ class Relationship(Identified):
         default=None,
         description="List of text unit IDs in which the relationship appears.",
     )
+    n_tokens: int | None = Field(
+        default=None, description="The number of tokens in the description."
+    )
+    n_tokens_encoding: str | None = Field(
+        default=None, description="The tiktoken encoding n_tokens was counted in."
+    )
     rank: int | None = Field(
         default=1,
         description=(
@@ -135,7 +172,7 @@ class CommunityReport(Named):
     rank: float | None = 1.0
     """Rank of the report, used for sorting (optional). Higher means more important"""
 
-    full_content_embedding: list[float] | None = None
+    full_content_embedding: Vector | None = None
     """The semantic (i.e. text) embedding of the full report content (optional)."""
 
     attributes: dict[str, Any] | None = None
@@ -174,3 +211,19 @@ class CommunityReport(Named):
             size=d.get(size_key),
             period=d.get(period_key),
         )
+
+
+def _field_equal(left: Any, right: Any) -> bool:
+    if isinstance(left, np.ndarray) or isinstance(right, np.ndarray):
+        return (
+            isinstance(left, np.ndarray)
+            and isinstance(right, np.ndarray)
+            and np.array_equal(
+                cast("npt.NDArray[Any]", left), cast("npt.NDArray[Any]", right)
+            )
+        )
+    return bool(left == right)
+
+
+# Validate a list of entities in one call, for data not read back from the stores
+ENTITIES_ADAPTER = TypeAdapter(list[Entity])
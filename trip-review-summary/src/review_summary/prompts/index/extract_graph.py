@@ -124,3 +124,44 @@ Output:
 
 CONTINUE_PROMPT = "MANY entities and relationships were missed in the last extraction. Remember to ONLY emit entities that match any of the previously extracted types. Add them below using the same format:\n"  # noqa: E501
 LOOP_PROMPT = "It appears some entities and relationships may have still been missed. Answer Y if there are still entities or relationships that need to be added, or N if there are none. Please answer with a single letter Y or N.\n"  # noqa: E501
+
+STRUCTURED_GRAPH_EXTRACTION_PROMPT = """
+-Goal-
+Given a text document that is potentially relevant to this activity and a list of entity types, identify all entities of those types from the text and all relationships among the identified entities.
+
+-Steps-
+1. Identify all entities. For each identified entity, extract the following information:
+- name: Name of the entity, capitalized
+- type: One of the following types: [{entity_types}]
+- description: Comprehensive description of the entity's attributes and activities
+
+2. From the entities identified in step 1, identify all pairs of (source, target) that are *clearly related* to each other.
+For each pair of related entities, extract the following information:
+- source: name of the source entity, as identified in step 1
+- target: name of the target entity, as identified in step 1
+- description: explanation as to why you think the source entity and the target entity are related to each other
+- strength: a numeric score indicating strength of the relationship between the source entity and target entity
+
+3. Return output in English as a JSON object with an "entities" list and a "relationships" list.
+
+######################
+-Example-
+######################
+Entity_types: ORGANIZATION,PERSON
+Text:
+The Verdantis's Central Institution is scheduled to meet on Monday and Thursday, with the institution planning to release its latest policy decision on Thursday at 1:30 p.m. PDT, followed by a press conference where Central Institution Chair Martin Smith will take questions.
+######################
+Output:
+{{"entities": [{{"name": "CENTRAL INSTITUTION", "type": "ORGANIZATION", "description": "The Central Institution is the Federal Reserve of Verdantis, which is setting interest rates on Monday and Thursday"}}, {{"name": "MARTIN SMITH", "type": "PERSON", "description": "Martin Smith is the chair of the Central Institution"}}], "relationships": [{{"source": "MARTIN SMITH", "target": "CENTRAL INSTITUTION", "description": "Martin Smith is the Chair of the Central Institution and will answer questions at a press conference", "strength": 9}}]}}
+
+######################
+-Real Data-
+######################
+Entity_types: {entity_types}
+Text:
+{input_text}
+######################
+Output:
+""".lstrip()  # noqa: E501
+
+STRUCTURED_CONTINUE_PROMPT = "MANY entities and relationships were missed in the last extraction. Remember to ONLY emit entities that match any of the previously extracted types. Return only the missing entities and relationships in the same JSON format.\n"  # noqa: E501
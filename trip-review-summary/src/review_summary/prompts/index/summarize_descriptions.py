@@ -13,3 +13,19 @@ Description List: {description_list}
 #######
 Output:
 """.lstrip()  # noqa: E501
+
+BATCH_SUMMARIZE_PROMPT = """
+You are a helpful assistant responsible for generating comprehensive summaries of the data provided below.
+Each item below identifies one entity (by its name) or one relationship (by its source and target entity names), together with a list of descriptions all related to it.
+For EVERY item, concatenate all of its descriptions into a single, comprehensive description. Make sure to include information collected from all the descriptions.
+If the provided descriptions are contradictory, please resolve the contradictions and provide a single, coherent summary.
+Make sure it is written in third person, and include the entity names so we have the full context.
+Limit each final description length to {max_length} words.
+Return one summary per item, copying the item's "name" list exactly as given.
+
+#######
+-Data-
+Items: {items}
+#######
+Output:
+""".lstrip()  # noqa: E501
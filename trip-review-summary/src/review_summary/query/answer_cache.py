@@ -0,0 +1,144 @@
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+import numpy.typing as npt
+
+from review_summary.query.base import SearchResult
+
+logger = logging.getLogger(__name__)
+
+CacheKey = tuple[str, int | None]
+
+
+@dataclass
+class AnswerCacheMetrics:
+    """Counters of the semantic answer cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    # Running sum of the similarity of the hits
+    hit_similarity_sum: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    @property
+    def mean_hit_similarity(self) -> float | None:
+        return self.hit_similarity_sum / self.hits if self.hits > 0 else None
+
+
+@dataclass
+class _Entry:
+    embeddings: list[npt.NDArray[np.float32]] = field(
+        default_factory=list[npt.NDArray[np.float32]]
+    )
+    results: list[SearchResult] = field(default_factory=list[SearchResult])
+
+
+class SemanticAnswerCache:
+    """Cache search results by query embedding similarity.
+
+    Entries are partitioned by (target_id, index_version), so that rebuilding a
+    target index with a new version never serves answers built from the old one.
+    A lookup returns the cached result of the most similar query whose cosine
+    similarity reaches `similarity_threshold`. Beyond `max_entries`, answers are
+    evicted from the least recently used partition, oldest first.
+    """
+
+    def __init__(self, max_entries: int = 1024, similarity_threshold: float = 0.95):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.metrics = AnswerCacheMetrics()
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def lookup(
+        self, target_id: str, index_version: int | None, query_embedding: list[float]
+    ) -> tuple[SearchResult | None, float | None]:
+        """Return the most similar cached result, None on a miss, and the similarity
+        of the most similar cached query, None if the target has no answers."""
+        key = (target_id, index_version)
+        entry = self._entries.get(key)
+        if entry is None or len(entry.embeddings) == 0:
+            self.metrics.misses += 1
+            return None, None
+
+        similarities = np.stack(entry.embeddings) @ _normalize(query_embedding)
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+        if similarity < self.similarity_threshold:
+            self.metrics.misses += 1
+            return None, similarity
+
+        self.metrics.hits += 1
+        self.metrics.hit_similarity_sum += similarity
+        # Move the hit answer to the most recently used position
+        entry.embeddings.append(entry.embeddings.pop(best))
+        entry.results.append(entry.results.pop(best))
+        self._entries.move_to_end(key)
+        return entry.results[-1], similarity
+
+    def store(
+        self,
+        target_id: str,
+        index_version: int | None,
+        query_embedding: list[float],
+        result: SearchResult,
+    ) -> None:
+        """Cache a search result for a query of the target index."""
+        self._drop_stale_versions(target_id, index_version)
+        key = (target_id, index_version)
+        entry = self._entries.setdefault(key, _Entry())
+        entry.embeddings.append(_normalize(query_embedding))
+        entry.results.append(result)
+        self._entries.move_to_end(key)
+        self._size += 1
+
+        while self._size > self.max_entries:
+            self._evict_one()
+
+    def invalidate(self, target_id: str) -> None:
+        """Drop all cached results of a target, e.g. after its index is rebuilt."""
+        for key in [key for key in self._entries if key[0] == target_id]:
+            self._size -= len(self._entries.pop(key).results)
+            self.metrics.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _drop_stale_versions(self, target_id: str, index_version: int | None) -> None:
+        stale_keys = [
+            key
+            for key in self._entries
+            if key[0] == target_id and key[1] != index_version
+        ]
+        for key in stale_keys:
+            logger.debug(f"Invalidate cached answers of stale index {key}.")
+            self._size -= len(self._entries.pop(key).results)
+            self.metrics.invalidations += 1
+
+    def _evict_one(self) -> None:
+        # The least recently used partition holds its least recently used answer
+        # at the front of its lists
+        key, entry = next(iter(self._entries.items()))
+        entry.embeddings.pop(0)
+        entry.results.pop(0)
+        if len(entry.results) == 0:
+            del self._entries[key]
+        self._size -= 1
+        self.metrics.evictions += 1
+
+
+def _normalize(vector: list[float]) -> npt.NDArray[np.float32]:
+    array = np.asarray(vector, dtype=np.float32)
+    return array / max(float(np.linalg.norm(array)), 1e-12)
@@ -1,5 +1,6 @@
 """Base classes for search algos."""
 
+from collections.abc import Mapping
 from dataclasses import dataclass
 from typing import Any
 
@@ -11,7 +12,8 @@ class SearchResult:
     """A Structured Search Result."""
 
     response: str | dict[str, Any] | list[dict[str, Any]]
-    context_data: str | list[pd.DataFrame] | dict[str, pd.DataFrame]
+    # context tables, LocalSearch returns lazy ContextRecords
+    context_data: str | list[pd.DataFrame] | Mapping[str, pd.DataFrame]
     # actual text strings that are in the context window, built from context_data
     context_text: str | list[str] | dict[str, str]
     completion_time: float
@@ -23,3 +25,7 @@ class SearchResult:
     llm_calls_categories: dict[str, int] | None = None
     prompt_tokens_categories: dict[str, int] | None = None
     output_tokens_categories: dict[str, int] | None = None
+    # seconds spent in each stage of the query path, e.g. query_embedding
+    timings: dict[str, float] | None = None
+    # similarity of the most similar query in the answer cache, if it was looked up
+    answer_cache_similarity: float | None = None
@@ -1,14 +1,62 @@
-from dataclasses import dataclass
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
 
 import pandas as pd
 
+from review_summary.query.context_builder.context_table import ContextTable
+
+
+class ContextRecords(Mapping[str, pd.DataFrame]):
+    """The context tables of a query, as DataFrames built on first access.
+
+    Builders store the rows of their `ContextTable` as is. Callers that never read
+    the records, like the A2A agent, pay no DataFrame construction; `rows` gives
+    the plain row tuples without building a DataFrame either.
+    """
+
+    def __init__(self, tables: Mapping[str, ContextTable | pd.DataFrame] | None = None):
+        self._tables: dict[str, ContextTable | pd.DataFrame] = dict(tables or {})
+        self._frames: dict[str, pd.DataFrame] = {}
+
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        frame = self._frames.get(name)
+        if frame is None:
+            table = self._tables[name]
+            frame = table if isinstance(table, pd.DataFrame) else table.to_dataframe()
+            self._frames[name] = frame
+        return frame
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tables)
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def __repr__(self) -> str:
+        return f"ContextRecords({list(self._tables)})"
+
+    def rows(self, name: str) -> list[tuple[str, ...]]:
+        """Return the rows of a table as tuples, without building a DataFrame."""
+        table = self._tables[name]
+        if isinstance(table, pd.DataFrame):
+            return list(table.itertuples(index=False, name=None))
+        return [tuple(record) for record in table.records]
+
+    def update(self, other: "ContextRecords") -> None:
+        """Add or replace the tables of another set of records."""
+        for name in other:
+            self._frames.pop(name, None)
+        self._tables.update(other._tables)  # pyright: ignore[reportPrivateUsage]
+
 
 @dataclass
 class ContextBuilderResult:
     """A class to hold the results of the build_context."""
 
     context_chunks: str | list[str]
-    context_records: dict[str, pd.DataFrame]
+    context_records: ContextRecords = field(default_factory=ContextRecords)
     llm_calls: int = 0
     prompt_tokens: int = 0
     output_tokens: int = 0
+    # seconds spent in each stage of the build
+    timings: dict[str, float] = field(default_factory=dict[str, float])
@@ -7,6 +7,7 @@ from typing import Any, cast
 import pandas as pd
 
 from review_summary.models import CommunityReport, Entity
+from review_summary.query.context_builder.builders import ContextRecords
 from review_summary.tokenizer.tokenizer import Tokenizer
 
 logger = logging.getLogger(__name__)
@@ -33,7 +34,7 @@ def build_community_context(
     single_batch: bool = True,
     context_name: str = "Reports",
     random_state: int = 86,
-) -> tuple[str | list[str], dict[str, pd.DataFrame]]:
+) -> tuple[str | list[str], ContextRecords]:
     """
     Prepare community report data table as context data for system prompt.
 
@@ -43,7 +44,6 @@ def build_community_context(
     The calculated weight is added as an attribute to the community reports and added to
     the context data table.
     """
-    tokenizer = tokenizer
 
     def _is_included(report: CommunityReport) -> bool:
         return report.rank is not None and report.rank >= min_community_rank
@@ -97,7 +97,7 @@ def build_community_context(
     selected_reports = [report for report in community_reports if _is_included(report)]
 
     if len(selected_reports) == 0:
-        return ([], {})
+        return ([], ContextRecords())
 
     if shuffle_data:
         random.seed(random_state)
@@ -113,17 +113,16 @@ def build_community_context(
     all_context_text: list[str] = []
     all_context_records: list[pd.DataFrame] = []
 
-    # batch variables
-    batch_text: str = ""
+    # batch variables, the batch text is rendered from the sorted records on cut
+    header_tokens = tokenizer.num_tokens(
+        f"-----{context_name}-----" + "\n" + column_delimiter.join(header) + "\n"
+    )
     batch_tokens: int = 0
     batch_records: list[list[str]] = []
 
     def _init_batch() -> None:
-        nonlocal batch_text, batch_tokens, batch_records
-        batch_text = (
-            f"-----{context_name}-----" + "\n" + column_delimiter.join(header) + "\n"
-        )
-        batch_tokens = tokenizer.num_tokens(batch_text)
+        nonlocal batch_tokens, batch_records
+        batch_tokens = header_tokens
         batch_records = []
 
     def _cut_batch() -> None:
@@ -162,7 +161,6 @@ def build_community_context(
             _init_batch()
 
         # add current report to the current batch
-        batch_text += new_context_text
         batch_tokens += new_tokens
         batch_records.append(new_context)
 
@@ -178,11 +176,11 @@ def build_community_context(
 
     if len(all_context_records) == 0:
         logger.warning(NO_COMMUNITY_RECORDS_WARNING)
-        return ([], {})
+        return ([], ContextRecords())
 
-    return all_context_text, {
-        context_name.lower(): pd.concat(all_context_records, ignore_index=True)
-    }
+    return all_context_text, ContextRecords(
+        {context_name.lower(): pd.concat(all_context_records, ignore_index=True)}
+    )
 
 
 def _compute_community_weights(
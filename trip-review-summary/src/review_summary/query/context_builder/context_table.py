@@ -0,0 +1,164 @@
+"""Incremental, token-budgeted context table."""
+
+import csv
+import io
+from bisect import bisect_right
+from collections.abc import Sequence
+from itertools import accumulate
+from typing import Any, cast
+
+import pandas as pd
+
+from review_summary.tokenizer.tokenizer import Tokenizer
+
+
+class ContextTable:
+    """Assemble a delimited context table row by row under a token budget.
+
+    Every row is rendered and tokenized once, and the table keeps the prefix sums of
+    the row token counts, so filling a table is linear in the number of rows instead
+    of re-encoding the whole text after each row. Rows may carry a known token count
+    (see `row_tokens`, built from the `n_tokens` stored by the index) to skip
+    tokenizing their long cells; when all counts of a batch are known the cut-off
+    row is found by binary search.
+
+    A `token_cache` mapping rendered rows to token counts can be shared by tables
+    built repeatedly from overlapping rows.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Tokenizer,
+        header: list[str],
+        context_name: str,
+        column_delimiter: str = "|",
+        max_context_tokens: int = 8000,
+        quote: bool = False,
+        token_cache: dict[str, int] | None = None,
+    ):
+        self.tokenizer = tokenizer
+        self.header = header
+        self.context_name = context_name
+        self.column_delimiter = column_delimiter
+        self.max_context_tokens = max_context_tokens
+        self.quote = quote
+        self.token_cache = token_cache if token_cache is not None else {}
+
+        self.records: list[list[str]] = []
+        self._title = f"-----{context_name}-----\n"
+        self._lines: list[str] = [self._render(header)]
+        self._header_tokens = tokenizer.num_tokens(self._title + self._lines[0])
+        # _cumulative_tokens[i] is the token count of rows 0..i
+        self._cumulative_tokens: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def num_tokens(self) -> int:
+        """The token count of the table, title and header included."""
+        rows_tokens = self._cumulative_tokens[-1] if self._cumulative_tokens else 0
+        return self._header_tokens + rows_tokens
+
+    def row_tokens(
+        self,
+        row: list[str],
+        cell: int,
+        cell_tokens: int | None,
+        cell_encoding: str | None,
+    ) -> int | None:
+        """Count the tokens of a row from the known token count of its longest cell.
+
+        `cell_tokens` is typically the description or text token count stored by
+        the index, in the `cell_encoding` encoding; only the short cells around it
+        are tokenized (and cached). Return None when the count of the cell is
+        unknown or was counted in another encoding than the tokenizer's.
+        """
+        if (
+            cell_tokens is None
+            or cell_encoding is None
+            or cell_encoding != self.tokenizer.encoding_name
+        ):
+            return None
+        others = self._render([*row[:cell], "", *row[cell + 1 :]])
+        return cell_tokens + self._count(others, None)
+
+    def append(self, row: list[str], n_tokens: int | None = None) -> bool:
+        """Append a row if it fits in the budget, return whether it was added."""
+        return self.append_group([row], [n_tokens])
+
+    def append_group(
+        self, rows: list[list[str]], n_tokens: Sequence[int | None] | None = None
+    ) -> bool:
+        """Append all rows if they fit together in the budget, or none of them."""
+        lines = [self._render(row) for row in rows]
+        counts = [
+            self._count(line, hint)
+            for line, hint in zip(lines, n_tokens or [None] * len(rows), strict=True)
+        ]
+        if self.num_tokens + sum(counts) > self.max_context_tokens:
+            return False
+        for row, line, count in zip(rows, lines, counts, strict=True):
+            self._add(row, line, count)
+        return True
+
+    def extend(
+        self, rows: list[list[str]], n_tokens: Sequence[int | None] | None = None
+    ) -> int:
+        """Append rows in order until the budget is reached.
+
+        Return the number of rows added.
+        """
+        hints = list(n_tokens) if n_tokens is not None else [None] * len(rows)
+        known_counts = [hint for hint in hints if hint is not None]
+        if len(known_counts) == len(rows):
+            # All counts are known, binary search the last row within the budget
+            cumulative = list(accumulate(known_counts, initial=self.num_tokens))
+            # No row fits when the table alone is over the budget
+            fitting = max(0, bisect_right(cumulative, self.max_context_tokens) - 1)
+            for row, count in zip(rows[:fitting], known_counts, strict=False):
+                self._add(row, self._render(row), count)
+            return fitting
+
+        added = 0
+        for row, hint in zip(rows, hints, strict=True):
+            if not self.append(row, hint):
+                break
+            added += 1
+        return added
+
+    def to_text(self) -> str:
+        """Render the table with its title and header."""
+        return self._title + "".join(self._lines)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Return the rows of the table, or an empty frame if there are none."""
+        if len(self.records) == 0:
+            return pd.DataFrame()
+        return pd.DataFrame(self.records, columns=cast("Any", self.header))
+
+    def _add(self, row: list[str], line: str, count: int) -> None:
+        self.records.append(row)
+        self._lines.append(line)
+        self._cumulative_tokens.append(
+            (self._cumulative_tokens[-1] if self._cumulative_tokens else 0) + count
+        )
+
+    def _count(self, line: str, hint: int | None) -> int:
+        if hint is not None:
+            return hint
+        count = self.token_cache.get(line)
+        if count is None:
+            count = self.tokenizer.num_tokens(line)
+            self.token_cache[line] = count
+        return count
+
+    def _render(self, row: list[str]) -> str:
+        if not self.quote:
+            return self.column_delimiter.join(row) + "\n"
+        # Quote like DataFrame.to_csv, for cells that may contain the delimiter
+        buffer = io.StringIO()
+        csv.writer(
+            buffer, delimiter=self.column_delimiter, lineterminator="\n"
+        ).writerow(row)
+        return buffer.getvalue()
@@ -8,6 +8,8 @@ from enum import Enum
 
 import pandas as pd
 
+from review_summary.query.context_builder.builders import ContextRecords
+from review_summary.query.context_builder.context_table import ContextTable
 from review_summary.tokenizer.tokenizer import Tokenizer
 
 """
@@ -155,7 +157,7 @@ class ConversationHistory:
         recency_bias: bool = True,
         column_delimiter: str = "|",
         context_name: str = "Conversation History",
-    ) -> tuple[str, dict[str, pd.DataFrame]]:
+    ) -> tuple[str, ContextRecords]:
         """
         Prepare conversation history as context data for system prompt.
 
@@ -173,7 +175,6 @@ class ConversationHistory:
             context_name: Name of the context, default is "Conversation History".
 
         """
-        tokenizer = tokenizer
         qa_turns = self.to_qa_turns()
         if include_user_turns_only:
             qa_turns = [
@@ -188,32 +189,23 @@ class ConversationHistory:
         # build context for qa turns
         # add context header
         if len(qa_turns) == 0 or not qa_turns:
-            return ("", {context_name: pd.DataFrame()})
-
-        # add table header
-        header = f"-----{context_name}-----" + "\n"
-
-        turn_list: list[dict[str, str | None]] = []
-        current_context_df = pd.DataFrame()
+            return ("", ContextRecords({context_name: pd.DataFrame()}))
+
+        # each QA turn is added whole, or not at all, until the budget is reached
+        table = ContextTable(
+            tokenizer=tokenizer,
+            header=["turn", "content"],
+            context_name=context_name,
+            column_delimiter=column_delimiter,
+            max_context_tokens=max_context_tokens,
+            quote=True,
+        )
         for turn in qa_turns:
-            turn_list.append(
-                {"turn": str(ConversationRole.USER), "content": turn.user_query.content}
-            )
-            if turn.assistant_answers:
-                turn_list.append(
-                    {
-                        "turn": str(ConversationRole.ASSISTANT),
-                        "content": turn.get_answer_text(),
-                    }
-                )
-
-            context_df = pd.DataFrame(turn_list)
-            context_text = header + context_df.to_csv(sep=column_delimiter, index=False)
-            if tokenizer.num_tokens(context_text) > max_context_tokens:
+            rows = [[str(ConversationRole.USER), turn.user_query.content]]
+            answer_text = turn.get_answer_text()
+            if answer_text is not None:
+                rows.append([str(ConversationRole.ASSISTANT), answer_text])
+            if not table.append_group(rows):
                 break
 
-            current_context_df = context_df
-        context_text = header + current_context_df.to_csv(
-            sep=column_delimiter, index=False
-        )
-        return (context_text, {context_name.lower(): current_context_df})
+        return (table.to_text(), ContextRecords({context_name.lower(): table}))
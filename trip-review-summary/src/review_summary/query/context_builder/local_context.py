@@ -1,17 +1,22 @@
 """Local Context Builder."""
 
+import logging
 from collections import defaultdict
-from typing import Any, cast
 
 import pandas as pd
 
 from review_summary.models import Entity, Relationship
+from review_summary.query.context_builder.builders import ContextRecords
+from review_summary.query.context_builder.context_table import ContextTable
 from review_summary.query.input.retrieval.relationships import (
+    RelationshipIndex,
     get_in_network_relationships,
     get_out_network_relationships,
 )
 from review_summary.tokenizer.tokenizer import Tokenizer
 
+logger = logging.getLogger(__name__)
+
 
 def build_entity_context(
     selected_entities: list[Entity],
@@ -21,15 +26,12 @@ def build_entity_context(
     rank_description: str = "number of relationships",
     column_delimiter: str = "|",
     context_name: str = "Entities",
-) -> tuple[str, pd.DataFrame]:
+) -> tuple[str, ContextRecords]:
     """Prepare entity data table as context data for system prompt."""
-    tokenizer = tokenizer
-
     if len(selected_entities) == 0:
-        return "", pd.DataFrame()
+        return "", ContextRecords({context_name.lower(): pd.DataFrame()})
 
     # add headers
-    current_context_text = f"-----{context_name}-----" + "\n"
     header = ["id", "entity", "description"]
     if include_entity_rank:
         header.append(rank_description)
@@ -39,10 +41,14 @@ def build_entity_context(
         else []
     )
     header.extend(attribute_cols)
-    current_context_text += column_delimiter.join(header) + "\n"
-    current_tokens = tokenizer.num_tokens(current_context_text)
+    table = ContextTable(
+        tokenizer=tokenizer,
+        header=header,
+        context_name=context_name,
+        column_delimiter=column_delimiter,
+        max_context_tokens=max_context_tokens,
+    )
 
-    all_context_records = [header]
     for entity in selected_entities:
         new_context = [
             entity.readable_id if entity.readable_id else "",
@@ -58,27 +64,18 @@ def build_entity_context(
                 else ""
             )
             new_context.append(field_value)
-        new_context_text = column_delimiter.join(new_context) + "\n"
-        new_tokens = tokenizer.num_tokens(new_context_text)
-        if current_tokens + new_tokens > max_context_tokens:
+        if not table.append(
+            new_context,
+            table.row_tokens(new_context, 2, entity.n_tokens, entity.n_tokens_encoding),
+        ):
             break
-        current_context_text += new_context_text
-        all_context_records.append(new_context)
-        current_tokens += new_tokens
 
-    if len(all_context_records) > 1:
-        record_df = pd.DataFrame(
-            all_context_records[1:], columns=cast("Any", all_context_records[0])
-        )
-    else:
-        record_df = pd.DataFrame()
-
-    return current_context_text, record_df
+    return table.to_text(), ContextRecords({context_name.lower(): table})
 
 
 def build_relationship_context(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
     tokenizer: Tokenizer,
     include_relationship_weight: bool = False,
     max_context_tokens: int = 8000,
@@ -86,9 +83,8 @@ def build_relationship_context(
     relationship_ranking_attribute: str = "rank",
     column_delimiter: str = "|",
     context_name: str = "Relationships",
-) -> tuple[str, pd.DataFrame]:
+) -> tuple[str, ContextRecords]:
     """Prepare relationship data tables as context data for system prompt."""
-    tokenizer = tokenizer
     selected_relationships = _filter_relationships(
         selected_entities=selected_entities,
         relationships=relationships,
@@ -97,67 +93,170 @@ def build_relationship_context(
     )
 
     if len(selected_entities) == 0 or len(selected_relationships) == 0:
-        return "", pd.DataFrame()
+        return "", ContextRecords({context_name.lower(): pd.DataFrame()})
 
-    # add headers
-    current_context_text = f"-----{context_name}-----" + "\n"
+    table = _relationship_table(
+        first_relationship=selected_relationships[0],
+        tokenizer=tokenizer,
+        include_relationship_weight=include_relationship_weight,
+        max_context_tokens=max_context_tokens,
+        column_delimiter=column_delimiter,
+        context_name=context_name,
+    )
+    for rel in selected_relationships:
+        row = _relationship_row(table, rel, include_relationship_weight)
+        if not table.append(
+            row, table.row_tokens(row, 3, rel.n_tokens, rel.n_tokens_encoding)
+        ):
+            break
+
+    return table.to_text(), ContextRecords({context_name.lower(): table})
+
+
+def build_incremental_relationship_table(
+    selected_entities: list[Entity],
+    relationships: RelationshipIndex,
+    tokenizer: Tokenizer,
+    include_relationship_weight: bool = False,
+    max_context_tokens: int = 8000,
+    top_k_relationships: int = 10,
+    column_delimiter: str = "|",
+    context_name: str = "Relationships",
+) -> ContextTable | None:
+    """Fill a relationship context table entity by entity, or return None if
+    nothing is selected.
+
+    The new relationships of each entity are appended to the table as a group:
+    first the ones with an entity added before it, then its `top_k_relationships`
+    relationships with entities out of the selection, by number of links to the
+    selected entities and rank. Relationships with a selected entity not added yet
+    wait for that entity. The first entity whose relationships do not fit in the
+    budget ends the table, so each row is rendered and tokenized only once.
+    """
+    selected_names = {entity.title for entity in selected_entities}
+    candidates = relationships.candidates(selected_names)
+    if len(selected_entities) == 0 or len(candidates) == 0:
+        return None
+
+    # The number of selected entities related to each out-of-network entity
+    out_network_partners: defaultdict[str, set[str]] = defaultdict(set)
+    for rel in candidates:
+        if rel.source not in selected_names:
+            out_network_partners[rel.source].add(rel.target)
+        if rel.target not in selected_names:
+            out_network_partners[rel.target].add(rel.source)
+    links = {name: len(partners) for name, partners in out_network_partners.items()}
+
+    table = _relationship_table(
+        first_relationship=candidates[0],
+        tokenizer=tokenizer,
+        include_relationship_weight=include_relationship_weight,
+        max_context_tokens=max_context_tokens,
+        column_delimiter=column_delimiter,
+        context_name=context_name,
+    )
+    added_names: set[str] = set()
+    added_ids: set[str] = set()
+    for entity in selected_entities:
+        added_names.add(entity.title)
+        in_network: list[Relationship] = []
+        out_network: list[tuple[int, Relationship]] = []
+        # The relationships of the entity, in rank order
+        entity_relationships = relationships.in_network(
+            {entity.title}
+        ) + relationships.out_network({entity.title})
+        for rel in entity_relationships:
+            other = rel.target if rel.source == entity.title else rel.source
+            if rel.id in added_ids:
+                continue
+            if other in added_names:
+                in_network.append(rel)
+            elif other not in selected_names:
+                out_network.append((links[other], rel))
+        # The sort is stable, relationships with as many links stay in rank order
+        out_network.sort(key=lambda item: item[0], reverse=True)
+        group = in_network + [rel for _, rel in out_network[:top_k_relationships]]
+        rows = [
+            _relationship_row(table, rel, include_relationship_weight) for rel in group
+        ]
+        if not table.append_group(
+            rows,
+            [
+                table.row_tokens(row, 3, rel.n_tokens, rel.n_tokens_encoding)
+                for row, rel in zip(rows, group, strict=True)
+            ],
+        ):
+            logger.warning("Reached token limit - reverting to previous context state")
+            break
+        added_ids.update(rel.id for rel in group)
+
+    return table
+
+
+def _relationship_table(
+    first_relationship: Relationship,
+    tokenizer: Tokenizer,
+    include_relationship_weight: bool,
+    max_context_tokens: int,
+    column_delimiter: str,
+    context_name: str,
+) -> ContextTable:
+    """Create a relationship table with the attribute columns of the first row."""
     header = ["id", "source", "target", "description"]
     if include_relationship_weight:
         header.append("weight")
     attribute_cols = (
-        list(selected_relationships[0].attributes.keys())
-        if selected_relationships[0].attributes
+        list(first_relationship.attributes.keys())
+        if first_relationship.attributes
         else []
     )
-    attribute_cols = [col for col in attribute_cols if col not in header]
-    header.extend(attribute_cols)
-
-    current_context_text += column_delimiter.join(header) + "\n"
-    current_tokens = tokenizer.num_tokens(current_context_text)
+    header.extend(col for col in attribute_cols if col not in header)
+    return ContextTable(
+        tokenizer=tokenizer,
+        header=header,
+        context_name=context_name,
+        column_delimiter=column_delimiter,
+        max_context_tokens=max_context_tokens,
+    )
 
-    all_context_records = [header]
-    for rel in selected_relationships:
-        new_context = [
-            rel.readable_id if rel.readable_id else "",
-            rel.source,
-            rel.target,
-            rel.description if rel.description else "",
-        ]
-        if include_relationship_weight:
-            new_context.append(str(rel.weight if rel.weight else ""))
-        for field in attribute_cols:
-            field_value = (
-                str(rel.attributes.get(field))
-                if rel.attributes and rel.attributes.get(field)
-                else ""
-            )
-            new_context.append(field_value)
-        new_context_text = column_delimiter.join(new_context) + "\n"
-        new_tokens = tokenizer.num_tokens(new_context_text)
-        if current_tokens + new_tokens > max_context_tokens:
-            break
-        current_context_text += new_context_text
-        all_context_records.append(new_context)
-        current_tokens += new_tokens
 
-    if len(all_context_records) > 1:
-        record_df = pd.DataFrame(
-            all_context_records[1:], columns=cast("Any", all_context_records[0])
+def _relationship_row(
+    table: ContextTable, rel: Relationship, include_relationship_weight: bool
+) -> list[str]:
+    new_context = [
+        rel.readable_id if rel.readable_id else "",
+        rel.source,
+        rel.target,
+        rel.description if rel.description else "",
+    ]
+    if include_relationship_weight:
+        new_context.append(str(rel.weight if rel.weight else ""))
+    attribute_cols = table.header[len(new_context) :]
+    for field in attribute_cols:
+        field_value = (
+            str(rel.attributes.get(field))
+            if rel.attributes and rel.attributes.get(field)
+            else ""
         )
-    else:
-        record_df = pd.DataFrame()
-
-    return current_context_text, record_df
+        new_context.append(field_value)
+    return new_context
 
 
 def _filter_relationships(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
     top_k_relationships: int = 10,
     relationship_ranking_attribute: str = "rank",
 ) -> list[Relationship]:
     """Filter and sort relationships based on a set of selected
     entities and a ranking attribute."""
+    if isinstance(relationships, RelationshipIndex):
+        if relationships.ranking_attribute != relationship_ranking_attribute:
+            relationships = RelationshipIndex(
+                relationships.relationships, relationship_ranking_attribute
+            )
+    else:
+        relationships = RelationshipIndex(relationships, relationship_ranking_attribute)
     # First priority: in-network relationships
     #  (i.e. relationships between selected entities)
     in_network_relationships = get_in_network_relationships(
@@ -180,63 +279,52 @@ def _filter_relationships(
     # within out-of-network relationships, prioritize mutual relationships
     # (i.e. relationships with out-network entities that are
     # shared with multiple selected entities)
-    selected_entity_names = [entity.title for entity in selected_entities]
-    out_network_source_names = [
-        relationship.source
-        for relationship in out_network_relationships
-        if relationship.source not in selected_entity_names
-    ]
-    out_network_target_names = [
-        relationship.target
-        for relationship in out_network_relationships
-        if relationship.target not in selected_entity_names
-    ]
-    out_network_entity_names = list(
-        set(out_network_source_names + out_network_target_names)
-    )
+    selected_entity_names = {entity.title for entity in selected_entities}
+    out_network_partners: defaultdict[str, set[str]] = defaultdict(set)
+    for relationship in out_network_relationships:
+        out_network_partners[relationship.source].add(relationship.target)
+        out_network_partners[relationship.target].add(relationship.source)
     out_network_entity_links: defaultdict[str, int] = defaultdict(int)
-    for entity_name in out_network_entity_names:
-        targets = [
-            relationship.target
-            for relationship in out_network_relationships
-            if relationship.source == entity_name
-        ]
-        sources = [
-            relationship.source
-            for relationship in out_network_relationships
-            if relationship.target == entity_name
-        ]
-        out_network_entity_links[entity_name] = len(set(targets + sources))
+    for entity_name, partners in out_network_partners.items():
+        if entity_name not in selected_entity_names:
+            out_network_entity_links[entity_name] = len(partners)
 
     # sort out-network relationships by number of links and rank_attributes
-    for rel in out_network_relationships:
-        if rel.attributes is None:
-            rel.attributes = {}
-        rel.attributes["links"] = (
+    links = {
+        rel.id: (
             out_network_entity_links[rel.source]
             if rel.source in out_network_entity_links
             else out_network_entity_links[rel.target]
         )
+        for rel in out_network_relationships
+    }
 
-    # sort by attributes[links] first, then by ranking_attribute
+    # sort by links first, then by ranking_attribute
     if relationship_ranking_attribute == "rank":
         out_network_relationships.sort(
-            key=lambda x: (x.attributes["links"], x.rank),  # type: ignore
+            key=lambda x: (links[x.id], x.rank),
             reverse=True,
         )
     elif relationship_ranking_attribute == "weight":
         out_network_relationships.sort(
-            key=lambda x: (x.attributes["links"], x.weight),  # type: ignore
+            key=lambda x: (links[x.id], x.weight),
             reverse=True,
         )
     else:
         out_network_relationships.sort(
             key=lambda x: (
-                x.attributes["links"],  # type: ignore
+                links[x.id],
                 x.attributes[relationship_ranking_attribute],  # type: ignore
             ),
             reverse=True,
         )
 
+    # The relationships may be shared by queries (RelationshipCache, snapshots),
+    # set the links on copies
     relationship_budget = top_k_relationships * len(selected_entities)
-    return in_network_relationships + out_network_relationships[:relationship_budget]
+    return in_network_relationships + [
+        rel.model_copy(
+            update={"attributes": {**(rel.attributes or {}), "links": links[rel.id]}}
+        )
+        for rel in out_network_relationships[:relationship_budget]
+    ]
@@ -4,17 +4,27 @@
 """Context Build utility methods."""
 
 import random
-from typing import Any, cast
 
-import pandas as pd
-
-from review_summary.models import Relationship, TextUnit
+from review_summary.models import Entity, TextUnit
+from review_summary.query.context_builder.builders import ContextRecords
+from review_summary.query.context_builder.context_table import ContextTable
+from review_summary.query.input.retrieval.relationships import RelationshipIndex
 from review_summary.tokenizer.tokenizer import Tokenizer
 
 """
 Contain util functions to build text unit context for the search's system prompt
 """
 
+# Text unit payload keys rendered or ranked by the text unit context
+TEXT_UNIT_CONTEXT_FIELDS = [
+    "readable_id",
+    "text",
+    "n_tokens",
+    "n_tokens_encoding",
+    "attributes",
+    "relationship_ids",
+]
+
 
 def build_text_unit_context(
     tokenizer: Tokenizer,
@@ -24,18 +34,15 @@ def build_text_unit_context(
     max_context_tokens: int = 8000,
     context_name: str = "Sources",
     random_state: int = 86,
-) -> tuple[str, dict[str, pd.DataFrame]]:
+) -> tuple[str, ContextRecords]:
     """Prepare text-unit data table as context data for system prompt."""
     if not text_units:
-        return ("", {})
+        return ("", ContextRecords())
 
     if shuffle_data:
         random.seed(random_state)
         random.shuffle(text_units)
 
-    # add context header
-    current_context_text = f"-----{context_name}-----" + "\n"
-
     # add header
     header = ["id", "text"]
     attribute_cols = (
@@ -43,11 +50,16 @@ def build_text_unit_context(
     )
     attribute_cols = [col for col in attribute_cols if col not in header]
     header.extend(attribute_cols)
+    table = ContextTable(
+        tokenizer=tokenizer,
+        header=header,
+        context_name=context_name,
+        column_delimiter=column_delimiter,
+        max_context_tokens=max_context_tokens,
+    )
 
-    current_context_text += column_delimiter.join(header) + "\n"
-    current_tokens = tokenizer.num_tokens(current_context_text)
-    all_context_records = [header]
-
+    rows: list[list[str]] = []
+    n_tokens: list[int | None] = []
     for unit in text_units:
         new_context = [
             str(unit.readable_id),
@@ -57,43 +69,30 @@ def build_text_unit_context(
                 for field in attribute_cols
             ],
         ]
-        new_context_text = column_delimiter.join(new_context) + "\n"
-        new_tokens = tokenizer.num_tokens(new_context_text)
-
-        if current_tokens + new_tokens > max_context_tokens:
-            break
-
-        current_context_text += new_context_text
-        all_context_records.append(new_context)
-        current_tokens += new_tokens
-
-    if len(all_context_records) > 1:
-        record_df = pd.DataFrame(
-            all_context_records[1:], columns=cast("Any", all_context_records[0])
+        rows.append(new_context)
+        n_tokens.append(
+            table.row_tokens(new_context, 1, unit.n_tokens, unit.n_tokens_encoding)
         )
-    else:
-        record_df = pd.DataFrame()
-    return current_context_text, {context_name.lower(): record_df}
+    table.extend(rows, n_tokens)
+
+    return table.to_text(), ContextRecords({context_name.lower(): table})
 
 
 def count_relationships(
-    entity_relationships: list[Relationship], text_unit: TextUnit
+    relationship_index: RelationshipIndex, entity: Entity, text_unit: TextUnit
 ) -> int:
     """Count the number of relationships of the selected entity
     that are associated with the text unit."""
     if not text_unit.relationship_ids:
-        # Use list comprehension to count relationships
-        # where the text_unit.id is in rel.text_unit_ids
+        # Count relationships where the text_unit.id is in rel.text_unit_ids
         return sum(
             1
-            for rel in entity_relationships
+            for rel in relationship_index.relationships_of(entity.title)
             if rel.text_unit_ids and text_unit.id in rel.text_unit_ids
         )
 
-    # Use a set for faster lookups if entity_relationships is large
-    entity_relationship_ids = {rel.id for rel in entity_relationships}
-
-    # Count matching relationship ids efficiently
+    # Count matching relationship ids against the cached ID set of the entity
+    entity_relationship_ids = relationship_index.relationship_ids_of(entity.title)
     return sum(
         1 for rel_id in text_unit.relationship_ids if rel_id in entity_relationship_ids
     )
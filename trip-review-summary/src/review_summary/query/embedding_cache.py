@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import cast
+
+import numpy as np
+import numpy.typing as npt
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query into the cache key shared by trivially different spellings.
+
+    Only the key is normalized, the model embeds the query as it was written.
+    """
+    return _WHITESPACE.sub(" ", query).strip().casefold()
+
+
+class CachedQueryEmbedder:
+    """Embed search queries through an LRU+TTL cache and a micro-batcher.
+
+    Cache hits are served from memory as float32 vectors. Concurrent misses that
+    arrive within `batch_window` seconds are coalesced into one `aembed_documents`
+    call, and concurrent requests for the same query share one in-flight result.
+    """
+
+    def __init__(
+        self,
+        embedding_model: Embeddings,
+        max_size: int = 1024,
+        ttl: float = 3600.0,
+        batch_window: float = 0.005,
+        max_batch_size: int = 64,
+    ):
+        self.embedding_model = embedding_model
+        self.max_size = max_size
+        self.ttl = ttl
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+
+        self._cache: OrderedDict[str, tuple[float, npt.NDArray[np.float32]]] = (
+            OrderedDict()
+        )
+        self._pending: dict[str, asyncio.Future[npt.NDArray[np.float32]]] = {}
+        # (cache key, query text) of the first request of each pending key
+        self._batch: list[tuple[str, str]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def aembed_query(self, query: str) -> list[float]:
+        """Return the embedding of the query, cached under its normalized form."""
+        key = normalize_query(query)
+        cached = self._get(key)
+        if cached is not None:
+            return cast("list[float]", cached.tolist())
+
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            self._batch.append((key, query))
+            if len(self._batch) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        # Shield the shared future, a cancelled caller must not cancel the others
+        vector = await asyncio.shield(future)
+        return cast("list[float]", vector.tolist())
+
+    def clear(self) -> None:
+        """Drop all cached embeddings."""
+        self._cache.clear()
+
+    def _get(self, key: str) -> npt.NDArray[np.float32] | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, vector = entry
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return vector
+
+    def _put(self, key: str, vector: npt.NDArray[np.float32]) -> None:
+        self._cache[key] = (time.monotonic() + self.ttl, vector)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._batch = self._batch, []
+        if len(batch) == 0:
+            return
+        task = asyncio.create_task(self._embed_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _embed_batch(self, batch: list[tuple[str, str]]) -> None:
+        logger.debug(f"Embedding a batch of {len(batch)} queries.")
+        try:
+            vectors = await self.embedding_model.aembed_documents(
+                [query for _, query in batch]
+            )
+        except Exception as e:
+            for key, _ in batch:
+                future = self._pending.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (key, _), vector in zip(batch, vectors, strict=True):
+            array = np.asarray(vector, dtype=np.float32)
+            self._put(key, array)
+            future = self._pending.pop(key)
+            if not future.done():
+                future.set_result(array)
@@ -1,33 +1,86 @@
+import logging
+from collections import OrderedDict
+from typing import Protocol
+
 from neo4j import AsyncDriver
 
 from review_summary.models import Entity, Relationship
 
+logger = logging.getLogger(__name__)
+
+# Each branch seeks the Entity.id uniqueness constraint from one endpoint, instead
+# of an OR over both endpoints that scans the whole Entity label.
+RELATIONSHIPS_QUERY = """
+UNWIND $entity_ids AS entity_id
+MATCH (a:Entity {id: entity_id})-[r:RELATES]->(b:Entity)
+WHERE $target_id IS NULL OR r.target_id = $target_id
+RETURN
+    a.id AS source_id,
+    b.id AS target_id,
+    r.id AS id,
+    r.readable_id AS readable_id,
+    a.title AS source,
+    b.title AS target,
+    r.weight AS weight,
+    r.description AS description,
+    r.n_tokens AS n_tokens,
+    r.n_tokens_encoding AS n_tokens_encoding,
+    r.target_id AS relationship_target_id,
+    r.target_type AS relationship_target_type
+UNION
+UNWIND $entity_ids AS entity_id
+MATCH (a:Entity)-[r:RELATES]->(b:Entity {id: entity_id})
+WHERE $target_id IS NULL OR r.target_id = $target_id
+RETURN
+    a.id AS source_id,
+    b.id AS target_id,
+    r.id AS id,
+    r.readable_id AS readable_id,
+    a.title AS source,
+    b.title AS target,
+    r.weight AS weight,
+    r.description AS description,
+    r.n_tokens AS n_tokens,
+    r.n_tokens_encoding AS n_tokens_encoding,
+    r.target_id AS relationship_target_id,
+    r.target_type AS relationship_target_type
+"""
+
+EndpointRelationship = tuple[str, str, Relationship]
+
+
+class RelationshipStore(Protocol):
+    """A source of the relationships of entities, in place of Neo4j."""
+
+    async def fetch(self, entities: list[Entity], target_id: str) -> list[Relationship]:
+        """Return the relationships with a given entity at either end, as
+        `fetch_relationships_for_entities` does."""
+        ...
+
 
 async def fetch_relationships_for_entities(
-    driver: AsyncDriver, entities: list[Entity]
+    driver: AsyncDriver, entities: list[Entity], target_id: str | None = None
 ) -> list[Relationship]:
-    if not entities:
-        return []
+    """Fetch the relationships with a given entity at either end, optionally
+    restricted to the graph of `target_id`."""
+    records = await _fetch_endpoint_relationships(
+        driver, [e.id for e in entities], target_id
+    )
+    return [relationship for _, _, relationship in records]
 
-    entity_ids = [e.id for e in entities]
-
-    query = """
-    MATCH (a:Entity)-[r]->(b:Entity)
-    WHERE a.id IN $entity_ids OR b.id IN $entity_ids
-    RETURN 
-        r.id AS id,
-        r.readable_id AS readable_id,
-        a.title AS source,
-        b.title AS target,
-        r.weight AS weight,
-        r.description AS description,
-        r.target_id AS target_id,
-        r.target_type AS target_type
-    """
+
+async def _fetch_endpoint_relationships(
+    driver: AsyncDriver, entity_ids: list[str], target_id: str | None
+) -> list[EndpointRelationship]:
+    """Fetch relationships along with the IDs of their source and target entity."""
+    if not entity_ids:
+        return []
 
     async with driver.session() as session:  # pyright: ignore
-        result = await session.run(query, entity_ids=entity_ids)
-        relationships_data: list[Relationship] = []
+        result = await session.run(
+            RELATIONSHIPS_QUERY, entity_ids=entity_ids, target_id=target_id
+        )
+        relationships_data: list[EndpointRelationship] = []
 
         async for record in result:
             rel_dict = {
@@ -37,11 +90,89 @@ async def fetch_relationships_for_entities(
                 "target": record["target"],
                 "weight": record["weight"],
                 "description": record["description"],
+                "n_tokens": record["n_tokens"],
+                "n_tokens_encoding": record["n_tokens_encoding"],
                 "attributes": {
-                    "target_id": record["target_id"],
-                    "target_type": record["target_type"],
-                }
-                or None,
+                    "target_id": record["relationship_target_id"],
+                    "target_type": record["relationship_target_type"],
+                },
             }
-            relationships_data.append(Relationship.model_validate(rel_dict))
+            relationships_data.append(
+                (
+                    record["source_id"],
+                    record["target_id"],
+                    Relationship.from_store(rel_dict),
+                )
+            )
         return relationships_data
+
+
+class RelationshipCache:
+    """Cache the relationships of entities per target and index version.
+
+    Relationships are cached by entity ID under (target_id, index_version), read
+    from the `index_version` attribute of the entities; only entities not seen yet
+    are fetched from Neo4j. Storing a new index version of a target drops the old
+    one, and beyond `max_targets` the least recently used target is evicted.
+    Entities are always fetched when one has no index version or when they come
+    from several versions, e.g. while the target is being re-indexed.
+    """
+
+    def __init__(self, driver: AsyncDriver, max_targets: int = 256):
+        self.driver = driver
+        self.max_targets = max_targets
+        self._entries: OrderedDict[
+            tuple[str, int | None], dict[str, list[Relationship]]
+        ] = OrderedDict()
+
+    async def fetch(self, entities: list[Entity], target_id: str) -> list[Relationship]:
+        """Return the relationships with a given entity at either end."""
+        index_version = _index_version(entities)
+        if index_version is None:
+            return await fetch_relationships_for_entities(
+                self.driver, entities, target_id
+            )
+
+        key = (target_id, index_version)
+        for stale_key in [k for k in self._entries if k[0] == target_id and k != key]:
+            logger.debug(f"Drop cached relationships of stale index {stale_key}.")
+            del self._entries[stale_key]
+        entry = self._entries.setdefault(key, {})
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_targets:
+            self._entries.popitem(last=False)
+
+        missing = {entity.id for entity in entities if entity.id not in entry}
+        if missing:
+            records = await _fetch_endpoint_relationships(
+                self.driver, list(missing), target_id
+            )
+            fetched: dict[str, list[Relationship]] = {id_: [] for id_ in missing}
+            for source_id, target_entity_id, relationship in records:
+                for endpoint in dict.fromkeys((source_id, target_entity_id)):
+                    if endpoint in fetched:
+                        fetched[endpoint].append(relationship)
+            entry.update(fetched)
+
+        relationships: dict[str, Relationship] = {}
+        for entity in entities:
+            for relationship in entry.get(entity.id, []):
+                relationships.setdefault(relationship.id, relationship)
+        return list(relationships.values())
+
+    def invalidate(self, target_id: str) -> None:
+        """Drop the cached relationships of a target."""
+        for key in [key for key in self._entries if key[0] == target_id]:
+            del self._entries[key]
+
+
+def _index_version(entities: list[Entity]) -> int | None:
+    """The index version shared by all entities, None if any differs or is missing."""
+    versions = {
+        entity.attributes.get("index_version") if entity.attributes else None
+        for entity in entities
+    }
+    if len(versions) != 1:
+        return None
+    version = versions.pop()
+    return int(version) if version is not None else None
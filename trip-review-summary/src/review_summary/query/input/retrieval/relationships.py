@@ -3,106 +3,198 @@
 
 """Util functions to retrieve relationships from a collection."""
 
-from typing import Any, cast
+from collections.abc import Callable
+from typing import Any, TypeVar, cast
 
 import pandas as pd
 
 from review_summary.models import Entity, Relationship
 
+T = TypeVar("T")
+
+
+class RelationshipIndex:
+    """Relationships indexed by entity name, built once per query.
+
+    Keeps the relationships in their original order and in a stable rank order,
+    together with adjacency lists of source and target names, so that selecting
+    the relationships of a few entities no longer scans every relationship.
+    """
+
+    def __init__(
+        self, relationships: list[Relationship], ranking_attribute: str = "rank"
+    ):
+        self.relationships = relationships
+        self.ranking_attribute = ranking_attribute
+
+        # Relationships sharing a rank value share a rank group, ordered by rank
+        self._rank_group = [0] * len(relationships)
+        rank_key = (
+            _rank_key(relationships[0], ranking_attribute) if relationships else None
+        )
+        if rank_key is not None:
+            ranked = sort_relationships_by_rank(
+                list(range(len(relationships))),
+                ranking_attribute,
+                key=lambda position: relationships[position],
+            )
+            group = 0
+            for order, position in enumerate(ranked):
+                if order > 0 and rank_key(relationships[position]) != rank_key(
+                    relationships[ranked[order - 1]]
+                ):
+                    group += 1
+                self._rank_group[position] = group
+
+        self._by_source: dict[str, list[int]] = {}
+        self._by_target: dict[str, list[int]] = {}
+        for position, relationship in enumerate(relationships):
+            self._by_source.setdefault(relationship.source, []).append(position)
+            self._by_target.setdefault(relationship.target, []).append(position)
+        self._relationship_ids: dict[str, set[str]] = {}
+
+    def relationships_of(self, entity_name: str) -> list[Relationship]:
+        """Return the relationships with the entity at either end, in order."""
+        positions = set(self._by_source.get(entity_name, []))
+        positions.update(self._by_target.get(entity_name, []))
+        return [self.relationships[position] for position in sorted(positions)]
+
+    def relationship_ids_of(self, entity_name: str) -> set[str]:
+        """Return the IDs of the relationships of the entity."""
+        if entity_name not in self._relationship_ids:
+            self._relationship_ids[entity_name] = {
+                relationship.id for relationship in self.relationships_of(entity_name)
+            }
+        return self._relationship_ids[entity_name]
+
+    def in_network(self, entity_names: set[str]) -> list[Relationship]:
+        """Return the relationships between the entities, in rank order."""
+        positions = [
+            position
+            for name in entity_names
+            for position in self._by_source.get(name, [])
+            if self.relationships[position].target in entity_names
+        ]
+        positions.sort(key=lambda position: (self._rank_group[position], position))
+        return [self.relationships[position] for position in positions]
+
+    def out_network(self, entity_names: set[str]) -> list[Relationship]:
+        """Return the relationships from the entities to other entities, in rank
+        order, relationships with a selected source first on equal ranks."""
+        keyed = [
+            (self._rank_group[position], 0, position)
+            for name in entity_names
+            for position in self._by_source.get(name, [])
+            if self.relationships[position].target not in entity_names
+        ] + [
+            (self._rank_group[position], 1, position)
+            for name in entity_names
+            for position in self._by_target.get(name, [])
+            if self.relationships[position].source not in entity_names
+        ]
+        keyed.sort()
+        return [self.relationships[position] for _, _, position in keyed]
+
+    def candidates(self, entity_names: set[str]) -> list[Relationship]:
+        """Return the relationships with any of the entities, in original order."""
+        positions: set[int] = set()
+        for name in entity_names:
+            positions.update(self._by_source.get(name, []))
+            positions.update(self._by_target.get(name, []))
+        return [self.relationships[position] for position in sorted(positions)]
+
 
 def get_in_network_relationships(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
     ranking_attribute: str = "rank",
 ) -> list[Relationship]:
     """Get all directed relationships between selected
     entities, sorted by ranking_attribute."""
-    selected_entity_names = [entity.title for entity in selected_entities]
-    selected_relationships = [
-        relationship
-        for relationship in relationships
-        if relationship.source in selected_entity_names
-        and relationship.target in selected_entity_names
-    ]
-    if len(selected_relationships) <= 1:
-        return selected_relationships
-
-    # sort by ranking attribute
-    return sort_relationships_by_rank(selected_relationships, ranking_attribute)
+    index = _as_index(relationships, ranking_attribute)
+    return index.in_network({entity.title for entity in selected_entities})
 
 
 def get_out_network_relationships(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
     ranking_attribute: str = "rank",
 ) -> list[Relationship]:
     """Get relationships from selected entities to other entities
     that are not within the selected entities, sorted by ranking_attribute."""
-    selected_entity_names = [entity.title for entity in selected_entities]
-    source_relationships = [
-        relationship
-        for relationship in relationships
-        if relationship.source in selected_entity_names
-        and relationship.target not in selected_entity_names
-    ]
-    target_relationships = [
-        relationship
-        for relationship in relationships
-        if relationship.target in selected_entity_names
-        and relationship.source not in selected_entity_names
-    ]
-    selected_relationships = source_relationships + target_relationships
-    return sort_relationships_by_rank(selected_relationships, ranking_attribute)
+    index = _as_index(relationships, ranking_attribute)
+    return index.out_network({entity.title for entity in selected_entities})
 
 
 def get_candidate_relationships(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
 ) -> list[Relationship]:
     """Get all relationships that are associated with the selected entities."""
-    selected_entity_names = [entity.title for entity in selected_entities]
-    return [
-        relationship
-        for relationship in relationships
-        if relationship.source in selected_entity_names
-        or relationship.target in selected_entity_names
-    ]
+    index = _as_index(relationships)
+    return index.candidates({entity.title for entity in selected_entities})
 
 
 def get_entities_from_relationships(
     relationships: list[Relationship], entities: list[Entity]
 ) -> list[Entity]:
     """Get all entities that are associated with the selected relationships."""
-    selected_entity_names = [relationship.source for relationship in relationships] + [
+    selected_entity_names = {relationship.source for relationship in relationships} | {
         relationship.target for relationship in relationships
-    ]
+    }
     return [entity for entity in entities if entity.title in selected_entity_names]
 
 
 def sort_relationships_by_rank(
-    relationships: list[Relationship],
+    relationships: list[T],
     ranking_attribute: str = "rank",
-) -> list[Relationship]:
-    """Sort relationships by a ranking_attribute."""
+    key: Callable[[T], Relationship] | None = None,
+) -> list[T]:
+    """Sort relationships (or items keyed by relationship) by a ranking_attribute."""
     if len(relationships) == 0:
         return relationships
 
-    # sort by ranking attribute
-    attribute_names = (
-        list(relationships[0].attributes.keys()) if relationships[0].attributes else []
-    )
-    if ranking_attribute in attribute_names:
-        relationships.sort(
-            key=lambda x: int(x.attributes[ranking_attribute]) if x.attributes else 0,
-            reverse=True,
-        )
-    elif ranking_attribute == "rank":
-        relationships.sort(key=lambda x: x.rank if x.rank else 0.0, reverse=True)
-    elif ranking_attribute == "weight":
-        relationships.sort(key=lambda x: x.weight if x.weight else 0.0, reverse=True)
+    get: Callable[[T], Relationship] = key or _as_relationship
+    rank_key = _rank_key(get(relationships[0]), ranking_attribute)
+    if rank_key is not None:
+        relationships.sort(key=lambda x: rank_key(get(x)), reverse=True)
     return relationships
 
 
+def _as_relationship(item: Any) -> Relationship:
+    return cast("Relationship", item)
+
+
+def _rank_key(
+    first: Relationship, ranking_attribute: str
+) -> Callable[[Relationship], float] | None:
+    """Return the sort key for a ranking_attribute, None if it cannot be ranked.
+
+    Like the ranking attribute itself, the choice between a custom attribute and
+    the rank or weight fields is decided by the first relationship.
+    """
+    if first.attributes and ranking_attribute in first.attributes:
+        return lambda x: (
+            int(x.attributes[ranking_attribute])
+            if x.attributes and ranking_attribute in x.attributes
+            else 0
+        )
+    if ranking_attribute == "rank":
+        return lambda x: x.rank if x.rank else 0.0
+    if ranking_attribute == "weight":
+        return lambda x: x.weight if x.weight else 0.0
+    return None
+
+
+def _as_index(
+    relationships: list[Relationship] | RelationshipIndex,
+    ranking_attribute: str = "rank",
+) -> RelationshipIndex:
+    if isinstance(relationships, RelationshipIndex):
+        return relationships
+    return RelationshipIndex(relationships, ranking_attribute)
+
+
 def to_relationship_dataframe(
     relationships: list[Relationship], include_relationship_weight: bool = True
 ) -> pd.DataFrame:
@@ -1,12 +1,18 @@
+import asyncio
 import logging
+from collections.abc import Awaitable
 from copy import deepcopy
+from typing import TypeVar
 
 import pandas as pd
 from langchain_openai import OpenAIEmbeddings
 from neo4j import AsyncDriver
 
 from review_summary.models import CommunityReport, Entity, Relationship, TextUnit
-from review_summary.query.context_builder.builders import ContextBuilderResult
+from review_summary.query.context_builder.builders import (
+    ContextBuilderResult,
+    ContextRecords,
+)
 from review_summary.query.context_builder.community_context import (
     build_community_context,
 )
@@ -15,25 +21,39 @@ from review_summary.query.context_builder.conversation_history import (
 )
 from review_summary.query.context_builder.local_context import (
     build_entity_context,
-    build_relationship_context,
+    build_incremental_relationship_table,
 )
 from review_summary.query.context_builder.source_context import (
+    TEXT_UNIT_CONTEXT_FIELDS,
     build_text_unit_context,
     count_relationships,
 )
+from review_summary.query.embedding_cache import CachedQueryEmbedder
 from review_summary.query.fetch_data.fetch_relationship import (
+    RelationshipStore,
     fetch_relationships_for_entities,
 )
+from review_summary.query.input.retrieval.relationships import RelationshipIndex
+from review_summary.query.target_snapshot import TargetSnapshotCache
+from review_summary.query.telemetry import record_stage
 from review_summary.tokenizer.tokenizer import Tokenizer
-from review_summary.vector_stores.entity import EntityVectorStore
+from review_summary.vector_stores.entity import EntityFusion, EntityVectorStore
 from review_summary.vector_stores.text_unit import TextUnitVectorStore
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class LocalSearchMixedContext:
     """Build data context for local search prompt combining community
-    reports and entity/relationship/covariate tables."""
+    reports and entity/relationship/covariate tables.
+
+    Entities are matched by their description embedding, or by both description
+    and title embeddings fused by Qdrant in one request when `entity_fusion` is set.
+    Relationships are fetched from Neo4j, or from `relationship_cache` when set
+    (a `RelationshipCache`, or any other `RelationshipStore`).
+    """
 
     def __init__(
         self,
@@ -43,6 +63,11 @@ class LocalSearchMixedContext:
         tokenizer: Tokenizer,
         neo4j_driver: AsyncDriver,
         community_reports: list[CommunityReport] | None = None,
+        query_embedder: CachedQueryEmbedder | None = None,
+        snapshot_cache: TargetSnapshotCache | None = None,
+        relationship_cache: RelationshipStore | None = None,
+        entity_fusion: EntityFusion | None = None,
+        entity_title_weight: float = 0.5,
     ):
         if community_reports is None:
             community_reports = []
@@ -51,9 +76,14 @@ class LocalSearchMixedContext:
         }
         self.entity_vector_store = entity_vector_store
         self.embedding_model = embedding_model
+        self.query_embedder = query_embedder or CachedQueryEmbedder(embedding_model)
         self.tokenizer = tokenizer
         self.neo4j_driver = neo4j_driver
         self.text_unit_vector_store = text_unit_vector_store
+        self.snapshot_cache = snapshot_cache
+        self.relationship_cache = relationship_cache
+        self.entity_fusion: EntityFusion | None = entity_fusion
+        self.entity_title_weight = entity_title_weight
 
     async def build_context(
         self,
@@ -78,11 +108,20 @@ class LocalSearchMixedContext:
         community_context_name: str = "Reports",
         column_delimiter: str = "|",
         target_id: str = "",
+        relationship_timeout: float | None = 5.0,
+        text_unit_timeout: float | None = 5.0,
     ) -> ContextBuilderResult:
         """Build data context for local search prompt.
 
         Build a context by combining community reports, entity/relationship/covariate
         tables, and text units using a predefined ratio set by summary_prop.
+
+        Hot targets are served from an in-memory snapshot when a snapshot cache is
+        set. Otherwise relationships (Neo4j) and text units (Qdrant) only depend on
+        the selected entities, so both are fetched concurrently. A fetch exceeding
+        its timeout is dropped from the context instead of delaying the answer.
+
+        Each stage is traced, and its duration is returned in the result timings.
         """
         if include_entity_names is None:
             include_entity_names = []
@@ -103,95 +142,205 @@ class LocalSearchMixedContext:
             )
             query = f"{query}\n{pre_user_questions}"
 
-        query_embedding = await self.embedding_model.aembed_query(query)
-        selected_entities = await self.entity_vector_store.search_by_vector(
-            embedding_vector=query_embedding,
-            target_id=target_id,
-            top_k=top_k_mapped_entities,
-        )
-        # get relationships
-        relationships: list[Relationship] = []
-        relationships = await fetch_relationships_for_entities(
-            driver=self.neo4j_driver, entities=selected_entities
+        timings: dict[str, float] = {}
+        with record_stage("query_embedding", timings):
+            query_embedding = await self.query_embedder.aembed_query(query)
+        snapshot = None
+        if self.snapshot_cache is not None:
+            with record_stage("snapshot", timings):
+                snapshot = await self.snapshot_cache.get(target_id)
+        if snapshot is not None:
+            # The snapshot only holds description embeddings
+            with record_stage("entity_search", timings, source="snapshot"):
+                selected_entities = (
+                    snapshot.search_entities(
+                        query_embedding, top_k=top_k_mapped_entities
+                    )
+                    if self.entity_fusion is None
+                    else await self._search_entities(
+                        query_embedding, target_id, top_k_mapped_entities
+                    )
+                )
+            with record_stage("relationships", timings, source="snapshot"):
+                relationships = snapshot.relationships_for_entities(selected_entities)
+            with record_stage("text_units", timings, source="snapshot"):
+                text_units = snapshot.text_units_by_ids(
+                    [
+                        text_unit_id
+                        for entity in selected_entities
+                        for text_unit_id in entity.text_unit_ids or []
+                    ]
+                )
+        else:
+            (
+                selected_entities,
+                relationships,
+                text_units,
+            ) = await self._retrieve_remote(
+                query_embedding=query_embedding,
+                target_id=target_id,
+                top_k_mapped_entities=top_k_mapped_entities,
+                fetch_text_units=text_unit_prop > 0,
+                relationship_timeout=relationship_timeout,
+                text_unit_timeout=text_unit_timeout,
+                timings=timings,
+            )
+
+        # index relationships once, shared by all context builders below
+        relationship_index = RelationshipIndex(
+            relationships, relationship_ranking_attribute
         )
-        # get text_units
-        text_units: list[TextUnit] = []
-        text_units = await self.text_unit_vector_store.find_by_target(target_id)
 
         # build context
         final_context = list[str]()
-        final_context_data = dict[str, pd.DataFrame]()
+        final_context_data = ContextRecords()
 
         if conversation_history:
             # build conversation history context
-            (
-                conversation_history_context,
-                conversation_history_context_data,
-            ) = conversation_history.build_context(
-                tokenizer=self.tokenizer,
-                include_user_turns_only=conversation_history_user_turns_only,
-                max_qa_turns=conversation_history_max_turns,
-                column_delimiter=column_delimiter,
-                max_context_tokens=max_context_tokens,
-                recency_bias=False,
-            )
+            with record_stage("context.conversation_history", timings):
+                (
+                    conversation_history_context,
+                    conversation_history_context_data,
+                ) = conversation_history.build_context(
+                    tokenizer=self.tokenizer,
+                    include_user_turns_only=conversation_history_user_turns_only,
+                    max_qa_turns=conversation_history_max_turns,
+                    column_delimiter=column_delimiter,
+                    max_context_tokens=max_context_tokens,
+                    recency_bias=False,
+                )
             if conversation_history_context.strip() != "":
                 final_context.append(conversation_history_context)
-                final_context_data = conversation_history_context_data
+                final_context_data.update(conversation_history_context_data)
                 max_context_tokens = max_context_tokens - len(
                     self.tokenizer.encode(conversation_history_context)
                 )
 
         # build community context
         community_tokens = max(int(max_context_tokens * community_prop), 0)
-        community_context, community_context_data = self._build_community_context(
-            selected_entities=selected_entities,
-            max_context_tokens=community_tokens,
-            use_community_summary=use_community_summary,
-            column_delimiter=column_delimiter,
-            include_community_rank=include_community_rank,
-            min_community_rank=min_community_rank,
-            context_name=community_context_name,
-        )
+        with record_stage("context.community", timings):
+            community_context, community_context_data = self._build_community_context(
+                selected_entities=selected_entities,
+                max_context_tokens=community_tokens,
+                use_community_summary=use_community_summary,
+                column_delimiter=column_delimiter,
+                include_community_rank=include_community_rank,
+                min_community_rank=min_community_rank,
+                context_name=community_context_name,
+            )
         if community_context.strip() != "":
             final_context.append(community_context)
-            final_context_data = {**final_context_data, **community_context_data}
+            final_context_data.update(community_context_data)
 
         # build local (i.e. entity-relationship-covariate) context
         local_prop = 1 - community_prop - text_unit_prop
         local_tokens = max(int(max_context_tokens * local_prop), 0)
-        local_context, local_context_data = self._build_local_context(
-            selected_entities=selected_entities,
-            max_context_tokens=local_tokens,
-            include_entity_rank=include_entity_rank,
-            rank_description=rank_description,
-            include_relationship_weight=include_relationship_weight,
-            top_k_relationships=top_k_relationships,
-            relationship_ranking_attribute=relationship_ranking_attribute,
-            column_delimiter=column_delimiter,
-            relationships=relationships,
-        )
+        with record_stage("context.local", timings):
+            local_context, local_context_data = self._build_local_context(
+                selected_entities=selected_entities,
+                max_context_tokens=local_tokens,
+                include_entity_rank=include_entity_rank,
+                rank_description=rank_description,
+                include_relationship_weight=include_relationship_weight,
+                top_k_relationships=top_k_relationships,
+                column_delimiter=column_delimiter,
+                relationships=relationship_index,
+            )
         if local_context.strip() != "":
             final_context.append(str(local_context))
-            final_context_data = {**final_context_data, **local_context_data}
+            final_context_data.update(local_context_data)
 
         text_unit_tokens = max(int(max_context_tokens * text_unit_prop), 0)
-        text_unit_context, text_unit_context_data = self._build_text_unit_context(
-            selected_entities=selected_entities,
-            max_context_tokens=text_unit_tokens,
-            text_units=text_units,
-            relationships=relationships,
-        )
+        with record_stage("context.text_units", timings):
+            text_unit_context, text_unit_context_data = self._build_text_unit_context(
+                selected_entities=selected_entities,
+                max_context_tokens=text_unit_tokens,
+                text_units=text_units,
+                relationships=relationship_index,
+            )
 
         if text_unit_context.strip() != "":
             final_context.append(text_unit_context)
-            final_context_data = {**final_context_data, **text_unit_context_data}
+            final_context_data.update(text_unit_context_data)
 
         return ContextBuilderResult(
             context_chunks="\n\n".join(final_context),
             context_records=final_context_data,
+            timings=timings,
+        )
+
+    async def _search_entities(
+        self, query_embedding: list[float], target_id: str, top_k: int
+    ) -> list[Entity]:
+        if self.entity_fusion is None:
+            return await self.entity_vector_store.search_by_vector(
+                embedding_vector=query_embedding, target_id=target_id, top_k=top_k
+            )
+        return await self.entity_vector_store.search_fused(
+            embedding_vector=query_embedding,
+            target_id=target_id,
+            top_k=top_k,
+            fusion=self.entity_fusion,
+            title_weight=self.entity_title_weight,
         )
 
+    async def _retrieve_remote(
+        self,
+        query_embedding: list[float],
+        target_id: str,
+        top_k_mapped_entities: int,
+        fetch_text_units: bool,
+        relationship_timeout: float | None,
+        text_unit_timeout: float | None,
+        timings: dict[str, float] | None = None,
+    ) -> tuple[list[Entity], list[Relationship], list[TextUnit]]:
+        """Retrieve entities from Qdrant, then relationships (Neo4j) and text units
+        (Qdrant) concurrently."""
+        with record_stage("entity_search", timings, source="qdrant"):
+            selected_entities = await self._search_entities(
+                query_embedding, target_id, top_k_mapped_entities
+            )
+        # get relationships and the text_units referenced by the selected entities
+        async with asyncio.TaskGroup() as task_group:
+            relationships_task = task_group.create_task(
+                _fetch_with_timeout(
+                    self.relationship_cache.fetch(selected_entities, target_id)
+                    if self.relationship_cache is not None
+                    else fetch_relationships_for_entities(
+                        driver=self.neo4j_driver,
+                        entities=selected_entities,
+                        target_id=target_id,
+                    ),
+                    timeout=relationship_timeout,
+                    fallback=list[Relationship](),
+                    stage="relationships",
+                    timings=timings,
+                    source="neo4j" if self.relationship_cache is None else "cache",
+                )
+            )
+            text_units_task = task_group.create_task(
+                _fetch_with_timeout(
+                    self.text_unit_vector_store.retrieve_by_ids(
+                        [
+                            text_unit_id
+                            for entity in selected_entities
+                            for text_unit_id in entity.text_unit_ids or []
+                        ],
+                        payload_fields=TEXT_UNIT_CONTEXT_FIELDS,
+                    ),
+                    timeout=text_unit_timeout,
+                    fallback=list[TextUnit](),
+                    stage="text_units",
+                    timings=timings,
+                    source="qdrant",
+                )
+                if fetch_text_units
+                else _completed(list[TextUnit]())
+            )
+        relationships = relationships_task.result()
+        text_units = text_units_task.result()
+        return selected_entities, relationships, text_units
+
     def _build_community_context(
         self,
         selected_entities: list[Entity],
@@ -201,12 +350,12 @@ class LocalSearchMixedContext:
         include_community_rank: bool = False,
         min_community_rank: int = 0,
         context_name: str = "Reports",
-    ) -> tuple[str, dict[str, pd.DataFrame]]:
+    ) -> tuple[str, ContextRecords]:
         """Add community data to the context window until it hits the
         max_context_tokens limit.
         """
         if len(selected_entities) == 0 or len(self.community_reports) == 0:
-            return ("", {context_name.lower(): pd.DataFrame()})
+            return ("", ContextRecords({context_name.lower(): pd.DataFrame()}))
 
         community_matches: dict[str, int] = {}
         for entity in selected_entities:
@@ -255,34 +404,27 @@ class LocalSearchMixedContext:
         self,
         selected_entities: list[Entity],
         text_units: list[TextUnit],
-        relationships: list[Relationship],
+        relationships: RelationshipIndex,
         max_context_tokens: int = 8000,
         column_delimiter: str = "|",
         context_name: str = "Sources",
-    ) -> tuple[str, dict[str, pd.DataFrame]]:
+    ) -> tuple[str, ContextRecords]:
         """Rank matching text units and add them to the context window until it hits
         the max_context_tokens limit.
         """
         if not selected_entities or not text_units:
-            return ("", {context_name.lower(): pd.DataFrame()})
+            return ("", ContextRecords({context_name.lower(): pd.DataFrame()}))
         selected_text_units = []
         text_unit_ids_set: set[str] = set()
         unit_info_list: list[tuple[TextUnit, int, int]] = []
         text_units_dict = {tu.id: tu for tu in text_units}
 
         for index, entity in enumerate(selected_entities):
-            # get matching relationships
-            entity_relationships = [
-                rel
-                for rel in relationships
-                if rel.source == entity.title or rel.target == entity.title
-            ]
-
             for text_id in entity.text_unit_ids or []:
                 if text_id not in text_unit_ids_set and text_id in text_units_dict:
                     selected_unit = deepcopy(text_units_dict[text_id])
                     num_relationships = count_relationships(
-                        entity_relationships, selected_unit
+                        relationships, entity, selected_unit
                     )
                     text_unit_ids_set.add(text_id)
                     unit_info_list.append((selected_unit, index, num_relationships))
@@ -305,17 +447,18 @@ class LocalSearchMixedContext:
     def _build_local_context(
         self,
         selected_entities: list[Entity],
-        relationships: list[Relationship],
+        relationships: RelationshipIndex,
         max_context_tokens: int = 8000,
         include_entity_rank: bool = False,
         rank_description: str = "relationship count",
         include_relationship_weight: bool = False,
         top_k_relationships: int = 10,
-        relationship_ranking_attribute: str = "rank",
         column_delimiter: str = "|",
-    ) -> tuple[str, dict[str, pd.DataFrame]]:
+    ) -> tuple[str, ContextRecords]:
         """Build data context for local search prompt combining
         entity/relationship/covariate tables.
+
+        Relationships are ranked by the ranking attribute of the index.
         """
         # build entity context
         entity_context, entity_context_data = build_entity_context(
@@ -329,49 +472,50 @@ class LocalSearchMixedContext:
         )
         entity_tokens = len(self.tokenizer.encode(entity_context))
 
-        # build relationship-covariate context
-        added_entities: list[Entity] = []
-        final_context = []
-        final_context_data = {}
-
-        # gradually add entities and associated
-        # metadata to the context until we reach limit
-        for entity in selected_entities:
-            current_context: list[str] = []
-            current_context_data: dict[str, pd.DataFrame] = {}
-            added_entities.append(entity)
-
-            # build relationship context
-            (
-                relationship_context,
-                relationship_context_data,
-            ) = build_relationship_context(
-                selected_entities=added_entities,
-                relationships=relationships,
-                tokenizer=self.tokenizer,
-                max_context_tokens=max_context_tokens,
-                column_delimiter=column_delimiter,
-                top_k_relationships=top_k_relationships,
-                include_relationship_weight=include_relationship_weight,
-                relationship_ranking_attribute=relationship_ranking_attribute,
-                context_name="Relationships",
-            )
-            current_context.append(relationship_context)
-            current_context_data["relationships"] = relationship_context_data
-            total_tokens = entity_tokens + len(
-                self.tokenizer.encode(relationship_context)
-            )
-
-            if total_tokens > max_context_tokens:
-                logger.warning(
-                    "Reached token limit - reverting to previous context state"
-                )
-                break
+        # build relationship-covariate context, adding the relationships of one
+        # entity at a time to a single table until we reach the limit
+        relationship_table = build_incremental_relationship_table(
+            selected_entities=selected_entities,
+            relationships=relationships,
+            tokenizer=self.tokenizer,
+            max_context_tokens=max_context_tokens - entity_tokens,
+            column_delimiter=column_delimiter,
+            top_k_relationships=top_k_relationships,
+            include_relationship_weight=include_relationship_weight,
+            context_name="Relationships",
+        )
 
-            final_context = current_context
-            final_context_data = current_context_data
+        final_context: list[str] = []
+        final_context_data = ContextRecords()
+        if relationship_table:
+            final_context = [relationship_table.to_text()]
+            final_context_data = ContextRecords({"relationships": relationship_table})
 
         # attach entity context to final context
         final_context_text = entity_context + "\n\n" + "\n\n".join(final_context)
-        final_context_data["entities"] = entity_context_data
+        final_context_data.update(entity_context_data)
         return (final_context_text, final_context_data)
+
+
+async def _fetch_with_timeout(
+    awaitable: Awaitable[T],
+    timeout: float | None,
+    fallback: T,
+    stage: str,
+    timings: dict[str, float] | None = None,
+    source: str = "",
+) -> T:
+    """Await a traced retrieval stage, returning `fallback` if it exceeds
+    `timeout`."""
+    with record_stage(stage, timings, source=source) as span:
+        try:
+            async with asyncio.timeout(timeout):
+                return await awaitable
+        except TimeoutError:
+            logger.warning(f"Fetching {stage} timed out after {timeout}s, skip them.")
+            span.set_attribute("timed_out", True)
+            return fallback
+
+
+async def _completed(value: T) -> T:
+    return value
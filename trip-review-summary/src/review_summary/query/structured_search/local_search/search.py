@@ -5,15 +5,19 @@
 
 import logging
 import time
-from collections.abc import AsyncGenerator
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from dataclasses import replace
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
+from opentelemetry.trace import StatusCode
 
 from review_summary.callbacks.query_callbacks import QueryCallbacks
 from review_summary.prompts.query.local_search_system_prompt import (
     LOCAL_SEARCH_SYSTEM_PROMPT,
 )
+from review_summary.query.answer_cache import SemanticAnswerCache
 from review_summary.query.base import SearchResult
 from review_summary.query.context_builder.conversation_history import (
     ConversationHistory,
@@ -21,6 +25,14 @@ from review_summary.query.context_builder.conversation_history import (
 from review_summary.query.structured_search.local_search.mixed_content import (
     LocalSearchMixedContext,
 )
+from review_summary.query.telemetry import (
+    answer_cache_lookups,
+    llm_operation_duration,
+    llm_time_to_first_token,
+    llm_token_usage,
+    record_stage,
+    tracer,
+)
 from review_summary.tokenizer.tokenizer import Tokenizer
 
 logger = logging.getLogger(__name__)
@@ -37,6 +49,9 @@ class LocalSearch:
         system_prompt: str | None = None,
         response_type: str = "multiple paragraphs",
         callbacks: list[QueryCallbacks] | None = None,
+        answer_cache: SemanticAnswerCache | None = None,
+        version_check_interval: float = 5.0,
+        max_index_versions: int = 1024,
     ):
         self.chat_model = chat_model
         self.context_builder = context_builder
@@ -45,16 +60,52 @@ class LocalSearch:
         self.system_prompt = system_prompt or LOCAL_SEARCH_SYSTEM_PROMPT
         self.callbacks = callbacks or []
         self.response_type = response_type
+        self.answer_cache = answer_cache
+        # Index versions of the answer cache keys, rechecked after
+        # `version_check_interval` seconds: target_id -> (version, checked_at)
+        self.version_check_interval = version_check_interval
+        self.max_index_versions = max_index_versions
+        self._index_versions: OrderedDict[str, tuple[int | None, float]] = OrderedDict()
 
     async def search(
         self,
         query: str,
         conversation_history: ConversationHistory | None = None,
         target_id: str = "",
+        on_token: Callable[[str], Awaitable[None]] | None = None,
     ) -> SearchResult:
         """Build local search context that fits a single
-        context window and generate answer for the user query."""
+        context window and generate answer for the user query.
+
+        `on_token` is awaited with each chunk of the answer as it is generated (or
+        with the whole answer on a cache hit), while the returned result still
+        carries the full response, the token accounting and the stage timings.
+        """
         start_time = time.time()
+        timings: dict[str, float] = {}
+        cache_key = await self._answer_cache_key(
+            query, conversation_history, target_id, timings
+        )
+        cached, similarity = self._lookup_answer(target_id, cache_key)
+        if cached is not None:
+            for callback in self.callbacks:
+                callback.on_context(cached.context_data)
+                callback.on_timings(timings)
+            if on_token is not None and isinstance(cached.response, str):
+                await on_token(cached.response)
+            return replace(
+                cached,
+                completion_time=time.time() - start_time,
+                timings=timings,
+                answer_cache_similarity=similarity,
+                llm_calls=0,
+                prompt_tokens=0,
+                output_tokens=0,
+                llm_calls_categories={"answer_cache": 0},
+                prompt_tokens_categories={"answer_cache": 0},
+                output_tokens_categories={"answer_cache": 0},
+            )
+
         search_prompt = ""
         llm_calls: dict[str, int] = {}
         prompt_tokens: dict[str, int] = {}
@@ -62,6 +113,7 @@ class LocalSearch:
         context_result = await self.context_builder.build_context(
             query=query, conversation_history=conversation_history, target_id=target_id
         )
+        _merge_timings(timings, context_result.timings)
         llm_calls["build_context"] = context_result.llm_calls
         prompt_tokens["build_context"] = context_result.prompt_tokens
         output_tokens["build_context"] = context_result.output_tokens
@@ -74,21 +126,29 @@ class LocalSearch:
             )
 
             full_response = ""
-            async for chunk in self.chat_model.astream(
-                [SystemMessage(content=search_prompt), HumanMessage(content=query)]
+            usage: dict[str, int] = {}
+            async for text in self._astream_answer(
+                search_prompt, query, timings, usage
             ):
-                full_response += chunk.text
+                full_response += text
                 for callback in self.callbacks:
-                    callback.on_llm_new_token(chunk.text)
+                    callback.on_llm_new_token(text)
+                if on_token is not None:
+                    await on_token(text)
 
             llm_calls["response"] = 1
-            prompt_tokens["response"] = len(self.tokenizer.encode(search_prompt))
-            output_tokens["response"] = len(self.tokenizer.encode(full_response))
+            prompt_tokens["response"] = usage.get(
+                "input_tokens", len(self.tokenizer.encode(search_prompt))
+            )
+            output_tokens["response"] = usage.get(
+                "output_tokens", len(self.tokenizer.encode(full_response))
+            )
 
             for callback in self.callbacks:
                 callback.on_context(context_result.context_records)
+                callback.on_timings(timings)
 
-            return SearchResult(
+            result = SearchResult(
                 response=full_response,
                 context_data=context_result.context_records,
                 context_text=context_result.context_chunks,
@@ -99,7 +159,11 @@ class LocalSearch:
                 llm_calls_categories=llm_calls,
                 prompt_tokens_categories=prompt_tokens,
                 output_tokens_categories=output_tokens,
+                timings=timings,
+                answer_cache_similarity=similarity,
             )
+            self._store_answer(target_id, cache_key, result)
+            return result
 
         except Exception:
             logger.exception("Exception in _asearch")
@@ -111,6 +175,8 @@ class LocalSearch:
                 llm_calls=1,
                 prompt_tokens=len(self.tokenizer.encode(search_prompt)),
                 output_tokens=0,
+                timings=timings,
+                answer_cache_similarity=similarity,
             )
 
     async def stream_search(
@@ -122,10 +188,22 @@ class LocalSearch:
         """Build local search context that fits a single
         context window and generate answer for the user query."""
         start_time = time.time()
+        timings: dict[str, float] = {}
+        cache_key = await self._answer_cache_key(
+            query, conversation_history, target_id, timings
+        )
+        cached, _ = self._lookup_answer(target_id, cache_key)
+        if cached is not None:
+            for callback in self.callbacks:
+                callback.on_context(cached.context_data)
+                callback.on_timings(timings)
+            yield str(cached.response)
+            return
 
         context_result = await self.context_builder.build_context(
             query=query, conversation_history=conversation_history, target_id=target_id
         )
+        _merge_timings(timings, context_result.timings)
         logger.debug("GENERATE ANSWER: %s. QUERY: %s", start_time, query)
         search_prompt = self.system_prompt.format(
             context_data=context_result.context_chunks, response_type=self.response_type
@@ -134,9 +212,164 @@ class LocalSearch:
         for callback in self.callbacks:
             callback.on_context(context_result.context_records)
 
-        async for chunk in self.chat_model.astream(
-            [SystemMessage(content=search_prompt), HumanMessage(content=query)]
-        ):
+        full_response = ""
+        usage: dict[str, int] = {}
+        async for text in self._astream_answer(search_prompt, query, timings, usage):
             for callback in self.callbacks:
-                callback.on_llm_new_token(chunk.text)
-            yield chunk.text
+                callback.on_llm_new_token(text)
+            full_response += text
+            yield text
+
+        for callback in self.callbacks:
+            callback.on_timings(timings)
+        self._store_answer(
+            target_id,
+            cache_key,
+            SearchResult(
+                response=full_response,
+                context_data=context_result.context_records,
+                context_text=context_result.context_chunks,
+                completion_time=time.time() - start_time,
+                llm_calls=1,
+                prompt_tokens=usage.get(
+                    "input_tokens", len(self.tokenizer.encode(search_prompt))
+                ),
+                output_tokens=usage.get(
+                    "output_tokens", len(self.tokenizer.encode(full_response))
+                ),
+                timings=timings,
+            ),
+        )
+
+    async def _astream_answer(
+        self,
+        search_prompt: str,
+        query: str,
+        timings: dict[str, float],
+        usage: dict[str, int],
+    ) -> AsyncGenerator[str, None]:
+        """Stream the answer of the chat model under a `chat` span.
+
+        The time to first token and the total time go to `timings`, the input and
+        output tokens reported by the API (if any) to `usage`.
+        """
+        model = str(self.chat_model.model_name)
+        attributes = {"gen_ai.operation.name": "chat", "gen_ai.request.model": model}
+        # Not made current: the consumer of the stream runs between the chunks
+        span = tracer.start_span(f"chat {model}", attributes=attributes)
+        start = time.perf_counter()
+        first_token: float | None = None
+        try:
+            async for chunk in self.chat_model.astream(
+                [SystemMessage(content=search_prompt), HumanMessage(content=query)],
+                stream_usage=True,
+            ):
+                if first_token is None and chunk.text:
+                    first_token = time.perf_counter() - start
+                    llm_time_to_first_token.record(first_token, attributes)
+                    span.add_event("first_token")
+                if chunk.usage_metadata:
+                    for key in ("input_tokens", "output_tokens"):
+                        usage[key] = usage.get(key, 0) + chunk.usage_metadata[key]
+                yield chunk.text
+        except Exception as e:
+            span.record_exception(e)
+            span.set_status(StatusCode.ERROR, str(e))
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            timings["llm_total"] = elapsed
+            if first_token is not None:
+                timings["llm_first_token"] = first_token
+            llm_operation_duration.record(elapsed, attributes)
+            for key, token_type in (
+                ("input_tokens", "input"),
+                ("output_tokens", "output"),
+            ):
+                if key in usage:
+                    span.set_attribute(f"gen_ai.usage.{key}", usage[key])
+                    llm_token_usage.record(
+                        usage[key], {**attributes, "gen_ai.token.type": token_type}
+                    )
+            span.end()
+
+    async def _answer_cache_key(
+        self,
+        query: str,
+        conversation_history: ConversationHistory | None,
+        target_id: str,
+        timings: dict[str, float],
+    ) -> tuple[int | None, list[float]] | None:
+        """Return the (index version, query embedding) used by the answer cache.
+
+        Queries with a conversation history depend on previous turns and are
+        never cached, nor are queries whose index version cannot be read.
+        """
+        if self.answer_cache is None or conversation_history:
+            return None
+        with record_stage("query_embedding", timings):
+            query_embedding = await self.context_builder.query_embedder.aembed_query(
+                query
+            )
+        try:
+            index_version = await self._index_version(target_id, timings)
+        except Exception as e:
+            logger.warning(
+                f"Failed to get the index version of {target_id}, "
+                f"skip the answer cache: {e}"
+            )
+            return None
+        return index_version, query_embedding
+
+    async def _index_version(
+        self, target_id: str, timings: dict[str, float]
+    ) -> int | None:
+        cached = self._index_versions.get(target_id)
+        if (
+            cached is not None
+            and time.monotonic() - cached[1] < self.version_check_interval
+        ):
+            self._index_versions.move_to_end(target_id)
+            return cached[0]
+        with record_stage("index_version", timings):
+            index_version = (
+                await self.context_builder.entity_vector_store.get_index_version(
+                    target_id
+                )
+            )
+        self._index_versions[target_id] = (index_version, time.monotonic())
+        self._index_versions.move_to_end(target_id)
+        while len(self._index_versions) > self.max_index_versions:
+            self._index_versions.popitem(last=False)
+        return index_version
+
+    def _lookup_answer(
+        self, target_id: str, cache_key: tuple[int | None, list[float]] | None
+    ) -> tuple[SearchResult | None, float | None]:
+        """Return the cached answer, if any, and the similarity of the most similar
+        cached query."""
+        if self.answer_cache is None or cache_key is None:
+            return None, None
+        cached, similarity = self.answer_cache.lookup(target_id, *cache_key)
+        answer_cache_lookups.add(1, {"hit": cached is not None})
+        if cached is None:
+            logger.debug(f"Answer cache miss, similarity: {similarity}")
+        else:
+            logger.info(f"Answer cache hit, similarity: {similarity:.4f}")
+        return cached, similarity
+
+    def _store_answer(
+        self,
+        target_id: str,
+        cache_key: tuple[int | None, list[float]] | None,
+        result: SearchResult,
+    ) -> None:
+        if self.answer_cache is None or cache_key is None or not result.response:
+            return
+        index_version, query_embedding = cache_key
+        self.answer_cache.store(target_id, index_version, query_embedding, result)
+
+
+def _merge_timings(timings: dict[str, float], other: dict[str, float]) -> None:
+    for stage, elapsed in other.items():
+        timings[stage] = timings.get(stage, 0.0) + elapsed
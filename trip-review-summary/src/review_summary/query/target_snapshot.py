@@ -0,0 +1,285 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+import numpy.typing as npt
+from neo4j import AsyncDriver
+
+from review_summary.models import Entity, Relationship, TextUnit
+from review_summary.query.context_builder.source_context import (
+    TEXT_UNIT_CONTEXT_FIELDS,
+)
+from review_summary.query.fetch_data.fetch_relationship import (
+    fetch_relationships_for_entities,
+)
+from review_summary.vector_stores.entity import EntityVectorStore
+from review_summary.vector_stores.text_unit import TextUnitVectorStore
+
+logger = logging.getLogger(__name__)
+
+# Rough per-object overhead used to estimate the memory footprint of a snapshot
+_OBJECT_OVERHEAD_BYTES = 512
+
+
+@dataclass
+class TargetSnapshot:
+    """In-memory copy of the graph index of one target.
+
+    Holds the L2-normalized float32 description embeddings of the entities, the
+    relationships indexed by entity title and the text units referenced by the
+    entities, so that local search context can be built without remote calls.
+    """
+
+    target_id: str
+    index_version: int | None
+    entities: list[Entity]
+    embeddings: npt.NDArray[np.float32]
+    relationships_by_entity: dict[str, list[Relationship]]
+    text_units: dict[str, TextUnit]
+    nbytes: int = 0
+    checked_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def create(
+        cls,
+        target_id: str,
+        index_version: int | None,
+        entities: list[Entity],
+        relationships: list[Relationship],
+        text_units: list[TextUnit],
+    ) -> "TargetSnapshot":
+        """Build a snapshot, dropping entities without description embedding."""
+        entities = [e for e in entities if e.description_embedding is not None]
+        embeddings = np.asarray(
+            [entity.description_embedding for entity in entities], dtype=np.float32
+        ).reshape(len(entities), -1)
+        embeddings /= np.maximum(
+            np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12
+        )
+        # The matrix holds the embeddings, do not keep a second copy as lists
+        entities = [
+            entity.model_copy(update={"description_embedding": None})
+            for entity in entities
+        ]
+
+        relationships_by_entity: dict[str, list[Relationship]] = {}
+        for relationship in relationships:
+            relationships_by_entity.setdefault(relationship.source, []).append(
+                relationship
+            )
+            if relationship.target != relationship.source:
+                relationships_by_entity.setdefault(relationship.target, []).append(
+                    relationship
+                )
+
+        nbytes = int(embeddings.nbytes) + _OBJECT_OVERHEAD_BYTES * (
+            len(entities) + len(relationships) + len(text_units)
+        )
+        nbytes += sum(len(entity.description or "") for entity in entities)
+        nbytes += sum(len(rel.description or "") for rel in relationships)
+        nbytes += sum(len(text_unit.text) for text_unit in text_units)
+
+        return cls(
+            target_id=target_id,
+            index_version=index_version,
+            entities=entities,
+            embeddings=embeddings,
+            relationships_by_entity=relationships_by_entity,
+            text_units={text_unit.id: text_unit for text_unit in text_units},
+            nbytes=nbytes,
+        )
+
+    def search_entities(self, query_embedding: list[float], top_k: int) -> list[Entity]:
+        """Return the top_k entities by cosine similarity, ranked like Qdrant.
+
+        As in `EntityVectorStore._to_entities`, a rank stored with the entity wins
+        over the similarity score.
+        """
+        if len(self.entities) == 0 or top_k <= 0:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        scores = self.embeddings @ (query / max(float(np.linalg.norm(query)), 1e-12))
+        top_k = min(top_k, len(self.entities))
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [
+            self.entities[index].model_copy(
+                update={"rank": _search_rank(self.entities[index], scores[index])}
+            )
+            for index in map(int, ordered)
+        ]
+
+    def relationships_for_entities(self, entities: list[Entity]) -> list[Relationship]:
+        """Return the relationships with a selected entity at either end."""
+        relationships: dict[str, Relationship] = {}
+        for entity in entities:
+            for relationship in self.relationships_by_entity.get(entity.title, []):
+                relationships.setdefault(relationship.id, relationship)
+        return list(relationships.values())
+
+    def text_units_by_ids(self, text_unit_ids: list[str]) -> list[TextUnit]:
+        """Return the known text units in the order of `text_unit_ids`."""
+        return [
+            self.text_units[text_unit_id]
+            for text_unit_id in dict.fromkeys(text_unit_ids)
+            if text_unit_id in self.text_units
+        ]
+
+
+def _search_rank(entity: Entity, score: float) -> int | None:
+    # model_fields_set holds the payload keys of entities read from Qdrant
+    if "rank" in entity.model_fields_set:
+        return entity.rank
+    return int(float(score) * 100)
+
+
+class TargetSnapshotCache:
+    """Keep snapshots of frequently queried targets in process memory.
+
+    A target is loaded in the background once it has been queried `hot_threshold`
+    times; until then, and for targets with more than `max_entities` entities, the
+    caller falls back to the remote stores. Snapshots are checked against the index
+    version every `version_check_interval` seconds and dropped when the target was
+    rebuilt. The least recently used snapshots are evicted beyond `max_bytes`.
+    Query counts are only kept for the `max_tracked_targets` most recently queried
+    targets, so that cold targets do not accumulate.
+    """
+
+    def __init__(
+        self,
+        entity_vector_store: EntityVectorStore,
+        text_unit_vector_store: TextUnitVectorStore,
+        neo4j_driver: AsyncDriver,
+        max_bytes: int = 512 * 1024 * 1024,
+        max_entities: int = 20_000,
+        hot_threshold: int = 3,
+        version_check_interval: float = 30.0,
+        max_tracked_targets: int = 4096,
+    ):
+        self.entity_vector_store = entity_vector_store
+        self.text_unit_vector_store = text_unit_vector_store
+        self.neo4j_driver = neo4j_driver
+        self.max_bytes = max_bytes
+        self.max_entities = max_entities
+        self.hot_threshold = hot_threshold
+        self.version_check_interval = version_check_interval
+        self.max_tracked_targets = max_tracked_targets
+
+        self._snapshots: OrderedDict[str, TargetSnapshot] = OrderedDict()
+        # Query counts per target, least recently queried first
+        self._query_counts: OrderedDict[str, int] = OrderedDict()
+        self._loading: dict[str, asyncio.Task[None]] = {}
+        self._nbytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        """The estimated memory footprint of all loaded snapshots."""
+        return self._nbytes
+
+    def __contains__(self, target_id: str) -> bool:
+        return target_id in self._snapshots
+
+    async def get(self, target_id: str) -> TargetSnapshot | None:
+        """Return the snapshot of a target, or None to use the remote stores."""
+        count = self._count_query(target_id)
+        snapshot = self._snapshots.get(target_id)
+        if snapshot is not None and await self._is_current(snapshot):
+            self._snapshots.move_to_end(target_id)
+            return snapshot
+
+        if count >= self.hot_threshold and target_id not in self._loading:
+            task = asyncio.create_task(self._load(target_id))
+            self._loading[target_id] = task
+            task.add_done_callback(lambda _: self._loading.pop(target_id, None))
+        return None
+
+    async def wait_loaded(self) -> None:
+        """Wait for the snapshots being loaded, mainly useful in tests."""
+        if self._loading:
+            await asyncio.gather(*self._loading.values(), return_exceptions=True)
+
+    def invalidate(self, target_id: str) -> None:
+        """Drop the snapshot of a target."""
+        snapshot = self._snapshots.pop(target_id, None)
+        if snapshot is not None:
+            self._nbytes -= snapshot.nbytes
+
+    def _count_query(self, target_id: str) -> int:
+        count = self._query_counts.pop(target_id, 0) + 1
+        self._query_counts[target_id] = count
+        while len(self._query_counts) > self.max_tracked_targets:
+            self._query_counts.popitem(last=False)
+        return count
+
+    async def _is_current(self, snapshot: TargetSnapshot) -> bool:
+        if time.monotonic() - snapshot.checked_at < self.version_check_interval:
+            return True
+        index_version = await self.entity_vector_store.get_index_version(
+            snapshot.target_id
+        )
+        if index_version != snapshot.index_version:
+            logger.info(
+                f"Index of {snapshot.target_id} changed from version "
+                f"{snapshot.index_version} to {index_version}, drop its snapshot."
+            )
+            self.invalidate(snapshot.target_id)
+            return False
+        snapshot.checked_at = time.monotonic()
+        return True
+
+    async def _load(self, target_id: str) -> None:
+        try:
+            snapshot = await self._create_snapshot(target_id)
+        except Exception as e:
+            logger.exception(f"Failed to load snapshot of {target_id}", exc_info=e)
+            return
+        if snapshot is None:
+            return
+        if snapshot.nbytes > self.max_bytes:
+            logger.warning(f"Snapshot of {target_id} exceeds the cache size, skip.")
+            return
+
+        self.invalidate(target_id)
+        self._snapshots[target_id] = snapshot
+        self._nbytes += snapshot.nbytes
+        while self._nbytes > self.max_bytes:
+            evicted_id, evicted = self._snapshots.popitem(last=False)
+            self._nbytes -= evicted.nbytes
+            logger.debug(f"Evicted snapshot of {evicted_id}.")
+        logger.info(
+            f"Loaded snapshot of {target_id} with {len(snapshot.entities)} entities "
+            f"({snapshot.nbytes / 1024 / 1024:.1f} MiB)."
+        )
+
+    async def _create_snapshot(self, target_id: str) -> TargetSnapshot | None:
+        index_version = await self.entity_vector_store.get_index_version(target_id)
+        entities = await self.entity_vector_store.find_by_target(
+            target_id, index_version=index_version, with_embedding=True
+        )
+        if len(entities) > self.max_entities:
+            logger.info(f"Target {target_id} is too large for a snapshot, skip.")
+            # Do not retry on every query, wait for the target to become hot again
+            self._query_counts[target_id] = 0
+            return None
+
+        relationships, text_units = await asyncio.gather(
+            fetch_relationships_for_entities(self.neo4j_driver, entities, target_id),
+            self.text_unit_vector_store.retrieve_by_ids(
+                [
+                    text_unit_id
+                    for entity in entities
+                    for text_unit_id in entity.text_unit_ids or []
+                ],
+                payload_fields=TEXT_UNIT_CONTEXT_FIELDS,
+            ),
+        )
+        return TargetSnapshot.create(
+            target_id=target_id,
+            index_version=index_version,
+            entities=entities,
+            relationships=relationships,
+            text_units=text_units,
+        )
@@ -0,0 +1,69 @@
+"""OpenTelemetry spans and histograms of the query path.
+
+The service runs under `opentelemetry-instrument`, which configures the SDK to
+export to the otel-collector. Without it the API hands out no-op tracers and
+meters, so the instrumentation is nearly free in tests and scripts.
+"""
+
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from opentelemetry import metrics, trace
+from opentelemetry.util.types import AttributeValue
+
+INSTRUMENTATION_SCOPE = "review_summary.query"
+
+tracer = trace.get_tracer(INSTRUMENTATION_SCOPE)
+meter = metrics.get_meter(INSTRUMENTATION_SCOPE)
+
+stage_duration = meter.create_histogram(
+    "review_summary.query.stage.duration",
+    unit="s",
+    description="Duration of a stage of the local search query path.",
+)
+answer_cache_lookups = meter.create_counter(
+    "review_summary.query.answer_cache.lookups",
+    unit="{lookup}",
+    description="Lookups of the semantic answer cache, by hit or miss.",
+)
+# Named after the OpenTelemetry semantic conventions of generative AI clients
+llm_operation_duration = meter.create_histogram(
+    "gen_ai.client.operation.duration",
+    unit="s",
+    description="Duration of a chat completion, up to its last token.",
+)
+llm_time_to_first_token = meter.create_histogram(
+    "gen_ai.server.time_to_first_token",
+    unit="s",
+    description="Time from sending a chat completion to its first token.",
+)
+llm_token_usage = meter.create_histogram(
+    "gen_ai.client.token.usage",
+    unit="{token}",
+    description="Input and output tokens of a chat completion.",
+)
+
+
+@contextmanager
+def record_stage(
+    stage: str,
+    timings: dict[str, float] | None = None,
+    **attributes: AttributeValue,
+) -> Generator[trace.Span, None, None]:
+    """Trace a stage of the query path and record its duration.
+
+    The duration in seconds is added to `timings[stage]`, so a stage entered
+    several times reports its total.
+    """
+    start = time.perf_counter()
+    with tracer.start_as_current_span(
+        f"local_search.{stage}", attributes={"stage": stage, **attributes}
+    ) as span:
+        try:
+            yield span
+        finally:
+            elapsed = time.perf_counter() - start
+            stage_duration.record(elapsed, {"stage": stage})
+            if timings is not None:
+                timings[stage] = timings.get(stage, 0.0) + elapsed
@@ -17,7 +17,7 @@ async def main() -> None:
     # Initialize dependencies
     qdrant_client = AsyncQdrantClient(url=settings.qdrant.url)
     vector_store = await TextUnitVectorStore.create_vector_store(
-        client=qdrant_client, vector_dim=3072
+        client=qdrant_client, profile=settings.embedding
     )
     consumer = RocketMQConsumer(text_unit_vector_store=vector_store)
 
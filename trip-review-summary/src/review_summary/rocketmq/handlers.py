@@ -9,6 +9,12 @@ from review_summary.vector_stores.text_unit import TextUnitVectorStore
 
 logger = logging.getLogger(__name__)
 
+# Reviews are chunked, and their text unit token counts stored, in the encoding of
+# the query chat model (o200k_base for gpt-4o-mini), so that local search uses the
+# stored counts instead of tokenizing the text units again. Keep it in line with
+# FinalizeGraphConfig.encoding_name, see TextUnit.n_tokens_encoding.
+CHUNK_ENCODING_NAME = "o200k_base"
+
 
 async def handle_create_review(
     text_unit_vector_store: TextUnitVectorStore, message_body: dict[str, Any]
@@ -17,14 +23,13 @@ async def handle_create_review(
     create_review = CreateReview.model_validate(message_body, by_alias=True)
 
     logger.debug(f"Chunking for review {create_review.id}")
-    text_chunks = chunk_text([create_review.text], encoding_name="cl100k_base")
+    text_chunks = chunk_text([create_review.text], encoding_name=CHUNK_ENCODING_NAME)
     text_units: list[TextUnit] = []
 
     # Generate text embeddings
     logger.debug(f"Generating embeddings for review {create_review.id}")
     embeddings = await embed_text(
-        texts=[text_chunk.text_chunk for text_chunk in text_chunks],
-        embedding_model_config={"model": "text-embedding-3-large"},
+        texts=[text_chunk.text_chunk for text_chunk in text_chunks]
     )
 
     # Create basic text units with embeddings
@@ -40,6 +45,7 @@ async def handle_create_review(
             text=text_chunk.text_chunk,
             embedding=embedding,
             n_tokens=text_chunk.n_tokens,
+            n_tokens_encoding=CHUNK_ENCODING_NAME,
             document_id=create_review.id,
             attributes={
                 "target_id": create_review.target_id,
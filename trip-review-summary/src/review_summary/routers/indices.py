@@ -1,14 +1,21 @@
+import time
 from typing import Any, Literal
 
 from celery import chain
 from fastapi import APIRouter
 from pydantic import BaseModel, Field
 
+from review_summary.celery import app as celery_app
+from review_summary.config.index.collect_text_units_config import (
+    CollectTextUnitsConfig,
+)
 from review_summary.config.index.create_text_embeddings_config import (
     CreateTextEmbeddingsConfig,
 )
 from review_summary.config.index.extract_graph_config import ExtractGraphConfig
 from review_summary.config.index.finalize_graph_config import FinalizeGraphConfig
+from review_summary.config.settings import get_settings
+from review_summary.index.profiler import StageProfile
 from review_summary.index.tasks.collect_text_units import (
     run_workflow as collect_text_units,
 )
@@ -26,6 +33,7 @@ from review_summary.index.tasks.create_text_embeddings import (
 )
 from review_summary.index.tasks.extract_graph import run_workflow as extract_graph
 from review_summary.index.tasks.finalize_graph import run_workflow as finalize_graph
+from review_summary.utils.uuid import uuid7
 
 
 class BuildIndexRequest(BaseModel):
@@ -41,16 +49,40 @@ class TaskSubmitResponse(BaseModel):
     task_id: str = Field(..., description="ID of the graph indexing (Celery) Task.")
 
 
+class TaskStatusResponse(BaseModel):
+    task_id: str = Field(..., description="ID of the graph indexing (Celery) Task.")
+    state: str = Field(
+        ..., description="State of the task, e.g. PENDING, PROGRESS or SUCCESS."
+    )
+    stage: str | None = Field(default=None, description="The stage being run.")
+    stages: list[StageProfile] = Field(
+        default_factory=list[StageProfile],
+        description="Profiles of the completed stages, in order.",
+    )
+    total: StageProfile = Field(
+        default_factory=lambda: StageProfile(stage="total"),
+        description="Sum of the profiles of the completed stages.",
+    )
+    error: str | None = Field(default=None, description="Error of a failed task.")
+
+
 indices = APIRouter(prefix="/indices", tags=["Indices"])
 
 
 @indices.post("")
 async def build_graph_index(request: BuildIndexRequest) -> TaskSubmitResponse:
+    # The ID of the last task of the chain, which the whole run is tracked by
+    task_id = str(uuid7())
     pipeline_context: dict[str, Any] = {
+        "task_id": task_id,
         "target_id": request.target_id,
         "target_type": request.target_type,
-        "vector_dim": 3072,  # Vector dimension of embeddings
+        # Model, dimensions and dtype of the embeddings, fixed for the whole run
+        "embedding_profile": get_settings().embedding.model_dump(),
+        # Invalidates the answers cached for the previous index of the target
+        "index_version": time.time_ns() // 1_000_000,
     }
+    collect_text_units_config = CollectTextUnitsConfig()
     extract_graph_config = ExtractGraphConfig(
         # For extract_graph operation
         graph_llm_config={"model": "gpt-4o", "temperature": 0.3},
@@ -58,11 +90,9 @@ async def build_graph_index(request: BuildIndexRequest) -> TaskSubmitResponse:
         summary_llm_config={"model": "gpt-4o", "temperature": 0.3},
     )
     finalize_graph_config = FinalizeGraphConfig()
-    create_text_embeddings_config = CreateTextEmbeddingsConfig(
-        embedding_llm_config={"model": "text-embedding-3-large"}
-    )
+    create_text_embeddings_config = CreateTextEmbeddingsConfig()
     pipeline = chain(
-        collect_text_units.s(pipeline_context),
+        collect_text_units.s(pipeline_context, collect_text_units_config.model_dump()),
         extract_graph.s(extract_graph_config.model_dump()),
         finalize_graph.s(finalize_graph_config.model_dump()),
         create_communities.s(),
@@ -70,10 +100,30 @@ async def build_graph_index(request: BuildIndexRequest) -> TaskSubmitResponse:
         create_community_reports.s(),
         create_text_embeddings.s(create_text_embeddings_config.model_dump()),
     )
-    result = pipeline.apply_async()
+    result = pipeline.apply_async(task_id=task_id)
     return TaskSubmitResponse(task_id=result.id)
 
 
+@indices.get("/tasks/{task_id}")
+async def get_graph_index_task(task_id: str) -> TaskStatusResponse:
+    """Return the state of an indexing run with the profile of each stage."""
+    meta = celery_app.backend.get_task_meta(task_id)
+    state: str = meta["status"]
+    result = meta.get("result")
+    response = TaskStatusResponse(task_id=task_id, state=state)
+    if isinstance(result, dict):
+        # PROGRESS meta reported by the stages, or the final context on SUCCESS
+        response.stage = result.get("stage")  # pyright: ignore
+        response.stages = [
+            StageProfile.model_validate(profile)
+            for profile in result.get("profile", [])  # pyright: ignore
+        ]
+        response.total = StageProfile.total(response.stages)
+    elif isinstance(result, BaseException):
+        response.error = f"{type(result).__name__}: {result}"
+    return response
+
+
 @indices.delete("/{target_id}")
 async def delete_graph_index(target_id: str) -> None:
     raise NotImplementedError
@@ -19,6 +19,7 @@ class TiktokenTokenizer(Tokenizer):
             encoding_name (str): The name of the Tiktoken encoding
                 to use for tokenization.
         """
+        self.encoding_name = encoding_name
         self.encoding = tiktoken.get_encoding(encoding_name)
 
     def encode(self, text: str) -> list[int]:
@@ -9,6 +9,10 @@ from abc import ABC, abstractmethod
 class Tokenizer(ABC):
     """Tokenizer Abstract Base Class."""
 
+    # The name of the encoding, token counts stored by the index are only trusted
+    # when they were counted in the same encoding
+    encoding_name: str | None = None
+
     @abstractmethod
     def encode(self, text: str) -> list[int]:
         """Encode the given text into a list of tokens.
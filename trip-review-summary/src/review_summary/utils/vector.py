@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Annotated, Any, cast
+
+import numpy as np
+import numpy.typing as npt
+import pyarrow as pa
+from pydantic import PlainSerializer, PlainValidator, WithJsonSchema
+
+
+def as_vector(value: Any) -> npt.NDArray[np.float32] | None:
+    """Convert an embedding to a 1-D float32 array, without copying float32 input."""
+    if value is None:
+        return None
+    vector = np.asarray(value, dtype=np.float32)
+    if vector.ndim != 1:
+        raise ValueError(f"Expected a 1-D vector, got shape {vector.shape}.")
+    return vector
+
+
+def _validate(value: Any) -> npt.NDArray[np.float32]:
+    vector = as_vector(value)
+    if vector is None:
+        raise ValueError("Expected a vector, got None.")
+    return vector
+
+
+# An embedding held as a float32 array: 4 bytes per dimension instead of a boxed
+# Python float, dumped as is in python mode and as a list of floats in JSON.
+Vector = Annotated[
+    npt.NDArray[np.float32],
+    PlainValidator(_validate),
+    PlainSerializer(lambda vector: vector.tolist(), when_used="json"),
+    WithJsonSchema({"type": "array", "items": {"type": "number"}}),
+]
+
+
+def vectors_to_arrow(
+    vectors: Sequence[npt.ArrayLike | None], dim: int
+) -> pa.FixedSizeListArray[Any, Any]:
+    """Pack vectors into an Arrow fixed_size_list<float32> array, None as null.
+
+    The vectors are copied once into a contiguous buffer that Arrow then wraps.
+    """
+    valid = np.fromiter((vector is not None for vector in vectors), dtype=bool)
+    matrix = np.zeros((len(vectors), dim), dtype=np.float32)
+    for index, vector in enumerate(vectors):
+        if vector is not None:
+            matrix[index] = vector
+    values = pa.array(matrix.reshape(-1))
+    return pa.FixedSizeListArray.from_arrays(  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+        values, dim, mask=pa.array(~valid) if not valid.all() else None
+    )
+
+
+def vectors_from_arrow(
+    array: pa.Array[Any] | pa.ChunkedArray[Any],
+) -> tuple[npt.NDArray[np.float32], npt.NDArray[np.bool_]]:
+    """Return the (n, dim) float32 matrix of a fixed_size_list array and the mask
+    of its non-null rows. Null rows are zeros in the matrix.
+
+    Single-chunk float32 arrays without nulls are wrapped without copying.
+    """
+    if isinstance(array, pa.ChunkedArray):
+        array = array.chunk(0) if array.num_chunks == 1 else array.combine_chunks()
+    if not isinstance(array, pa.FixedSizeListArray):
+        raise TypeError(f"Expected a fixed_size_list array, got {array.type}.")
+    fixed = cast("pa.FixedSizeListArray[Any, int]", array)
+    dim = fixed.type.list_size
+    valid = fixed.is_valid().to_numpy(zero_copy_only=False)
+    # flatten() skips null rows, the values buffer still holds a slot for them
+    values = cast("pa.Array[Any]", fixed.values).slice(
+        fixed.offset * dim, len(fixed) * dim
+    )
+    if values.type != pa.float32():
+        values = values.cast(pa.float32())
+    matrix = values.to_numpy(zero_copy_only=values.null_count == 0).reshape(-1, dim)
+    if not valid.all():
+        matrix = np.where(valid[:, None], matrix, np.float32(0))
+    return matrix, valid
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+
+from qdrant_client import AsyncQdrantClient, models
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBatcher:
+    """Coalesce concurrent searches of a collection into `query_batch_points` calls.
+
+    Searches that arrive within `batch_window` seconds are sent together as one
+    batch request, at most `max_batch_size` at a time, and each caller gets the
+    points of its own search back. With `batch_window` set to None every search
+    is sent alone.
+    """
+
+    def __init__(
+        self,
+        client: AsyncQdrantClient,
+        collection_name: str,
+        batch_window: float | None = 0.001,
+        max_batch_size: int = 64,
+    ):
+        self.client = client
+        self.collection_name = collection_name
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+
+        self._batch: list[
+            tuple[models.QueryRequest, asyncio.Future[list[models.ScoredPoint]]]
+        ] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def query(self, request: models.QueryRequest) -> list[models.ScoredPoint]:
+        """Run a search, batched with the concurrent ones."""
+        if self.batch_window is None:
+            [response] = await self.client.query_batch_points(
+                self.collection_name, requests=[request]
+            )
+            return response.points
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[models.ScoredPoint]] = loop.create_future()
+        self._batch.append((request, future))
+        if len(self._batch) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._batch = self._batch, []
+        # Skip the searches whose caller was cancelled while waiting
+        batch = [(request, future) for request, future in batch if not future.done()]
+        if len(batch) == 0:
+            return
+        task = asyncio.create_task(self._query_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _query_batch(
+        self,
+        batch: list[
+            tuple[models.QueryRequest, asyncio.Future[list[models.ScoredPoint]]]
+        ],
+    ) -> None:
+        logger.debug(f"Querying {self.collection_name} with a batch of {len(batch)}.")
+        try:
+            responses = await self.client.query_batch_points(
+                self.collection_name, requests=[request for request, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), response in zip(batch, responses, strict=True):
+            if not future.done():
+                future.set_result(response.points)
@@ -0,0 +1,84 @@
+import logging
+
+from qdrant_client import AsyncQdrantClient, models
+
+from review_summary.config.embedding import CollectionConfig
+
+logger = logging.getLogger(__name__)
+
+# Payload fields filtered on by the vector stores, and their index schema
+PayloadIndexes = dict[str, models.PayloadSchemaType | models.KeywordIndexParams]
+
+TARGET_PAYLOAD_INDEXES: PayloadIndexes = {
+    # Every search and scroll is scoped to one target, index it as the tenant key
+    "attributes.target_id": models.KeywordIndexParams(
+        type=models.KeywordIndexType.KEYWORD, is_tenant=True
+    ),
+    "attributes.target_type": models.PayloadSchemaType.KEYWORD,
+}
+
+
+async def create_collection(
+    client: AsyncQdrantClient,
+    collection_name: str,
+    vector_names: list[str] | None,
+    vector_dim: int,
+    payload_indexes: PayloadIndexes,
+    config: CollectionConfig,
+    datatype: models.Datatype = models.Datatype.FLOAT32,
+) -> None:
+    """Create a collection with the configured storage options and payload indexes.
+
+    `vector_names` lists the named vectors, or None for a single unnamed vector.
+    """
+    vectors_config: models.VectorParams | dict[str, models.VectorParams] = (
+        {name: config.vector_params(vector_dim, datatype) for name in vector_names}
+        if vector_names is not None
+        else config.vector_params(vector_dim, datatype)
+    )
+    await client.create_collection(
+        collection_name=collection_name,
+        vectors_config=vectors_config,
+        hnsw_config=config.hnsw_config(),
+        quantization_config=config.quantization_config(),
+    )
+    await create_payload_indexes(client, collection_name, payload_indexes)
+
+
+async def create_payload_indexes(
+    client: AsyncQdrantClient, collection_name: str, payload_indexes: PayloadIndexes
+) -> None:
+    """Create the missing payload indexes of a collection."""
+    info = await client.get_collection(collection_name)
+    for field_name, field_schema in payload_indexes.items():
+        if field_name in info.payload_schema:
+            continue
+        await client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=field_schema,
+        )
+
+
+async def migrate_collection(
+    client: AsyncQdrantClient,
+    collection_name: str,
+    vector_names: list[str] | None,
+    payload_indexes: PayloadIndexes,
+    config: CollectionConfig,
+) -> None:
+    """Apply the configured storage options and payload indexes to an existing
+    collection. Qdrant rebuilds the affected segments in the background."""
+    if (await client.collection_exists(collection_name)) is False:
+        logger.info(f"Collection {collection_name} does not exist, skip migration.")
+        return
+
+    vector_diff = models.VectorParamsDiff(on_disk=config.on_disk)
+    await client.update_collection(
+        collection_name=collection_name,
+        vectors_config={name: vector_diff for name in vector_names or [""]},
+        hnsw_config=config.hnsw_config(),
+        quantization_config=config.quantization_config() or models.Disabled.DISABLED,
+    )
+    await create_payload_indexes(client, collection_name, payload_indexes)
+    logger.info(f"Migrated collection {collection_name} to {config}.")
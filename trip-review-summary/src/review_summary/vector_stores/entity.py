@@ -1,36 +1,99 @@
 import logging
-from typing import Any, Self
+from typing import Any, Literal, Self
 
 from qdrant_client import AsyncQdrantClient, models
+from qdrant_client.conversions.common_types import PointId
 
+from review_summary.config.embedding import CollectionConfig, EmbeddingProfile
+from review_summary.config.settings import get_settings
 from review_summary.models import Entity
+from review_summary.utils.vector import as_vector
+from review_summary.vector_stores.batching import QueryBatcher
+from review_summary.vector_stores.collection import (
+    TARGET_PAYLOAD_INDEXES,
+    PayloadIndexes,
+    create_collection,
+    create_payload_indexes,
+    migrate_collection,
+)
 
 logger = logging.getLogger(__name__)
 
+# Server-side fusion of the description and title vector searches
+EntityFusion = Literal["rrf", "dbsf", "weighted"]
+
 
 class EntityVectorStore:
     COLLECTION_NAME = "review_summary_entity_embeddings"
+    INDEX_VERSION_KEY = "attributes.index_version"
+
+    VECTOR_NAMES = ["description", "title"]
+    PAYLOAD_INDEXES: PayloadIndexes = {
+        **TARGET_PAYLOAD_INDEXES,
+        # Required by get_index_version to order entities by version
+        INDEX_VERSION_KEY: models.PayloadSchemaType.INTEGER,
+    }
 
-    def __init__(self, client: AsyncQdrantClient):
+    def __init__(
+        self,
+        client: AsyncQdrantClient,
+        config: CollectionConfig | None = None,
+        profile: EmbeddingProfile | None = None,
+    ):
         self.client = client
+        self.config = config or get_settings().qdrant.collection
+        self.profile = profile or get_settings().embedding
+        self.collection_name = self.profile.collection_name(self.COLLECTION_NAME)
+        self.search_params = self.config.search_params()
+        self.query_batcher = QueryBatcher(
+            client,
+            self.collection_name,
+            batch_window=self.config.query_batch_window,
+            max_batch_size=self.config.query_batch_size,
+        )
 
     @classmethod
     async def create_vector_store(
-        cls, client: AsyncQdrantClient, vector_dim: int = 3072
+        cls,
+        client: AsyncQdrantClient,
+        config: CollectionConfig | None = None,
+        profile: EmbeddingProfile | None = None,
     ) -> Self:
-        if (await client.collection_exists(cls.COLLECTION_NAME)) is False:
-            await client.create_collection(
-                collection_name=cls.COLLECTION_NAME,
-                vectors_config={
-                    "description": models.VectorParams(
-                        size=vector_dim, distance=models.Distance.COSINE
-                    ),
-                    "title": models.VectorParams(
-                        size=vector_dim, distance=models.Distance.COSINE
-                    ),
-                },
+        store = cls(client, config, profile)
+        if (await client.collection_exists(store.collection_name)) is False:
+            await create_collection(
+                client,
+                collection_name=store.collection_name,
+                vector_names=cls.VECTOR_NAMES,
+                vector_dim=store.profile.vector_dim,
+                payload_indexes=cls.PAYLOAD_INDEXES,
+                config=store.config,
+                datatype=store.profile.datatype,
             )
-        return cls(client)
+        else:
+            # Collections created before an index was added (get_index_version
+            # cannot order by version without its index) get it on first use
+            await create_payload_indexes(
+                client, store.collection_name, cls.PAYLOAD_INDEXES
+            )
+        return store
+
+    @classmethod
+    async def migrate(
+        cls,
+        client: AsyncQdrantClient,
+        config: CollectionConfig | None = None,
+        profile: EmbeddingProfile | None = None,
+    ) -> None:
+        """Apply the storage options and payload indexes to the existing collection."""
+        store = cls(client, config, profile)
+        await migrate_collection(
+            client,
+            collection_name=store.collection_name,
+            vector_names=cls.VECTOR_NAMES,
+            payload_indexes=cls.PAYLOAD_INDEXES,
+            config=store.config,
+        )
 
     async def save_multiple(self, entities: list[Entity]) -> None:
         if len(entities) == 0:
@@ -43,10 +106,12 @@ class EntityVectorStore:
             entity_id = payload.pop("id")
             # Remove embeddings from payload
             vector: dict[str, Any] = {}
-            if description_embedding := payload.pop("description_embedding", None):
-                vector["description"] = description_embedding
-            if title_embedding := payload.pop("title_embedding", None):
-                vector["title"] = title_embedding
+            description_embedding = payload.pop("description_embedding", None)
+            if description_embedding is not None and len(description_embedding) > 0:
+                vector["description"] = description_embedding.tolist()
+            title_embedding = payload.pop("title_embedding", None)
+            if title_embedding is not None and len(title_embedding) > 0:
+                vector["title"] = title_embedding.tolist()
             if not vector:
                 logger.warning(f"Skip Entity {entity_id} due to missing embedding.")
                 continue
@@ -54,9 +119,66 @@ class EntityVectorStore:
             point = models.PointStruct(id=entity_id, vector=vector, payload=payload)
             points.append(point)
 
-        result = await self.client.upsert(self.COLLECTION_NAME, points=points)
+        result = await self.client.upsert(self.collection_name, points=points)
         logger.debug(f"Qdrant upsert result: {result}")
 
+    async def find_by_target(
+        self,
+        target_id: str,
+        target_type: str = "attraction",
+        index_version: int | None = None,
+        with_embedding: bool = False,
+        page_size: int = 1024,
+    ) -> list[Entity]:
+        """Find all entities of a target, optionally restricted to an index version.
+
+        Only the description embeddings are fetched when `with_embedding` is set.
+        """
+        conditions: list[models.Condition] = [
+            models.FieldCondition(
+                key="attributes.target_id",
+                match=models.MatchValue(value=target_id),
+            ),
+            models.FieldCondition(
+                key="attributes.target_type",
+                match=models.MatchValue(value=target_type),
+            ),
+        ]
+        if index_version is not None:
+            conditions.append(
+                models.FieldCondition(
+                    key=self.INDEX_VERSION_KEY,
+                    match=models.MatchValue(value=index_version),
+                )
+            )
+
+        entities: list[Entity] = []
+        offset: PointId | None = None
+        while True:
+            records, offset = await self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=models.Filter(must=conditions),
+                limit=page_size,
+                offset=offset,
+                with_vectors=["description"] if with_embedding else False,
+            )
+            for record in records:
+                vectors = record.vector if isinstance(record.vector, dict) else {}
+                entities.append(
+                    Entity.from_store(
+                        {
+                            "id": record.id,
+                            **(record.payload or {}),
+                            "description_embedding": as_vector(
+                                vectors.get("description")
+                            ),
+                        }
+                    )
+                )
+            if offset is None:
+                break
+        return entities
+
     async def search_by_vector(
         self,
         embedding_vector: list[float],
@@ -65,11 +187,81 @@ class EntityVectorStore:
         top_k: int = 10,
         vector_name: str = "description",  # Add parameter to specify which vector
     ) -> list[Entity]:
-        response = await self.client.query_points(
-            collection_name=self.COLLECTION_NAME,
-            query=embedding_vector,
-            using=vector_name,  # Specify which named vector to use
-            query_filter=models.Filter(
+        points = await self.query_batcher.query(
+            models.QueryRequest(
+                query=embedding_vector,
+                using=vector_name,  # Specify which named vector to use
+                params=self.search_params,
+                filter=self._target_filter(target_id, target_type),
+                limit=top_k,
+                with_payload=True,
+            )
+        )
+        return self._to_entities(points)
+
+    async def search_fused(
+        self,
+        embedding_vector: list[float],
+        target_id: str,
+        target_type: str = "attraction",
+        top_k: int = 10,
+        fusion: EntityFusion = "rrf",
+        title_weight: float = 0.5,
+        prefetch_limit: int | None = None,
+    ) -> list[Entity]:
+        """Search the description and title vectors in one request.
+
+        Both named vectors prefetch `prefetch_limit` candidates (twice `top_k` by
+        default), which Qdrant fuses by reciprocal rank (rrf), distribution-based
+        score fusion (dbsf) or a sum of the scores weighted by `title_weight`.
+        Entities without a title embedding are only matched by description.
+        """
+        query_filter = self._target_filter(target_id, target_type)
+        prefetch = [
+            models.Prefetch(
+                query=embedding_vector,
+                using=vector_name,
+                filter=query_filter,
+                params=self.search_params,
+                limit=prefetch_limit or 2 * top_k,
+            )
+            for vector_name in self.VECTOR_NAMES
+        ]
+        query: models.Query
+        if fusion == "weighted":
+            # $score[i] is the score of the i-th prefetch, 0 when it missed the point
+            weights = {"description": 1 - title_weight, "title": title_weight}
+            query = models.FormulaQuery(
+                formula=models.SumExpression(
+                    sum=[
+                        models.MultExpression(
+                            mult=[weights[vector_name], f"$score[{index}]"]
+                        )
+                        for index, vector_name in enumerate(self.VECTOR_NAMES)
+                    ]
+                ),
+                defaults={f"$score[{index}]": 0.0 for index in range(len(prefetch))},
+            )
+        else:
+            query = models.FusionQuery(fusion=models.Fusion(fusion))
+        points = await self.query_batcher.query(
+            models.QueryRequest(
+                prefetch=prefetch, query=query, limit=top_k, with_payload=True
+            )
+        )
+        return self._to_entities(points)
+
+    async def get_index_version(
+        self, target_id: str, target_type: str = "attraction"
+    ) -> int | None:
+        """Return the latest index version of a target, None if it has none.
+
+        Ordering by version only considers entities carrying one, so that entities
+        indexed before versions were recorded are ignored.
+        """
+        records, _ = await self.client.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=models.Filter(
                 must=[
                     models.FieldCondition(
                         key="attributes.target_id",
@@ -81,17 +273,44 @@ class EntityVectorStore:
                     ),
                 ]
             ),
-            limit=top_k,
+            limit=1,
+            order_by=models.OrderBy(
+                key=self.INDEX_VERSION_KEY, direction=models.Direction.DESC
+            ),
+            with_payload=models.PayloadSelectorInclude(
+                include=[self.INDEX_VERSION_KEY]
+            ),
+        )
+        if len(records) == 0:
+            return None
+        attributes: dict[str, Any] = (records[0].payload or {}).get("attributes") or {}
+        version: int | None = attributes.get("index_version")
+        return version
+
+    @staticmethod
+    def _target_filter(target_id: str, target_type: str) -> models.Filter:
+        return models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="attributes.target_id",
+                    match=models.MatchValue(value=target_id),
+                ),
+                models.FieldCondition(
+                    key="attributes.target_type",
+                    match=models.MatchValue(value=target_type),
+                ),
+            ]
         )
-        # Convert response to list of Entity
-        entities: list[Entity] = [
-            Entity.model_validate(
+
+    @staticmethod
+    def _to_entities(points: list[models.ScoredPoint]) -> list[Entity]:
+        return [
+            Entity.from_store(
                 {
                     "id": point.id,
                     "rank": int(point.score * 100),
                     **(point.payload or {}),
                 }
             )
-            for point in response.points
+            for point in points
         ]
-        return entities
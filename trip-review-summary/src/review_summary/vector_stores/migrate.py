@@ -0,0 +1,31 @@
+"""Apply the configured collection options to the existing Qdrant collections.
+
+Usage: python -m review_summary.vector_stores.migrate
+"""
+
+import asyncio
+import logging
+
+from qdrant_client import AsyncQdrantClient
+
+from review_summary.config.logging import setup_logging
+from review_summary.config.settings import get_settings
+from review_summary.vector_stores.entity import EntityVectorStore
+from review_summary.vector_stores.text_unit import TextUnitVectorStore
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate_collections() -> None:
+    qdrant_settings = get_settings().qdrant
+    client = AsyncQdrantClient(url=qdrant_settings.url)
+    try:
+        await EntityVectorStore.migrate(client, qdrant_settings.collection)
+        await TextUnitVectorStore.migrate(client, qdrant_settings.collection)
+    finally:
+        await client.close()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(migrate_collections())
@@ -0,0 +1,140 @@
+"""Re-embed the Qdrant collections of an embedding profile into the collections of
+the configured profile, side by side with the existing ones.
+
+The source collections keep serving queries while the new ones are filled; switch
+the EMBEDDING_* settings of the services afterwards, then drop the old collections.
+
+Usage: EMBEDDING_DIMENSIONS=1024 python -m review_summary.vector_stores.reembed \
+    --source '{"model": "text-embedding-3-large"}'
+"""
+
+import argparse
+import asyncio
+import logging
+
+from qdrant_client import AsyncQdrantClient, models
+from qdrant_client.conversions.common_types import PointId
+
+from review_summary.config.embedding import EmbeddingProfile
+from review_summary.config.logging import setup_logging
+from review_summary.config.settings import get_settings
+from review_summary.index.operations.embed_text import embed_text
+from review_summary.vector_stores.entity import EntityVectorStore
+from review_summary.vector_stores.text_unit import TextUnitVectorStore
+
+logger = logging.getLogger(__name__)
+
+# Payload field embedded into each vector, "" is the unnamed vector of a collection
+TEXT_UNIT_VECTOR_FIELDS = {"": "text"}
+ENTITY_VECTOR_FIELDS = {"description": "description", "title": "title"}
+
+
+async def reembed_collection(
+    client: AsyncQdrantClient,
+    source_collection: str,
+    target_collection: str,
+    vector_fields: dict[str, str],
+    profile: EmbeddingProfile,
+    page_size: int = 256,
+) -> int:
+    """Copy the points of a collection, re-embedding their texts with a profile.
+
+    Only the vectors present in a source point are re-embedded, from the payload
+    field mapped to the vector name. Return the number of points copied.
+    """
+    if (await client.collection_exists(source_collection)) is False:
+        logger.info(f"Collection {source_collection} does not exist, skip.")
+        return 0
+
+    copied = 0
+    offset: PointId | None = None
+    while True:
+        records, offset = await client.scroll(
+            collection_name=source_collection,
+            limit=page_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        # (point index, vector name, text) of the vectors to re-embed
+        inputs: list[tuple[int, str, str]] = []
+        for index, record in enumerate(records):
+            names = record.vector.keys() if isinstance(record.vector, dict) else [""]
+            for name in names:
+                text = (record.payload or {}).get(vector_fields.get(name, ""))
+                if isinstance(text, str) and text.strip():
+                    inputs.append((index, name, text))
+
+        embeddings = (
+            await embed_text(
+                [text for _, _, text in inputs],
+                embedding_model_config=profile.embedding_model_config(),
+            )
+            if inputs
+            else []
+        )
+        vectors: dict[int, dict[str, list[float]]] = {}
+        for (index, name, _), embedding in zip(inputs, embeddings, strict=True):
+            if embedding is not None:
+                vectors.setdefault(index, {})[name] = embedding.tolist()
+
+        points: list[models.PointStruct] = []
+        for index, named in vectors.items():
+            vector: models.VectorStruct = named[""] if "" in named else {**named}
+            points.append(
+                models.PointStruct(
+                    id=records[index].id, vector=vector, payload=records[index].payload
+                )
+            )
+        if points:
+            await client.upsert(target_collection, points=points)
+        copied += len(points)
+        logger.info(f"Re-embedded {copied} points into {target_collection}.")
+        if offset is None:
+            break
+    return copied
+
+
+async def reembed_collections(
+    client: AsyncQdrantClient, source: EmbeddingProfile, target: EmbeddingProfile
+) -> None:
+    """Fill the entity and text unit collections of `target` from `source`."""
+    for store_cls, vector_fields in (
+        (EntityVectorStore, ENTITY_VECTOR_FIELDS),
+        (TextUnitVectorStore, TEXT_UNIT_VECTOR_FIELDS),
+    ):
+        source_store = store_cls(client, profile=source)
+        target_store = store_cls(client, profile=target)
+        if source_store.collection_name == target_store.collection_name:
+            raise ValueError(
+                f"Profiles {source} and {target} share {source_store.collection_name}."
+            )
+        await store_cls.create_vector_store(client, profile=target)
+        await reembed_collection(
+            client,
+            source_collection=source_store.collection_name,
+            target_collection=target_store.collection_name,
+            vector_fields=vector_fields,
+            profile=target,
+        )
+
+
+async def main(source: EmbeddingProfile) -> None:
+    settings = get_settings()
+    client = AsyncQdrantClient(url=settings.qdrant.url)
+    try:
+        await reembed_collections(client, source, settings.embedding)
+    finally:
+        await client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--source",
+        default="{}",
+        help="The embedding profile of the existing collections, as JSON.",
+    )
+    args = parser.parse_args()
+    setup_logging()
+    asyncio.run(main(EmbeddingProfile.model_validate_json(args.source)))
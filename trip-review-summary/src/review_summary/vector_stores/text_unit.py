@@ -2,10 +2,23 @@ import asyncio
 import logging
 from typing import Any, Self
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 from qdrant_client import AsyncQdrantClient, models
+from qdrant_client.conversions.common_types import PointId
 
+from review_summary.config.embedding import CollectionConfig, EmbeddingProfile
+from review_summary.config.settings import get_settings
 from review_summary.models import TextUnit
+from review_summary.utils.vector import as_vector
+from review_summary.vector_stores.batching import QueryBatcher
+from review_summary.vector_stores.collection import (
+    TARGET_PAYLOAD_INDEXES,
+    PayloadIndexes,
+    create_collection,
+    migrate_collection,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -13,21 +26,62 @@ logger = logging.getLogger(__name__)
 class TextUnitVectorStore:
     COLLECTION_NAME = "review_summary_text_unit_embeddings"
 
-    def __init__(self, client: AsyncQdrantClient):
+    PAYLOAD_INDEXES: PayloadIndexes = TARGET_PAYLOAD_INDEXES
+
+    def __init__(
+        self,
+        client: AsyncQdrantClient,
+        config: CollectionConfig | None = None,
+        profile: EmbeddingProfile | None = None,
+    ):
         self.client = client
+        self.config = config or get_settings().qdrant.collection
+        self.profile = profile or get_settings().embedding
+        self.collection_name = self.profile.collection_name(self.COLLECTION_NAME)
+        self.search_params = self.config.search_params()
+        self.query_batcher = QueryBatcher(
+            client,
+            self.collection_name,
+            batch_window=self.config.query_batch_window,
+            max_batch_size=self.config.query_batch_size,
+        )
 
     @classmethod
     async def create_vector_store(
-        cls, client: AsyncQdrantClient, vector_dim: int = 3072
+        cls,
+        client: AsyncQdrantClient,
+        config: CollectionConfig | None = None,
+        profile: EmbeddingProfile | None = None,
     ) -> Self:
-        if (await client.collection_exists(cls.COLLECTION_NAME)) is False:
-            await client.create_collection(
-                collection_name=cls.COLLECTION_NAME,
-                vectors_config=models.VectorParams(
-                    size=vector_dim, distance=models.Distance.COSINE
-                ),
+        store = cls(client, config, profile)
+        if (await client.collection_exists(store.collection_name)) is False:
+            await create_collection(
+                client,
+                collection_name=store.collection_name,
+                vector_names=None,
+                vector_dim=store.profile.vector_dim,
+                payload_indexes=cls.PAYLOAD_INDEXES,
+                config=store.config,
+                datatype=store.profile.datatype,
             )
-        return cls(client)
+        return store
+
+    @classmethod
+    async def migrate(
+        cls,
+        client: AsyncQdrantClient,
+        config: CollectionConfig | None = None,
+        profile: EmbeddingProfile | None = None,
+    ) -> None:
+        """Apply the storage options and payload indexes to the existing collection."""
+        store = cls(client, config, profile)
+        await migrate_collection(
+            client,
+            collection_name=store.collection_name,
+            vector_names=None,
+            payload_indexes=cls.PAYLOAD_INDEXES,
+            config=store.config,
+        )
 
     async def save_multiple(self, text_units: list[TextUnit]) -> None:
         if len(text_units) == 0:
@@ -39,24 +93,34 @@ class TextUnitVectorStore:
             # Remove id (UUID) from payload
             text_unit_id = payload.pop("id")
             # Remove embedding from payload
-            embedding: list[float] | None = payload.pop("embedding")
+            embedding: npt.NDArray[np.float32] | None = payload.pop("embedding")
             if embedding is None:
                 logger.warning(
                     f"Skip TextUnit {text_unit_id} due to missing embedding."
                 )
                 continue
             point = models.PointStruct(
-                id=text_unit_id, vector=embedding, payload=payload
+                id=text_unit_id, vector=embedding.tolist(), payload=payload
             )
             points.append(point)
 
-        result = await self.client.upsert(self.COLLECTION_NAME, points=points)
+        result = await self.client.upsert(self.collection_name, points=points)
         logger.debug(f"Qdrant upsert result: {result}")
 
     async def find_by_target(
-        self, target_id: str, target_type: str = "attraction", limit: int = 1024
+        self,
+        target_id: str,
+        target_type: str = "attraction",
+        limit: int | None = 1024,
+        with_embedding: bool = False,
+        page_size: int = 1024,
     ) -> list[TextUnit]:
-        """Find text units (without embedding) by target ID and target type."""
+        """Find text units by target ID and target type.
+
+        Embeddings are only fetched when `with_embedding` is set. Results are
+        scrolled in pages of `page_size` until `limit` text units are collected,
+        or all text units of the target when `limit` is None.
+        """
         filter = models.Filter(
             must=[
                 models.FieldCondition(
@@ -69,14 +133,75 @@ class TextUnitVectorStore:
                 ),
             ]
         )
-        records, _ = await self.client.scroll(
-            collection_name=self.COLLECTION_NAME, scroll_filter=filter, limit=limit
+        text_units: list[TextUnit] = []
+        offset: PointId | None = None
+        while limit is None or len(text_units) < limit:
+            records, offset = await self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=filter,
+                limit=(
+                    page_size
+                    if limit is None
+                    else min(page_size, limit - len(text_units))
+                ),
+                offset=offset,
+                with_vectors=with_embedding,
+            )
+            text_units.extend(
+                TextUnit.from_store(
+                    {
+                        "id": record.id,
+                        **(record.payload or {}),
+                        "embedding": as_vector(record.vector)
+                        if with_embedding
+                        else None,
+                    }
+                )
+                for record in records
+            )
+            if offset is None:
+                break
+        return text_units
+
+    async def retrieve_by_ids(
+        self,
+        text_unit_ids: list[str],
+        payload_fields: list[str] | None = None,
+        with_embedding: bool = False,
+    ) -> list[TextUnit]:
+        """Retrieve text units by their IDs, in the order of `text_unit_ids`.
+
+        Only the payload keys in `payload_fields` are fetched when it is given,
+        missing IDs are skipped.
+        """
+        if len(text_unit_ids) == 0:
+            return []
+
+        with_payload: bool | models.PayloadSelectorInclude = True
+        if payload_fields is not None:
+            with_payload = models.PayloadSelectorInclude(include=payload_fields)
+        records = await self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=list(dict.fromkeys(text_unit_ids)),
+            with_payload=with_payload,
+            with_vectors=with_embedding,
         )
-        text_units: list[TextUnit] = [
-            TextUnit.model_validate({"id": record.id, **(record.payload or {})})
+        text_units = {
+            str(record.id): TextUnit.from_store(
+                {
+                    "id": record.id,
+                    "text": "",
+                    **(record.payload or {}),
+                    "embedding": as_vector(record.vector) if with_embedding else None,
+                }
+            )
             for record in records
+        }
+        return [
+            text_units[text_unit_id]
+            for text_unit_id in dict.fromkeys(text_unit_ids)
+            if text_unit_id in text_units
         ]
-        return text_units
 
     async def search_by_vector(
         self,
@@ -85,27 +210,30 @@ class TextUnitVectorStore:
         target_type: str = "attraction",
         top_k: int = 10,
     ) -> list[TextUnit]:
-        response = await self.client.query_points(
-            collection_name=self.COLLECTION_NAME,
-            query=embedding_vector,
-            query_filter=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="attributes.target_id",
-                        match=models.MatchValue(value=target_id),
-                    ),
-                    models.FieldCondition(
-                        key="attributes.target_type",
-                        match=models.MatchValue(value=target_type),
-                    ),
-                ]
-            ),
-            limit=top_k,
+        points = await self.query_batcher.query(
+            models.QueryRequest(
+                query=embedding_vector,
+                filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key="attributes.target_id",
+                            match=models.MatchValue(value=target_id),
+                        ),
+                        models.FieldCondition(
+                            key="attributes.target_type",
+                            match=models.MatchValue(value=target_type),
+                        ),
+                    ]
+                ),
+                limit=top_k,
+                params=self.search_params,
+                with_payload=True,
+            )
         )
         # Convert response to list of TextUnit
         text_units: list[TextUnit] = [
-            TextUnit.model_validate({"id": point.id, **(point.payload or {})})
-            for point in response.points
+            TextUnit.from_store({"id": point.id, **(point.payload or {})})
+            for point in points
         ]
         return text_units
 
@@ -144,7 +272,7 @@ class TextUnitVectorStore:
         tasks = [
             asyncio.create_task(
                 self.client.set_payload(
-                    collection_name=self.COLLECTION_NAME,
+                    collection_name=self.collection_name,
                     payload=payload,
                     points=[text_unit_id],
                 )
@@ -5,6 +5,9 @@ import pytest
 from pytest_mock import MockerFixture, MockType
 from qdrant_client import AsyncQdrantClient
 
+from review_summary.config.index.collect_text_units_config import (
+    CollectTextUnitsConfig,
+)
 from review_summary.index.tasks.collect_text_units import _internal  # pyright: ignore
 from review_summary.models import TextUnit
 from review_summary.vector_stores.text_unit import TextUnitVectorStore
@@ -39,9 +42,7 @@ async def test_collect_text_units(
 
     # Pre-save text units to the vector store
     qdrant_client = AsyncQdrantClient(":memory:")
-    vector_store = await TextUnitVectorStore.create_vector_store(
-        client=qdrant_client, vector_dim=3072
-    )
+    vector_store = await TextUnitVectorStore.create_vector_store(client=qdrant_client)
     await vector_store.save_multiple(text_units)
 
     mock_task_update_state: MockType = mock_task.update_state
@@ -49,7 +50,7 @@ async def test_collect_text_units(
 
     try:
         context = {"target_id": "attraction-001", "target_type": "attraction"}
-        await _internal(mock_task, context, vector_store)
+        await _internal(mock_task, context, CollectTextUnitsConfig(), vector_store)
 
     finally:
         await qdrant_client.close()
@@ -82,3 +83,40 @@ async def test_collect_text_units(
     for i, unit in enumerate(text_units):
         assert df.iloc[i]["id"] == unit.id
         assert df.iloc[i]["text"] == unit.text
+
+
+@pytest.mark.asyncio
+async def test_collect_text_units_samples_all_text_units(
+    mock_task: MockType,
+    text_units_parquet_uuid: str,
+    text_units: list[TextUnit],
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch(
+        "review_summary.index.tasks.collect_text_units.uuid7",
+        return_value=text_units_parquet_uuid,
+    )
+    write_checkpoint = mocker.patch(
+        "review_summary.index.tasks.collect_text_units.write_checkpoint"
+    )
+
+    qdrant_client = AsyncQdrantClient(":memory:")
+    vector_store = await TextUnitVectorStore.create_vector_store(client=qdrant_client)
+    await vector_store.save_multiple(text_units)
+    find_by_target = mocker.spy(vector_store, "find_by_target")
+
+    try:
+        context = {"target_id": "attraction-001", "target_type": "attraction"}
+        config = CollectTextUnitsConfig(
+            max_text_units=3, dedup_enabled=False, sampling_enabled=True
+        )
+        await _internal(mock_task, context, config, vector_store)
+
+    finally:
+        await qdrant_client.close()
+
+    # Every text unit is clustered, max_text_units bounds the sample
+    assert find_by_target.call_args.kwargs["limit"] is None
+    [df, _] = write_checkpoint.call_args.args
+    assert len(df) == 3
+    assert set(df["id"]) <= {unit.id for unit in text_units}
@@ -37,9 +37,7 @@ async def test_create_final_text_units(
 
     # Pre-save text units to the vector store
     qdrant_client = AsyncQdrantClient(":memory:")
-    vector_store = await TextUnitVectorStore.create_vector_store(
-        client=qdrant_client, vector_dim=3072
-    )
+    vector_store = await TextUnitVectorStore.create_vector_store(client=qdrant_client)
     await vector_store.save_multiple(text_units)
 
     mock_task_update_state: MockType = mock_task.update_state
@@ -26,9 +26,7 @@ async def qdrant_client() -> AsyncQdrantClient:
 @pytest_asyncio.fixture
 async def entity_vector_store(qdrant_client: AsyncQdrantClient) -> EntityVectorStore:
     """Create an EntityVectorStore with in-memory client."""
-    return await EntityVectorStore.create_vector_store(
-        client=qdrant_client, vector_dim=3072
-    )
+    return await EntityVectorStore.create_vector_store(client=qdrant_client)
 
 
 @pytest.mark.asyncio
@@ -74,7 +72,6 @@ async def test_create_text_embeddings(
             "target_id": "attraction-001",
             "target_type": "attraction",
             "entities": f"entities_{final_graph_parquet_uuid}.parquet",
-            "vector_dim": 3072,
         }
         config = CreateTextEmbeddingsConfig(
             embedding_llm_config={"model": "text-embedding-3-large"},
@@ -147,7 +144,6 @@ async def test_create_text_embeddings_with_multiple_fields(
             "target_id": "attraction-001",
             "target_type": "attraction",
             "entities": f"entities_{final_graph_parquet_uuid}.parquet",
-            "vector_dim": 3072,
         }
         config = CreateTextEmbeddingsConfig(
             embedding_llm_config={"model": "text-embedding-3-large"},
@@ -189,7 +185,6 @@ async def test_create_text_embeddings_empty_entities(
         context = {
             "target_id": "attraction-001",
             "target_type": "attraction",
-            "vector_dim": 3072,
         }
         config = CreateTextEmbeddingsConfig(
             embedding_llm_config={"model": "text-embedding-3-large"},
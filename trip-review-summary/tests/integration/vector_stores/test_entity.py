@@ -5,6 +5,7 @@ from pathlib import Path
 import pandas as pd
 import pytest
 import pytest_asyncio
+from pytest_mock import MockerFixture
 from qdrant_client import AsyncQdrantClient
 
 from review_summary.models import Entity
@@ -21,9 +22,7 @@ async def qdrant_client() -> AsyncQdrantClient:
 @pytest_asyncio.fixture
 async def vector_store(qdrant_client: AsyncQdrantClient) -> EntityVectorStore:
     """Create an EntityVectorStore with in-memory client."""
-    return await EntityVectorStore.create_vector_store(
-        client=qdrant_client, vector_dim=3072
-    )
+    return await EntityVectorStore.create_vector_store(client=qdrant_client)
 
 
 @pytest.fixture
@@ -48,7 +47,7 @@ async def test_save_multiple_success(
 
     # Search should return results
     results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="attraction-001",
         target_type="attraction",
         top_k=10,
@@ -78,7 +77,7 @@ async def test_save_multiple_preserves_attributes(
     assert query_embedding is not None
 
     results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="attraction-001",
         target_type="attraction",
         top_k=1,
@@ -114,7 +113,7 @@ async def test_search_by_vector_success(
     target_id = "attraction-001"
     target_type = "attraction"
     results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id=target_id,
         target_type=target_type,
         top_k=5,
@@ -148,7 +147,7 @@ async def test_search_by_vector_respects_top_k(
     # Test different top_k values
     for top_k in [1, 3, 5, 10]:
         results = await vector_store.search_by_vector(
-            embedding_vector=query_embedding,
+            embedding_vector=query_embedding.tolist(),
             target_id="attraction-001",
             target_type="attraction",
             top_k=top_k,
@@ -178,7 +177,7 @@ async def test_search_by_vector_filters_by_target(
 
     # Search for attraction entities only
     attraction_results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="attraction-001",
         target_type="attraction",
         top_k=1024,
@@ -193,7 +192,7 @@ async def test_search_by_vector_filters_by_target(
 
     # Search for hotel entities only
     hotel_results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="hotel-001",
         target_type="hotel",
         top_k=10,
@@ -220,7 +219,7 @@ async def test_search_by_vector_empty_results(
 
     # Search for non-existent target
     results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="nonexistent-id",
         target_type="attraction",
         top_k=10,
@@ -243,7 +242,7 @@ async def test_search_by_vector_ordering(
 
     # Search by vector
     results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="attraction-001",
         target_type="attraction",
         top_k=10,
@@ -268,7 +267,7 @@ async def test_search_by_vector_no_embeddings_in_results(
 
     # Search by vector
     results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="attraction-001",
         target_type="attraction",
         top_k=5,
@@ -304,7 +303,7 @@ async def test_save_multiple_upsert_behavior(
     assert query_embedding is not None
 
     results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="attraction-001",
         target_type="attraction",
         top_k=1024,
@@ -341,7 +340,7 @@ async def test_search_by_vector_mixed_targets(
 
     # Search for attractions
     attraction_results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="attraction-001",
         target_type="attraction",
         top_k=10,
@@ -349,7 +348,7 @@ async def test_search_by_vector_mixed_targets(
 
     # Search for hotels
     hotel_results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="hotel-001",
         target_type="hotel",
         top_k=10,
@@ -363,3 +362,105 @@ async def test_search_by_vector_mixed_targets(
     # Verify counts
     assert len(attraction_results) <= 5
     assert len(hotel_results) == min(10, len(entities) - 5)
+
+
+@pytest.mark.asyncio
+async def test_get_index_version_returns_latest(
+    vector_store: EntityVectorStore, entities: list[Entity]
+) -> None:
+    """Test that get_index_version returns the latest version of a target."""
+    assert await vector_store.get_index_version("attraction-001") is None
+
+    versioned: list[Entity] = []
+    for index, entity in enumerate(entities[:3]):
+        attributes = {**(entity.attributes or {}), "index_version": 100 + index}
+        versioned.append(entity.model_copy(update={"attributes": attributes}))
+    await vector_store.save_multiple(versioned)
+
+    assert await vector_store.get_index_version("attraction-001") == 102
+    assert await vector_store.get_index_version("attraction-999") is None
+
+
+@pytest.mark.asyncio
+async def test_create_vector_store_adds_missing_payload_indexes(
+    qdrant_client: AsyncQdrantClient, mocker: MockerFixture
+) -> None:
+    """Test that an existing collection gets the payload indexes it lacks."""
+    store = await EntityVectorStore.create_vector_store(client=qdrant_client)
+    create_payload_index = mocker.spy(qdrant_client, "create_payload_index")
+
+    await EntityVectorStore.create_vector_store(client=qdrant_client)
+
+    # Local mode keeps no payload schema, so every index is requested again
+    indexed_fields = {
+        call.kwargs["field_name"] for call in create_payload_index.call_args_list
+    }
+    assert EntityVectorStore.INDEX_VERSION_KEY in indexed_fields
+    assert all(
+        call.kwargs["collection_name"] == store.collection_name
+        for call in create_payload_index.call_args_list
+    )
+
+
+@pytest.mark.asyncio
+async def test_find_by_target_filters_index_version(
+    vector_store: EntityVectorStore, entities: list[Entity]
+) -> None:
+    """Test that find_by_target pages over a target and filters by version."""
+    versioned: list[Entity] = []
+    for index, entity in enumerate(entities):
+        attributes = {**(entity.attributes or {}), "index_version": 1 + index % 2}
+        versioned.append(entity.model_copy(update={"attributes": attributes}))
+    await vector_store.save_multiple(versioned)
+
+    all_entities = await vector_store.find_by_target("attraction-001", page_size=2)
+    latest = await vector_store.find_by_target(
+        "attraction-001", index_version=2, with_embedding=True
+    )
+
+    assert len(all_entities) == len(entities)
+    assert all(entity.description_embedding is None for entity in all_entities)
+    assert len(latest) == len(entities) // 2
+    for entity in latest:
+        assert entity.description_embedding is not None
+        assert len(entity.description_embedding) == 3072
+        assert entity.title_embedding is None
+
+
+@pytest.mark.asyncio
+async def test_search_fused_matches_titles(
+    vector_store: EntityVectorStore, entities: list[Entity]
+) -> None:
+    """Test that search_fused ranks entities by description and title vectors."""
+    query_embedding = entities[0].description_embedding
+    assert query_embedding is not None
+    titled = entities[1].model_copy(update={"title_embedding": query_embedding})
+    await vector_store.save_multiple([entities[0], titled, *entities[2:]])
+
+    rrf_results = await vector_store.search_fused(
+        embedding_vector=query_embedding.tolist(), target_id="attraction-001", top_k=2
+    )
+    by_title = await vector_store.search_fused(
+        embedding_vector=query_embedding.tolist(),
+        target_id="attraction-001",
+        top_k=2,
+        fusion="weighted",
+        title_weight=1.0,
+    )
+    by_description = await vector_store.search_fused(
+        embedding_vector=query_embedding.tolist(),
+        target_id="attraction-001",
+        top_k=2,
+        fusion="weighted",
+        title_weight=0.0,
+    )
+
+    assert {entity.id for entity in rrf_results} == {entities[0].id, entities[1].id}
+    assert by_title[0].id == entities[1].id
+    assert by_description[0].id == entities[0].id
+    assert (
+        await vector_store.search_fused(
+            embedding_vector=query_embedding.tolist(), target_id="attraction-999"
+        )
+        == []
+    )
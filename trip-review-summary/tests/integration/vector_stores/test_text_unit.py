@@ -21,9 +21,7 @@ async def qdrant_client() -> AsyncQdrantClient:
 @pytest_asyncio.fixture
 async def vector_store(qdrant_client: AsyncQdrantClient) -> TextUnitVectorStore:
     """Create a TextUnitVectorStore with in-memory client."""
-    return await TextUnitVectorStore.create_vector_store(
-        client=qdrant_client, vector_dim=3072
-    )
+    return await TextUnitVectorStore.create_vector_store(client=qdrant_client)
 
 
 @pytest.fixture
@@ -272,7 +270,7 @@ async def test_search_by_vector_success(
     target_id = "attraction-001"
     target_type = "attraction"
     results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id=target_id,
         target_type=target_type,
         top_k=5,
@@ -306,7 +304,7 @@ async def test_search_by_vector_respects_top_k(
     # Test different top_k values
     for top_k in [1, 3, 5, 10]:
         results = await vector_store.search_by_vector(
-            embedding_vector=query_embedding,
+            embedding_vector=query_embedding.tolist(),
             target_id="attraction-001",
             target_type="attraction",
             top_k=top_k,
@@ -336,7 +334,7 @@ async def test_search_by_vector_filters_by_target(
 
     # Search for attraction units only
     attraction_results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="attraction-001",
         target_type="attraction",
         top_k=10,
@@ -351,7 +349,7 @@ async def test_search_by_vector_filters_by_target(
 
     # Search for hotel units only
     hotel_results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="hotel-001",
         target_type="hotel",
         top_k=10,
@@ -378,7 +376,7 @@ async def test_search_by_vector_empty_results(
 
     # Search for non-existent target
     results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="nonexistent-id",
         target_type="attraction",
         top_k=10,
@@ -401,7 +399,7 @@ async def test_search_by_vector_ordering(
 
     # Search by vector
     results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="attraction-001",
         target_type="attraction",
         top_k=10,
@@ -426,7 +424,7 @@ async def test_search_by_vector_no_embedding_in_results(
 
     # Search by vector
     results = await vector_store.search_by_vector(
-        embedding_vector=query_embedding,
+        embedding_vector=query_embedding.tolist(),
         target_id="attraction-001",
         target_type="attraction",
         top_k=5,
@@ -435,3 +433,49 @@ async def test_search_by_vector_no_embedding_in_results(
     # Results should not include embeddings
     for unit in results:
         assert unit.embedding is None
+
+
+@pytest.mark.asyncio
+async def test_find_by_target_paginates_with_embedding(
+    vector_store: TextUnitVectorStore, text_units: list[TextUnit]
+) -> None:
+    """Test that find_by_target scrolls over pages and returns embeddings."""
+    await vector_store.save_multiple(text_units)
+
+    retrieved = await vector_store.find_by_target(
+        target_id="attraction-001",
+        target_type="attraction",
+        limit=len(text_units) - 1,
+        with_embedding=True,
+        page_size=2,
+    )
+
+    assert len(retrieved) == len(text_units) - 1
+    for unit in retrieved:
+        assert unit.embedding is not None
+        assert len(unit.embedding) == 3072
+
+
+@pytest.mark.asyncio
+async def test_retrieve_by_ids_selects_payload(
+    vector_store: TextUnitVectorStore, text_units: list[TextUnit]
+) -> None:
+    """Test that retrieve_by_ids keeps the requested order and payload keys."""
+    await vector_store.save_multiple(text_units)
+    ids = [text_units[2].id, text_units[0].id, "00000000-0000-0000-0000-000000000000"]
+
+    retrieved = await vector_store.retrieve_by_ids(
+        ids + [text_units[0].id], payload_fields=["text", "attributes"]
+    )
+
+    assert [unit.id for unit in retrieved] == ids[:2]
+    assert retrieved[0].text == text_units[2].text
+    assert retrieved[0].attributes == text_units[2].attributes
+    assert retrieved[0].n_tokens is None
+    assert retrieved[0].embedding is None
+
+
+@pytest.mark.asyncio
+async def test_retrieve_by_ids_empty(vector_store: TextUnitVectorStore) -> None:
+    """Test that retrieve_by_ids returns nothing for no IDs."""
+    assert await vector_store.retrieve_by_ids([]) == []
@@ -0,0 +1,151 @@
+"""Unit tests for streaming answers from the A2A agent executor."""
+
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture, MockType
+
+from review_summary.agent.executor import A2aAgentExecutor, ArtifactStreamer
+from review_summary.query.base import SearchResult
+
+
+@pytest.fixture
+def updater(mocker: MockerFixture) -> MockType:
+    updater: MockType = mocker.MagicMock()
+    updater.add_artifact = mocker.AsyncMock()
+    updater.complete = mocker.AsyncMock()
+    updater.update_status = mocker.AsyncMock()
+    return updater
+
+
+def _chunks(updater: MockType) -> list[dict[str, Any]]:
+    return [
+        {
+            "text": call.kwargs["parts"][0].root.text,
+            "append": call.kwargs["append"],
+            "last_chunk": call.kwargs["last_chunk"],
+            "metadata": call.kwargs["metadata"],
+        }
+        for call in updater.add_artifact.await_args_list
+    ]
+
+
+def _result(response: str) -> SearchResult:
+    return SearchResult(
+        response=response,
+        context_data={},
+        context_text="",
+        completion_time=0.5,
+        llm_calls=1,
+        prompt_tokens=10,
+        output_tokens=3,
+    )
+
+
+class TestArtifactStreamer:
+    """Test suite for ArtifactStreamer."""
+
+    @pytest.mark.asyncio
+    async def test_flushes_every_n_tokens(self, updater: MockType) -> None:
+        streamer = ArtifactStreamer(updater, flush_tokens=2, flush_interval=60)
+
+        for token in ["a", "b", "c"]:
+            await streamer.on_token(token)
+        await streamer.close({"output_tokens": 3})
+
+        assert _chunks(updater) == [
+            {"text": "ab", "append": False, "last_chunk": False, "metadata": None},
+            {
+                "text": "c",
+                "append": True,
+                "last_chunk": True,
+                "metadata": {"output_tokens": 3},
+            },
+        ]
+        artifact_ids = {
+            call.kwargs["artifact_id"] for call in updater.add_artifact.await_args_list
+        }
+        assert artifact_ids == {streamer.artifact_id}
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_interval(self, updater: MockType) -> None:
+        streamer = ArtifactStreamer(updater, flush_tokens=100, flush_interval=0)
+
+        await streamer.on_token("first")
+
+        assert _chunks(updater)[0]["text"] == "first"
+
+
+class TestHandleSuccess:
+    """Test suite for completing streamed and buffered answers."""
+
+    @pytest.fixture
+    def executor(self, mocker: MockerFixture) -> A2aAgentExecutor:
+        return A2aAgentExecutor(
+            neo4j_driver=mocker.MagicMock(), qdrant_client=mocker.MagicMock()
+        )
+
+    @pytest.mark.asyncio
+    async def test_streamed_answer_ends_with_metadata(
+        self, executor: A2aAgentExecutor, updater: MockType
+    ) -> None:
+        streamer = ArtifactStreamer(updater, flush_tokens=100, flush_interval=60)
+        await streamer.on_token("Worth visiting")
+
+        await executor._handle_success(  # pyright: ignore[reportPrivateUsage]
+            _result("Worth visiting"), updater, streamer
+        )
+
+        chunks = _chunks(updater)
+        assert len(chunks) == 1
+        assert chunks[0]["text"] == "Worth visiting"
+        assert chunks[0]["last_chunk"] is True
+        assert chunks[0]["metadata"]["output_tokens"] == 3
+        updater.complete.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unstreamed_answer_is_one_artifact(
+        self, executor: A2aAgentExecutor, updater: MockType
+    ) -> None:
+        streamer = ArtifactStreamer(updater)
+
+        await executor._handle_success(  # pyright: ignore[reportPrivateUsage]
+            _result("Worth visiting"), updater, streamer
+        )
+
+        updater.add_artifact.assert_awaited_once()
+        assert (
+            updater.add_artifact.await_args.kwargs["parts"][0].root.text
+            == "Worth visiting"
+        )
+
+
+class TestExecuteSearch:
+    """Test suite for failing tasks whose answer could not be generated."""
+
+    @pytest.mark.asyncio
+    async def test_failed_stream_fails_task(
+        self, mocker: MockerFixture, updater: MockType
+    ) -> None:
+        executor = A2aAgentExecutor(
+            neo4j_driver=mocker.MagicMock(), qdrant_client=mocker.MagicMock()
+        )
+        updater.context_id, updater.task_id = "context-1", "task-1"
+        streamer = ArtifactStreamer(updater, flush_tokens=1)
+
+        async def _search(**kwargs: Any) -> SearchResult:
+            # The stream breaks after its first chunk
+            await kwargs["on_token"]("Worth ")
+            return _result("")
+
+        search = mocker.MagicMock()
+        search.search = mocker.AsyncMock(side_effect=_search)
+        mocker.patch.object(executor, "_init_search_engine", return_value=search)
+
+        with pytest.raises(RuntimeError):
+            await executor._execute_search(  # pyright: ignore[reportPrivateUsage]
+                "Is it worth visiting?", "a1", updater, streamer
+            )
+
+        assert _chunks(updater)[0]["last_chunk"] is False
+        updater.complete.assert_not_awaited()
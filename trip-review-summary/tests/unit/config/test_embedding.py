@@ -0,0 +1,38 @@
+"""Unit tests for the embedding profile."""
+
+import pytest
+from qdrant_client import models
+
+from review_summary.config.embedding import EmbeddingProfile
+
+
+class TestEmbeddingProfile:
+    """Test suite for EmbeddingProfile."""
+
+    def test_default_profile_keeps_collection_name(self) -> None:
+        profile = EmbeddingProfile()
+
+        assert profile.vector_dim == 3072
+        assert profile.embedding_model_config() == {"model": "text-embedding-3-large"}
+        assert profile.collection_name("entities") == "entities"
+        assert EmbeddingProfile(dimensions=3072).collection_name("entities") == (
+            "entities"
+        )
+
+    def test_reduced_profile(self) -> None:
+        profile = EmbeddingProfile(dimensions=256, dtype="float16")
+
+        assert profile.vector_dim == 256
+        assert profile.datatype == models.Datatype.FLOAT16
+        assert profile.embedding_model_config() == {
+            "model": "text-embedding-3-large",
+            "dimensions": 256,
+        }
+        assert profile.collection_name("entities") == (
+            "entities_text_embedding_3_large_256_float16"
+        )
+
+    def test_unknown_model_requires_dimensions(self) -> None:
+        with pytest.raises(ValueError):
+            _ = EmbeddingProfile(model="custom-embedding").vector_dim
+        assert EmbeddingProfile(model="custom", dimensions=8).vector_dim == 8
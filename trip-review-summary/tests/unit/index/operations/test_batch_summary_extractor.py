@@ -0,0 +1,135 @@
+"""Unit tests for batched description summarization."""
+
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture, MockType
+
+from review_summary.index.operations.summarize_descriptions.batch_summary_extractor import (  # noqa: E501
+    BatchSummaryExtractor,
+    SummaryItemId,
+    create_summary_batches,
+)
+from review_summary.tokenizer.tokenizer import Tokenizer
+
+
+class WhitespaceTokenizer(Tokenizer):
+    """Offline tokenizer counting one token per word."""
+
+    def encode(self, text: str) -> list[int]:
+        return [len(word) for word in text.split()]
+
+    def decode(self, tokens: list[int]) -> str:
+        return " ".join("x" * token for token in tokens)
+
+
+ITEMS: list[tuple[SummaryItemId, list[str]]] = [
+    ("TRON", ["A fast roller coaster.", "Long queues."]),
+    (("TRON", "TOMORROWLAND"), ["TRON is located in Tomorrowland."]),
+    ("PEPPA PIG", ["A ride for young children."]),
+]
+
+
+def _response(*names: list[str]) -> dict[str, Any]:
+    return {
+        "summaries": [
+            {"name": name, "description": f"Summary of {'/'.join(name)}"}
+            for name in names
+        ]
+    }
+
+
+@pytest.fixture
+def structured_model(mocker: MockerFixture) -> MockType:
+    structured_model: MockType = mocker.MagicMock()
+    return structured_model
+
+
+@pytest.fixture
+def extractor(
+    mocker: MockerFixture, structured_model: MockType
+) -> BatchSummaryExtractor:
+    chat_model = mocker.MagicMock()
+    chat_model.with_structured_output.return_value = structured_model
+    return BatchSummaryExtractor(
+        chat_model=chat_model, max_summary_length=50, max_retries=1
+    )
+
+
+class TestCreateSummaryBatches:
+    """Test suite for packing summary items into batches."""
+
+    def test_respects_batch_size(self) -> None:
+        batches = create_summary_batches(
+            ITEMS, WhitespaceTokenizer(), max_batch_tokens=1000, max_batch_size=2
+        )
+        assert [len(batch) for batch in batches] == [2, 1]
+
+    def test_respects_token_budget(self) -> None:
+        batches = create_summary_batches(
+            ITEMS, WhitespaceTokenizer(), max_batch_tokens=12, max_batch_size=10
+        )
+        assert [len(batch) for batch in batches] == [1, 1, 1]
+        assert [item for batch in batches for item in batch] == ITEMS
+
+
+class TestBatchSummaryExtractor:
+    """Test suite for BatchSummaryExtractor."""
+
+    @pytest.mark.asyncio
+    async def test_summarizes_all_items_in_one_call(
+        self,
+        mocker: MockerFixture,
+        extractor: BatchSummaryExtractor,
+        structured_model: MockType,
+    ) -> None:
+        structured_model.ainvoke = mocker.AsyncMock(
+            return_value=_response(["TRON"], ["TRON", "TOMORROWLAND"], ["PEPPA PIG"])
+        )
+
+        results, missing = await extractor(ITEMS)
+
+        assert missing == []
+        assert structured_model.ainvoke.await_count == 1
+        assert {result.id: result.description for result in results} == {
+            "TRON": "Summary of TRON",
+            ("TRON", "TOMORROWLAND"): "Summary of TRON/TOMORROWLAND",
+            "PEPPA PIG": "Summary of PEPPA PIG",
+        }
+
+    @pytest.mark.asyncio
+    async def test_retries_missing_items(
+        self,
+        mocker: MockerFixture,
+        extractor: BatchSummaryExtractor,
+        structured_model: MockType,
+    ) -> None:
+        structured_model.ainvoke = mocker.AsyncMock(
+            side_effect=[
+                _response(["TRON"], ["UNKNOWN"]),
+                _response(["PEPPA PIG"]),
+            ]
+        )
+
+        results, missing = await extractor(ITEMS)
+
+        assert structured_model.ainvoke.await_count == 2
+        retry_prompt: str = structured_model.ainvoke.await_args_list[1].args[0]
+        assert "PEPPA PIG" in retry_prompt
+        assert '"name": ["TRON"]' not in retry_prompt
+        assert {result.id for result in results} == {"TRON", "PEPPA PIG"}
+        assert missing == [ITEMS[1]]
+
+    @pytest.mark.asyncio
+    async def test_invalid_response_leaves_items_missing(
+        self,
+        mocker: MockerFixture,
+        extractor: BatchSummaryExtractor,
+        structured_model: MockType,
+    ) -> None:
+        structured_model.ainvoke = mocker.AsyncMock(return_value={"unexpected": []})
+
+        results, missing = await extractor(ITEMS)
+
+        assert results == []
+        assert missing == ITEMS
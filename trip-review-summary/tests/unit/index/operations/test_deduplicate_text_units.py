@@ -0,0 +1,104 @@
+"""Unit tests for near-duplicate text unit filtering."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from review_summary.index.operations.deduplicate_text_units import (
+    compute_minhash_signatures,
+    deduplicate_text_units,
+    find_near_duplicates,
+)
+
+REVIEW = (
+    "The TRON Lightcycle Power Run is a high-speed roller coaster located in "
+    "the heart of Tomorrowland. The launch sequence is intense, and the "
+    "futuristic visual effects are stunning, but the standby wait reached "
+    "90 minutes by noon."
+)
+
+
+@pytest.fixture
+def text_units() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": ["tu-0", "tu-1", "tu-2", "tu-3"],
+            "text": [
+                REVIEW,
+                "Roaring Rapids involves getting wet, so bring a raincoat.",
+                REVIEW.upper(),  # Copy-pasted review with different casing
+                REVIEW + " Highly recommended!",  # Near-duplicate spam
+            ],
+            "attributes": [
+                {"target_id": "attraction-001", "target_type": "attraction"}
+                for _ in range(4)
+            ],
+        }
+    )
+
+
+class TestComputeMinhashSignatures:
+    """Test suite for compute_minhash_signatures function."""
+
+    def test_identical_texts_have_identical_signatures(self) -> None:
+        signatures = compute_minhash_signatures([REVIEW, REVIEW], num_perm=64)
+        assert signatures.shape == (2, 64)
+        assert np.array_equal(signatures[0], signatures[1])
+
+    def test_signatures_are_deterministic(self) -> None:
+        first = compute_minhash_signatures([REVIEW], num_perm=32, seed=7)
+        second = compute_minhash_signatures([REVIEW], num_perm=32, seed=7)
+        assert np.array_equal(first, second)
+
+
+class TestFindNearDuplicates:
+    """Test suite for find_near_duplicates function."""
+
+    def test_invalid_band_count(self) -> None:
+        signatures = compute_minhash_signatures([REVIEW], num_perm=64)
+        with pytest.raises(ValueError):
+            find_near_duplicates(signatures, num_bands=10)
+
+    def test_lowest_index_is_representative(self) -> None:
+        signatures = compute_minhash_signatures(
+            ["unrelated text about food", REVIEW, REVIEW], num_perm=64
+        )
+        assert find_near_duplicates(signatures, num_bands=16) == {2: 1}
+
+    def test_duplicates_not_matching_bucket_head(self) -> None:
+        # The rows share the first band only, rows 1 and 2 match on 5 of 8 values
+        signatures = np.asarray(
+            [
+                [1, 1, 2, 2, 3, 3, 4, 4],
+                [1, 1, 10, 11, 12, 13, 14, 15],
+                [1, 1, 10, 20, 12, 21, 14, 22],
+            ],
+            dtype=np.uint64,
+        )
+        assert find_near_duplicates(signatures, num_bands=4, threshold=0.6) == {2: 1}
+
+
+class TestDeduplicateTextUnits:
+    """Test suite for deduplicate_text_units function."""
+
+    def test_drops_duplicates_and_keeps_provenance(
+        self, text_units: pd.DataFrame
+    ) -> None:
+        result = deduplicate_text_units(text_units, threshold=0.8)
+
+        assert result["id"].tolist() == ["tu-0", "tu-1"]
+        kept = result.iloc[0]["attributes"]
+        assert kept["target_id"] == "attraction-001"
+        assert sorted(kept["duplicate_ids"]) == ["tu-2", "tu-3"]
+        assert kept["duplicate_count"] == 2
+        assert result.iloc[1]["attributes"]["duplicate_ids"] == []
+
+    def test_high_threshold_only_drops_exact_copies(
+        self, text_units: pd.DataFrame
+    ) -> None:
+        result = deduplicate_text_units(text_units, threshold=1.0)
+        assert result["id"].tolist() == ["tu-0", "tu-1", "tu-3"]
+
+    def test_empty_dataframe(self) -> None:
+        empty = pd.DataFrame(columns=["id", "text", "attributes"])
+        assert len(deduplicate_text_units(empty)) == 0
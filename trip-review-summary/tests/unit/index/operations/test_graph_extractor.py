@@ -0,0 +1,116 @@
+"""Unit tests for text and structured output graph extraction."""
+
+import pytest
+from pytest_mock import MockerFixture, MockType
+
+from review_summary.index.operations.extract_graph.graph_extractor import (
+    GraphExtractor,
+)
+
+TEXT_OUTPUT = (
+    '("entity"<|>TRON<|>POI<|>TRON is a fast roller coaster)##'
+    '("entity"<|>TOMORROWLAND<|>POI<|>A themed land)##'
+    '("relationship"<|>TRON<|>TOMORROWLAND<|>TRON is in Tomorrowland<|>8)##'
+    "<|COMPLETE|>"
+)
+
+STRUCTURED_OUTPUT = {
+    "entities": [
+        {"name": "tron", "type": "poi", "description": "TRON is a fast coaster"},
+        {"name": "Tomorrowland", "type": "POI", "description": "A themed land"},
+    ],
+    "relationships": [
+        {
+            "source": "TRON",
+            "target": "TOMORROWLAND",
+            "description": "TRON is in Tomorrowland",
+            "strength": 8,
+        }
+    ],
+}
+
+
+@pytest.fixture
+def chat_model(mocker: MockerFixture) -> MockType:
+    model: MockType = mocker.MagicMock()
+    model.ainvoke = mocker.AsyncMock(return_value=mocker.MagicMock(text=TEXT_OUTPUT))
+    model.with_structured_output.return_value.ainvoke = mocker.AsyncMock(
+        return_value=STRUCTURED_OUTPUT
+    )
+    return model
+
+
+class TestGraphExtractor:
+    """Test suite for GraphExtractor."""
+
+    @pytest.mark.asyncio
+    async def test_text_mode(self, chat_model: MockType) -> None:
+        extractor = GraphExtractor(chat_model=chat_model, max_gleanings=0)
+
+        result = await extractor(["TRON review"], {"entity_types": ["POI"]})
+
+        graph = result.output
+        assert set(graph.nodes()) == {"TRON", "TOMORROWLAND"}
+        assert graph.edges["TRON", "TOMORROWLAND"]["weight"] == 8.0
+        chat_model.with_structured_output.return_value.ainvoke.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_structured_mode(self, chat_model: MockType) -> None:
+        extractor = GraphExtractor(
+            chat_model=chat_model,
+            max_gleanings=0,
+            mode="structured",
+        )
+
+        result = await extractor(["TRON review"], {"entity_types": ["POI"]})
+
+        graph = result.output
+        assert set(graph.nodes()) == {"TRON", "TOMORROWLAND"}
+        assert graph.nodes["TRON"]["type"] == "POI"
+        assert graph.nodes["TRON"]["source_id"] == "0"
+        assert graph.edges["TRON", "TOMORROWLAND"]["weight"] == 8.0
+        chat_model.ainvoke.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_structured_mode_gleans_and_merges(
+        self, mocker: MockerFixture, chat_model: MockType
+    ) -> None:
+        gleaned = {
+            "entities": [{"name": "TRON", "type": "POI", "description": "Long queue"}],
+            "relationships": [],
+        }
+        structured_model = chat_model.with_structured_output.return_value
+        structured_model.ainvoke = mocker.AsyncMock(
+            side_effect=[STRUCTURED_OUTPUT, gleaned]
+        )
+        extractor = GraphExtractor(
+            chat_model=chat_model,
+            max_gleanings=1,
+            mode="structured",
+        )
+
+        result = await extractor(["TRON review"], {"entity_types": ["POI"]})
+
+        assert structured_model.ainvoke.await_count == 2
+        assert set(result.output.nodes["TRON"]["description"].split("\n")) == {
+            "TRON is a fast coaster",
+            "Long queue",
+        }
+
+    @pytest.mark.asyncio
+    async def test_structured_mode_falls_back_to_text(
+        self, mocker: MockerFixture, chat_model: MockType
+    ) -> None:
+        chat_model.with_structured_output.return_value.ainvoke = mocker.AsyncMock(
+            return_value={"entities": "not a list"}
+        )
+        extractor = GraphExtractor(
+            chat_model=chat_model,
+            max_gleanings=0,
+            mode="structured",
+        )
+
+        result = await extractor(["TRON review"], {"entity_types": ["POI"]})
+
+        chat_model.ainvoke.assert_awaited_once()
+        assert set(result.output.nodes()) == {"TRON", "TOMORROWLAND"}
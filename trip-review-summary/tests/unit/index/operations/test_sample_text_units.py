@@ -0,0 +1,99 @@
+"""Unit tests for budgeted representative sampling of text units."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from review_summary.index.operations.sample_text_units import (
+    mini_batch_kmeans,
+    sample_text_units,
+)
+from review_summary.utils.vector import vectors_to_arrow
+
+
+def _make_text_units(cluster_sizes: list[int], dim: int = 16) -> pd.DataFrame:
+    """Create text units whose embeddings form well-separated clusters."""
+    generator = np.random.default_rng(0)
+    rows: list[dict[str, object]] = []
+    for cluster, size in enumerate(cluster_sizes):
+        center = np.zeros(dim)
+        center[cluster] = 1.0
+        for i in range(size):
+            noise = generator.normal(scale=0.01, size=dim)
+            rows.append(
+                {
+                    "id": f"tu-{cluster}-{i}",
+                    "text": f"theme {cluster} review {i}",
+                    "n_tokens": 10,
+                    "embedding": (center + noise).tolist(),
+                    "theme": cluster,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+class TestMiniBatchKmeans:
+    """Test suite for mini_batch_kmeans function."""
+
+    def test_separates_clusters(self) -> None:
+        df = _make_text_units([20, 20, 20])
+        vectors = np.asarray(df["embedding"].tolist(), dtype=np.float32)
+        centroids, labels = mini_batch_kmeans(vectors, num_clusters=3, batch_size=16)
+
+        assert centroids.shape == (3, 16)
+        # Every theme is mapped onto exactly one cluster
+        for theme in range(3):
+            assert len(set(labels[df["theme"] == theme].tolist())) == 1
+        assert len(set(labels.tolist())) == 3
+
+
+class TestSampleTextUnits:
+    """Test suite for sample_text_units function."""
+
+    def test_within_budget_is_untouched(self) -> None:
+        df = _make_text_units([3, 3])
+        result = sample_text_units(df, token_budget=1000)
+        assert len(result) == len(df)
+
+    def test_respects_budget_and_covers_themes(self) -> None:
+        df = _make_text_units([60, 30, 10])
+        result = sample_text_units(df, token_budget=200, num_clusters=3)
+
+        assert int(result["n_tokens"].sum()) <= 200
+        assert len(result) == 20
+        counts = result["theme"].value_counts().to_dict()
+        # Proportional to cluster size, without starving the small theme
+        assert set(counts) == {0, 1, 2}
+        assert counts[0] > counts[1] > counts[2]
+
+    def test_max_samples_caps_count_and_covers_themes(self) -> None:
+        df = _make_text_units([60, 30, 10])
+        result = sample_text_units(
+            df, token_budget=10_000, max_samples=20, num_clusters=3
+        )
+
+        assert len(result) == 20
+        counts = result["theme"].value_counts().to_dict()
+        assert set(counts) == {0, 1, 2}
+        assert counts[0] > counts[1] > counts[2]
+
+    def test_requires_embeddings(self) -> None:
+        df = _make_text_units([5]).assign(embedding=None)
+        with pytest.raises(ValueError):
+            sample_text_units(df, token_budget=10)
+
+    def test_reads_fixed_size_list_embeddings(self) -> None:
+        df = _make_text_units([60, 30, 10])
+        arrow_df = df.assign(
+            embedding=pd.Series(
+                pd.arrays.ArrowExtensionArray(
+                    vectors_to_arrow([*df["embedding"].tolist()[:-1], None], dim=16)
+                ),
+                index=df.index,
+            )
+        )
+
+        expected = sample_text_units(df.iloc[:-1], token_budget=200, num_clusters=3)
+        result = sample_text_units(arrow_df, token_budget=200, num_clusters=3)
+
+        assert result["id"].tolist() == expected["id"].tolist()
@@ -0,0 +1,109 @@
+"""Unit tests for tiered description summarization."""
+
+import pytest
+from pytest_mock import MockerFixture, MockType
+
+from review_summary.index.operations.summarize_descriptions.extractive_summary import (
+    extractive_summarize,
+    min_centroid_similarity,
+    split_sentences,
+)
+from review_summary.index.operations.summarize_descriptions.summary_extractor import (
+    SummaryExtractor,
+)
+from review_summary.tokenizer.tokenizer import Tokenizer
+
+
+class WhitespaceTokenizer(Tokenizer):
+    """Offline tokenizer counting one token per word."""
+
+    def encode(self, text: str) -> list[int]:
+        return [len(word) for word in text.split()]
+
+    def decode(self, tokens: list[int]) -> str:
+        return " ".join("x" * token for token in tokens)
+
+
+@pytest.fixture
+def chat_model(mocker: MockerFixture) -> MockType:
+    model: MockType = mocker.MagicMock()
+    model.ainvoke = mocker.AsyncMock(return_value=mocker.MagicMock(text="LLM summary"))
+    return model
+
+
+def _extractor(chat_model: MockType, **kwargs: object) -> SummaryExtractor:
+    return SummaryExtractor(
+        chat_model=chat_model,
+        max_summary_length=20,
+        max_input_tokens=400,
+        tiered=True,
+        extractive_max_length=200,
+        tokenizer=WhitespaceTokenizer(),
+        **kwargs,  # type: ignore
+    )
+
+
+RIDE = [
+    "TRON is a fast roller coaster in Tomorrowland.",
+    "TRON is a roller coaster with long queues in Tomorrowland.",
+    "The TRON roller coaster in Tomorrowland is fast and popular.",
+    "TRON is the most popular roller coaster in Tomorrowland.",
+]
+
+
+class TestExtractiveSummary:
+    """Test suite for the extractive summary helpers."""
+
+    def test_split_sentences_deduplicates(self) -> None:
+        assert split_sentences(["A ride. Fun!", "A ride."]) == ["A ride.", "Fun!"]
+
+    def test_extractive_summarize_respects_length(self) -> None:
+        summary = extractive_summarize(RIDE, max_length=20)
+        assert 0 < len(summary.split()) <= 20
+        assert "TRON" in summary
+
+    def test_divergent_descriptions_have_low_similarity(self) -> None:
+        similar = min_centroid_similarity(RIDE)
+        divergent = min_centroid_similarity(RIDE + ["Parking costs 200 yuan daily."])
+        assert divergent < similar
+
+
+class TestSummaryExtractor:
+    """Test suite for the tiered SummaryExtractor strategy."""
+
+    @pytest.mark.asyncio
+    async def test_short_descriptions_are_concatenated(
+        self, chat_model: MockType
+    ) -> None:
+        result = await _extractor(chat_model)(
+            id="TRON", descriptions=["A roller coaster.", "Very fast."]
+        )
+        assert result.description == "A roller coaster. Very fast."
+        chat_model.ainvoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_medium_descriptions_are_extracted(
+        self, chat_model: MockType
+    ) -> None:
+        result = await _extractor(chat_model, conflict_threshold=0.0)(
+            id="TRON", descriptions=RIDE
+        )
+        assert 0 < len(result.description.split()) <= 20
+        chat_model.ainvoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_conflicting_descriptions_use_llm(self, chat_model: MockType) -> None:
+        result = await _extractor(chat_model, conflict_threshold=0.99)(
+            id="TRON", descriptions=RIDE
+        )
+        assert result.description == "LLM summary"
+        chat_model.ainvoke.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_large_descriptions_use_single_llm_call(
+        self, chat_model: MockType
+    ) -> None:
+        descriptions = [f"Review {i} says TRON is thrilling." for i in range(100)]
+        result = await _extractor(chat_model)(id="TRON", descriptions=descriptions)
+        assert result.description == "LLM summary"
+        chat_model.ainvoke.assert_called_once()
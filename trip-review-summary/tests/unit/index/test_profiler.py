@@ -0,0 +1,130 @@
+"""Unit tests for the profiling of indexing stages."""
+
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+from celery import Task
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from pytest_mock import MockerFixture, MockType
+
+from review_summary.index.profiler import (
+    StageProfile,
+    profile_stage,
+    record,
+    update_progress,
+)
+
+
+@pytest.fixture
+def task(mocker: MockerFixture) -> MockType:
+    task: MockType = mocker.MagicMock(spec=Task)
+    task.request.id = "task-1"
+    return task
+
+
+def _answer(input_tokens: int, output_tokens: int, cache_read: int) -> AIMessage:
+    return AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "input_token_details": {"cache_read": cache_read},
+        },
+    )
+
+
+class TestProfileStage:
+    """Test suite for profile_stage."""
+
+    def test_appends_profile_to_context(self, task: MockType) -> None:
+        context: dict[str, Any] = {"task_id": "run-1"}
+
+        with profile_stage(task, context, "collect_text_units"):
+            record(rows_in=10, rows_out=8, bytes_written=2048)
+
+        [profile] = context["profile"]
+        assert profile["stage"] == "collect_text_units"
+        assert profile["rows_in"] == 10
+        assert profile["rows_out"] == 8
+        assert profile["bytes_written"] == 2048
+        assert profile["wall_time"] >= 0
+        task.update_state.assert_called_with(
+            task_id="run-1",
+            state="PROGRESS",
+            meta={"stage": None, "profile": context["profile"]},
+        )
+
+    def test_last_task_reports_only_its_start(self, task: MockType) -> None:
+        context: dict[str, Any] = {"task_id": "task-1", "profile": []}
+
+        with profile_stage(task, context, "create_text_embeddings"):
+            pass
+
+        task.update_state.assert_called_once_with(
+            task_id="task-1",
+            state="PROGRESS",
+            meta={"stage": "create_text_embeddings", "profile": []},
+        )
+
+    def test_last_task_progress_keeps_profiles(self, task: MockType) -> None:
+        context: dict[str, Any] = {"task_id": "task-1", "profile": [{"stage": "a"}]}
+
+        with profile_stage(task, context, "create_text_embeddings"):
+            update_progress(task, context, {"description": "Embedded entities."})
+
+        task.update_state.assert_called_with(
+            state="PROGRESS",
+            meta={
+                "description": "Embedded entities.",
+                "stage": "create_text_embeddings",
+                "profile": [{"stage": "a"}],
+            },
+        )
+
+    def test_other_task_progress_is_its_own(self, task: MockType) -> None:
+        context: dict[str, Any] = {"task_id": "run-1"}
+
+        update_progress(task, context, {"description": "Collected."})
+
+        task.update_state.assert_called_once_with(
+            state="PROGRESS", meta={"description": "Collected."}
+        )
+
+    def test_counts_chat_model_usage(self, task: MockType) -> None:
+        chat_model = GenericFakeChatModel(
+            messages=iter([_answer(100, 20, 0), _answer(100, 30, 64)])
+        )
+
+        async def _extract() -> None:
+            await chat_model.ainvoke("Extract entities.")
+            await chat_model.ainvoke("Extract more entities.")
+
+        context: dict[str, Any] = {}
+        with profile_stage(task, context, "extract_graph") as profile:
+            async_to_sync(_extract)()
+
+        assert profile.llm_calls == 2
+        assert profile.prompt_tokens == 200
+        assert profile.completion_tokens == 50
+        assert profile.cache_hits == 1
+        assert profile.cached_tokens == 64
+        task.update_state.assert_not_called()
+
+    def test_record_outside_stage_is_ignored(self) -> None:
+        record(rows_in=10)
+
+    def test_total_sums_stages(self) -> None:
+        total = StageProfile.total(
+            [
+                StageProfile(stage="a", wall_time=1.5, llm_calls=2, rows_out=3),
+                StageProfile(stage="b", wall_time=0.5, llm_calls=1, rows_out=4),
+            ]
+        )
+
+        assert total.stage == "total"
+        assert total.wall_time == 2.0
+        assert total.llm_calls == 3
+        assert total.rows_out == 7
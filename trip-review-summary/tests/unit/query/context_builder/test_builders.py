@@ -0,0 +1,53 @@
+"""Unit tests for lazily built context records."""
+
+import pandas as pd
+from pytest_mock import MockerFixture
+
+from review_summary.query.context_builder.builders import ContextRecords
+from review_summary.query.context_builder.context_table import ContextTable
+from review_summary.tokenizer.tokenizer import Tokenizer
+
+
+class WhitespaceTokenizer(Tokenizer):
+    """Offline tokenizer counting one token per word."""
+
+    def encode(self, text: str) -> list[int]:
+        return [len(word) for word in text.split()]
+
+    def decode(self, tokens: list[int]) -> str:
+        return " ".join("x" * token for token in tokens)
+
+
+def _table() -> ContextTable:
+    table = ContextTable(
+        tokenizer=WhitespaceTokenizer(), header=["id", "text"], context_name="Sources"
+    )
+    table.extend([["1", "a"], ["2", "b"]])
+    return table
+
+
+class TestContextRecords:
+    """Test suite for ContextRecords."""
+
+    def test_builds_dataframe_on_first_access(self, mocker: MockerFixture) -> None:
+        table = _table()
+        to_dataframe = mocker.spy(table, "to_dataframe")
+        records = ContextRecords({"sources": table})
+
+        assert list(records) == ["sources"]
+        assert records.rows("sources") == [("1", "a"), ("2", "b")]
+        to_dataframe.assert_not_called()
+
+        frame = records["sources"]
+        assert frame["id"].to_list() == ["1", "2"]
+        assert records["sources"] is frame
+        to_dataframe.assert_called_once()
+
+    def test_update_replaces_tables(self) -> None:
+        records = ContextRecords({"sources": pd.DataFrame({"id": ["0"]})})
+        assert records.rows("sources") == [("0",)]
+
+        records.update(ContextRecords({"sources": _table(), "entities": _table()}))
+
+        assert set(records) == {"sources", "entities"}
+        assert len(records["sources"]) == 2
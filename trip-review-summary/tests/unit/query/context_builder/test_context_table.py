@@ -0,0 +1,299 @@
+"""Unit tests for the incremental context table."""
+
+import pandas as pd
+import pytest
+from pytest_mock import MockerFixture
+
+from review_summary.models import Entity, Relationship, TextUnit
+from review_summary.query.context_builder.context_table import ContextTable
+from review_summary.query.context_builder.conversation_history import (
+    ConversationHistory,
+)
+from review_summary.query.context_builder.local_context import (
+    build_entity_context,
+    build_incremental_relationship_table,
+    build_relationship_context,
+)
+from review_summary.query.context_builder.source_context import (
+    build_text_unit_context,
+)
+from review_summary.query.input.retrieval.relationships import RelationshipIndex
+from review_summary.tokenizer.tokenizer import Tokenizer
+
+
+class WhitespaceTokenizer(Tokenizer):
+    """Offline tokenizer counting one token per word."""
+
+    encoding_name = "whitespace"
+
+    def encode(self, text: str) -> list[int]:
+        return [len(word) for word in text.split()]
+
+    def decode(self, tokens: list[int]) -> str:
+        return " ".join("x" * token for token in tokens)
+
+
+@pytest.fixture
+def tokenizer() -> WhitespaceTokenizer:
+    return WhitespaceTokenizer()
+
+
+def _table(tokenizer: Tokenizer, max_context_tokens: int) -> ContextTable:
+    # The title and header "-----Sources-----\nid|text\n" count 2 tokens
+    return ContextTable(
+        tokenizer=tokenizer,
+        header=["id", "text"],
+        context_name="Sources",
+        max_context_tokens=max_context_tokens,
+    )
+
+
+class TestContextTable:
+    """Test suite for ContextTable."""
+
+    def test_append_stops_at_budget(self, tokenizer: Tokenizer) -> None:
+        table = _table(tokenizer, max_context_tokens=6)
+
+        assert table.append(["1", "two words"])
+        assert table.append(["2", "three more words"]) is False
+        assert table.append(["3", "one"])
+
+        assert table.num_tokens == 5
+        assert table.to_text() == "-----Sources-----\nid|text\n1|two words\n3|one\n"
+        assert table.to_dataframe()["id"].to_list() == ["1", "3"]
+
+    def test_extend_matches_full_encoding(self, tokenizer: Tokenizer) -> None:
+        rows = [[str(i), "word " * i] for i in range(1, 6)]
+        table = _table(tokenizer, max_context_tokens=9)
+
+        added = table.extend(rows)
+
+        assert added == 3
+        assert table.num_tokens == tokenizer.num_tokens(table.to_text())
+
+    def test_extend_with_known_counts_skips_tokenizer(
+        self, mocker: MockerFixture, tokenizer: Tokenizer
+    ) -> None:
+        table = _table(tokenizer, max_context_tokens=10)
+        num_tokens = mocker.spy(tokenizer, "num_tokens")
+
+        added = table.extend([["1", "a"], ["2", "b"], ["3", "c"]], [3, 4, 2])
+
+        assert added == 2
+        assert table.num_tokens == 9
+        num_tokens.assert_not_called()
+
+    def test_extend_over_budget_header_adds_nothing(self, tokenizer: Tokenizer) -> None:
+        table = _table(tokenizer, max_context_tokens=0)
+
+        added = table.extend([["1", "a"], ["2", "b"], ["3", "c"]], [3, 4, 2])
+
+        assert added == 0
+        assert len(table) == 0
+        assert table.num_tokens == 2
+
+    def test_append_group_is_all_or_nothing(self, tokenizer: Tokenizer) -> None:
+        table = _table(tokenizer, max_context_tokens=5)
+
+        assert table.append_group([["1", "a"], ["2", "b c d"]]) is False
+        assert len(table) == 0
+        assert table.append_group([["1", "a"], ["2", "b"]])
+        assert len(table) == 2
+
+    def test_shared_token_cache(
+        self, mocker: MockerFixture, tokenizer: Tokenizer
+    ) -> None:
+        token_cache: dict[str, int] = {}
+        rows = [["1", "a b"], ["2", "c"]]
+        _table(tokenizer, 100).extend(rows)
+        num_tokens = mocker.spy(tokenizer, "num_tokens")
+
+        table = ContextTable(
+            tokenizer=tokenizer,
+            header=["id", "text"],
+            context_name="Sources",
+            token_cache=token_cache,
+        )
+        table.extend(rows)
+        second = ContextTable(
+            tokenizer=tokenizer,
+            header=["id", "text"],
+            context_name="Sources",
+            token_cache=token_cache,
+        )
+        second.extend(rows)
+
+        # Each table tokenizes its header, the rows only once in total
+        assert num_tokens.call_count == 2 + len(rows)
+        assert second.num_tokens == table.num_tokens
+
+    def test_quoted_rows_match_to_csv(self, tokenizer: Tokenizer) -> None:
+        rows = [["user", 'a "quoted" | piped\nline'], ["assistant", "plain"]]
+        table = ContextTable(
+            tokenizer=tokenizer,
+            header=["turn", "content"],
+            context_name="History",
+            quote=True,
+        )
+        table.extend(rows)
+
+        expected = pd.DataFrame(rows, columns=["turn", "content"]).to_csv(
+            sep="|", index=False
+        )
+        assert table.to_text() == "-----History-----\n" + expected
+
+
+class TestBuilders:
+    """Test suite for the context builders using ContextTable."""
+
+    def test_text_units_use_stored_token_counts(
+        self, mocker: MockerFixture, tokenizer: Tokenizer
+    ) -> None:
+        text_units = [
+            TextUnit(
+                id=str(i),
+                readable_id=str(i),
+                text="w w w w",
+                n_tokens=4,
+                n_tokens_encoding="whitespace",
+            )
+            for i in range(5)
+        ]
+        num_tokens = mocker.spy(tokenizer, "num_tokens")
+
+        text, records = build_text_unit_context(
+            tokenizer,
+            text_units,
+            shuffle_data=False,
+            max_context_tokens=17,
+        )
+
+        # Each row counts the stored 4 tokens plus 1 token for "<id>||\n"
+        assert records["sources"]["id"].to_list() == ["0", "1", "2"]
+        assert tokenizer.num_tokens(text) <= 17
+        # Only the header and the cells around the texts were tokenized
+        assert all("w w" not in call.args[0] for call in num_tokens.call_args_list[:-1])
+
+    def test_graph_rows_use_stored_description_tokens(
+        self, mocker: MockerFixture, tokenizer: Tokenizer
+    ) -> None:
+        description = "a stored description"
+        entities = [
+            Entity(
+                title=name,
+                readable_id=name,
+                description=description,
+                n_tokens=3,
+                n_tokens_encoding="whitespace",
+            )
+            for name in ["TRON", "TOMORROWLAND"]
+        ]
+        relationships = [
+            Relationship(
+                source="TRON",
+                target="TOMORROWLAND",
+                description=description,
+                n_tokens=3,
+                n_tokens_encoding="whitespace",
+            )
+        ]
+        num_tokens = mocker.spy(tokenizer, "num_tokens")
+
+        entity_text, _ = build_entity_context(entities, tokenizer)
+        relationship_text, _ = build_relationship_context(
+            entities, relationships, tokenizer
+        )
+
+        assert entity_text.count(description) == 2
+        assert relationship_text.count(description) == 1
+        assert all(
+            description not in call.args[0] for call in num_tokens.call_args_list
+        )
+
+    def test_counts_of_another_encoding_are_recounted(
+        self, mocker: MockerFixture, tokenizer: Tokenizer
+    ) -> None:
+        description = "a description counted in another encoding"
+        entities = [
+            Entity(
+                title="TRON",
+                readable_id="0",
+                description=description,
+                n_tokens=1,
+                n_tokens_encoding="cl100k_base",
+            ),
+            Entity(title="TOMORROWLAND", readable_id="1", description=description),
+        ]
+        num_tokens = mocker.spy(tokenizer, "num_tokens")
+
+        build_entity_context(entities, tokenizer)
+
+        recounted = [
+            call.args[0]
+            for call in num_tokens.call_args_list
+            if description in call.args[0]
+        ]
+        assert len(recounted) == 2
+
+    def test_incremental_relationships_are_added_per_entity(
+        self, mocker: MockerFixture, tokenizer: Tokenizer
+    ) -> None:
+        entities = [Entity(title=name) for name in ["A", "B", "C"]]
+        relationships = RelationshipIndex(
+            [
+                Relationship(
+                    id=id_, readable_id=id_, source=source, target=target, rank=rank
+                )
+                for id_, source, target, rank in [
+                    ("r1", "A", "X", 1),
+                    ("r2", "A", "Y", 5),
+                    ("r3", "A", "B", 9),
+                    ("r4", "B", "X", 1),
+                    ("r5", "C", "Z", 1),
+                ]
+            ]
+        )
+        num_tokens = mocker.spy(tokenizer, "num_tokens")
+
+        table = build_incremental_relationship_table(
+            entities, relationships, tokenizer, max_context_tokens=1000
+        )
+
+        # A-B waits for B, X links two selected entities and outranks Y
+        assert table is not None
+        assert [row[0] for row in table.records] == ["r1", "r2", "r3", "r4", "r5"]
+        # The header and each row are tokenized once
+        assert num_tokens.call_count == 1 + 5
+
+        truncated = build_incremental_relationship_table(
+            entities, relationships, tokenizer, max_context_tokens=table.num_tokens - 1
+        )
+
+        assert truncated is not None
+        assert [row[0] for row in truncated.records] == ["r1", "r2", "r3", "r4"]
+
+    def test_conversation_history_keeps_whole_turns(self, tokenizer: Tokenizer) -> None:
+        history = ConversationHistory.from_list(
+            [
+                {"role": "user", "content": "first question"},
+                {"role": "assistant", "content": "a long first answer"},
+                {"role": "user", "content": "second question"},
+                {"role": "assistant", "content": "a long second answer here"},
+            ]
+        )
+
+        text, records = history.build_context(
+            tokenizer,
+            include_user_turns_only=False,
+            max_context_tokens=15,
+        )
+
+        # The most recent turn fits, the older one would exceed the budget
+        assert records["conversation history"]["content"].to_list() == [
+            "second question",
+            "a long second answer here",
+        ]
+        assert text == (
+            "-----Conversation History-----\nturn|content\n"
+            "user|second question\nassistant|a long second answer here\n"
+        )
@@ -0,0 +1,177 @@
+"""Unit tests for fetching and caching relationships from Neo4j."""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture, MockType
+
+from review_summary.models import Entity
+from review_summary.query.context_builder.local_context import (
+    build_relationship_context,
+)
+from review_summary.query.fetch_data.fetch_relationship import (
+    RELATIONSHIPS_QUERY,
+    RelationshipCache,
+    fetch_relationships_for_entities,
+)
+from review_summary.tokenizer.tokenizer import Tokenizer
+
+RECORDS: list[dict[str, Any]] = [
+    {
+        "source_id": source_id,
+        "target_id": target_id,
+        "id": relationship_id,
+        "readable_id": relationship_id,
+        "source": source_id.upper(),
+        "target": target_id.upper(),
+        "weight": 1.0,
+        "description": f"{source_id} to {target_id}",
+        "n_tokens": 3,
+        "n_tokens_encoding": "o200k_base",
+        "relationship_target_id": "a1",
+        "relationship_target_type": "attraction",
+    }
+    for relationship_id, source_id, target_id in [
+        ("r1", "e1", "e2"),
+        ("r2", "e2", "e3"),
+        ("r3", "e4", "e1"),
+    ]
+]
+
+
+class WhitespaceTokenizer(Tokenizer):
+    """Offline tokenizer counting one token per word."""
+
+    def encode(self, text: str) -> list[int]:
+        return [len(word) for word in text.split()]
+
+    def decode(self, tokens: list[int]) -> str:
+        return " ".join("x" * token for token in tokens)
+
+
+async def _result(records: list[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
+    for record in records:
+        yield record
+
+
+@pytest.fixture
+def session(mocker: MockerFixture) -> MockType:
+    async def _run(query: str, entity_ids: list[str], target_id: str | None) -> Any:
+        return _result(
+            [
+                record
+                for record in RECORDS
+                if record["source_id"] in entity_ids
+                or record["target_id"] in entity_ids
+            ]
+        )
+
+    session: MockType = mocker.MagicMock()
+    session.run = mocker.AsyncMock(side_effect=_run)
+    return session
+
+
+@pytest.fixture
+def driver(mocker: MockerFixture, session: MockType) -> MockType:
+    driver: MockType = mocker.MagicMock()
+    driver.session.return_value.__aenter__ = mocker.AsyncMock(return_value=session)
+    driver.session.return_value.__aexit__ = mocker.AsyncMock(return_value=False)
+    return driver
+
+
+def _entities(*ids: str, index_version: int | None = 1) -> list[Entity]:
+    attributes = {"target_id": "a1", "index_version": index_version}
+    return [Entity(id=id_, title=id_.upper(), attributes=attributes) for id_ in ids]
+
+
+class TestFetchRelationships:
+    """Test suite for fetch_relationships_for_entities."""
+
+    @pytest.mark.asyncio
+    async def test_scopes_union_query_by_target(
+        self, driver: MockType, session: MockType
+    ) -> None:
+        relationships = await fetch_relationships_for_entities(
+            driver, _entities("e1"), target_id="a1"
+        )
+
+        assert [rel.id for rel in relationships] == ["r1", "r3"]
+        assert relationships[0].n_tokens == 3
+        assert relationships[0].attributes == {
+            "target_id": "a1",
+            "target_type": "attraction",
+        }
+        session.run.assert_awaited_once_with(
+            RELATIONSHIPS_QUERY, entity_ids=["e1"], target_id="a1"
+        )
+        assert "UNION" in RELATIONSHIPS_QUERY
+        assert " OR b.id" not in RELATIONSHIPS_QUERY
+
+    @pytest.mark.asyncio
+    async def test_no_entities_skips_query(self, driver: MockType) -> None:
+        assert await fetch_relationships_for_entities(driver, []) == []
+        driver.session.assert_not_called()
+
+
+class TestRelationshipCache:
+    """Test suite for RelationshipCache."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_only_new_entities(
+        self, driver: MockType, session: MockType
+    ) -> None:
+        cache = RelationshipCache(driver)
+
+        first = await cache.fetch(_entities("e1"), "a1")
+        second = await cache.fetch(_entities("e1", "e2"), "a1")
+        third = await cache.fetch(_entities("e2", "e1"), "a1")
+
+        assert [rel.id for rel in first] == ["r1", "r3"]
+        assert [rel.id for rel in second] == ["r1", "r3", "r2"]
+        assert {rel.id for rel in third} == {"r1", "r2", "r3"}
+        assert [call.kwargs["entity_ids"] for call in session.run.await_args_list] == [
+            ["e1"],
+            ["e2"],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_new_index_version_refetches(
+        self, driver: MockType, session: MockType
+    ) -> None:
+        cache = RelationshipCache(driver)
+
+        await cache.fetch(_entities("e1"), "a1")
+        await cache.fetch(_entities("e1", index_version=2), "a1")
+        await cache.fetch(_entities("e1", index_version=None), "a1")
+
+        assert session.run.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_mixed_index_versions_bypass_cache(
+        self, driver: MockType, session: MockType
+    ) -> None:
+        cache = RelationshipCache(driver)
+        mixed = [*_entities("e1"), *_entities("e2", index_version=2)]
+
+        await cache.fetch(mixed, "a1")
+        await cache.fetch(mixed, "a1")
+        await cache.fetch(_entities("e1"), "a1")
+
+        assert session.run.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_queries_do_not_share_links(self, driver: MockType) -> None:
+        cache = RelationshipCache(driver)
+        tokenizer = WhitespaceTokenizer()
+
+        # E2 links E1 and E3 as an out-of-network entity
+        first = _entities("e1", "e3")
+        build_relationship_context(first, await cache.fetch(first, "a1"), tokenizer)
+        # E1 to E2 is in network, without links
+        second = _entities("e1", "e2")
+        relationships = await cache.fetch(second, "a1")
+        text, _ = build_relationship_context(second, relationships, tokenizer)
+
+        assert all("links" not in (rel.attributes or {}) for rel in relationships)
+        assert "r1|E1|E2|e1 to e2|a1|attraction\n" in text
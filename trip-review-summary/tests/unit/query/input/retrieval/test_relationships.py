@@ -0,0 +1,123 @@
+"""Unit tests for indexed relationship retrieval."""
+
+import random
+
+import pytest
+
+from review_summary.models import Entity, Relationship, TextUnit
+from review_summary.query.context_builder.source_context import count_relationships
+from review_summary.query.input.retrieval.relationships import (
+    RelationshipIndex,
+    get_candidate_relationships,
+    get_in_network_relationships,
+    get_out_network_relationships,
+)
+
+NAMES = [f"E{i}" for i in range(12)]
+
+
+def _relationships(seed: int) -> list[Relationship]:
+    generator = random.Random(seed)
+    return [
+        Relationship(
+            id=f"r{i}",
+            source=generator.choice(NAMES),
+            target=generator.choice(NAMES),
+            rank=generator.randint(0, 3),
+            weight=generator.random(),
+            text_unit_ids=[f"t{generator.randint(0, 4)}"],
+        )
+        for i in range(60)
+    ]
+
+
+def _naive_sort(
+    relationships: list[Relationship], ranking_attribute: str
+) -> list[Relationship]:
+    return sorted(
+        relationships,
+        key=lambda r: getattr(r, ranking_attribute) or 0.0,
+        reverse=True,
+    )
+
+
+@pytest.fixture(params=[0, 1, 2])
+def relationships(request: pytest.FixtureRequest) -> list[Relationship]:
+    return _relationships(request.param)
+
+
+@pytest.fixture
+def selected() -> list[Entity]:
+    return [Entity(title=name) for name in ["E1", "E4", "E7"]]
+
+
+class TestRelationshipIndex:
+    """Test suite comparing RelationshipIndex against linear scans."""
+
+    @pytest.mark.parametrize("ranking_attribute", ["rank", "weight"])
+    def test_in_network(
+        self,
+        relationships: list[Relationship],
+        selected: list[Entity],
+        ranking_attribute: str,
+    ) -> None:
+        names = {entity.title for entity in selected}
+        expected = _naive_sort(
+            [r for r in relationships if r.source in names and r.target in names],
+            ranking_attribute,
+        )
+
+        result = get_in_network_relationships(
+            selected, relationships, ranking_attribute
+        )
+
+        assert [r.id for r in result] == [r.id for r in expected]
+
+    @pytest.mark.parametrize("ranking_attribute", ["rank", "weight"])
+    def test_out_network(
+        self,
+        relationships: list[Relationship],
+        selected: list[Entity],
+        ranking_attribute: str,
+    ) -> None:
+        names = {entity.title for entity in selected}
+        expected = _naive_sort(
+            [r for r in relationships if r.source in names and r.target not in names]
+            + [r for r in relationships if r.target in names and r.source not in names],
+            ranking_attribute,
+        )
+
+        result = get_out_network_relationships(
+            selected, RelationshipIndex(relationships, ranking_attribute)
+        )
+
+        assert [r.id for r in result] == [r.id for r in expected]
+
+    def test_candidates(
+        self, relationships: list[Relationship], selected: list[Entity]
+    ) -> None:
+        names = {entity.title for entity in selected}
+        expected = [r for r in relationships if r.source in names or r.target in names]
+
+        result = get_candidate_relationships(selected, relationships)
+
+        assert result == expected
+
+    def test_count_relationships(self, relationships: list[Relationship]) -> None:
+        index = RelationshipIndex(relationships)
+        entity = Entity(title="E4")
+        entity_relationships = [
+            r for r in relationships if "E4" in (r.source, r.target)
+        ]
+
+        by_text_unit = TextUnit(id="t2", text="")
+        by_ids = TextUnit(
+            id="t9", text="", relationship_ids=[r.id for r in relationships[::3]]
+        )
+
+        assert count_relationships(index, entity, by_text_unit) == sum(
+            1 for r in entity_relationships if "t2" in (r.text_unit_ids or [])
+        )
+        assert count_relationships(index, entity, by_ids) == sum(
+            1 for r in entity_relationships if r in relationships[::3]
+        )
@@ -0,0 +1,140 @@
+"""Unit tests for LocalSearchMixedContext retrieval."""
+
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from review_summary.models import Entity, Relationship, TextUnit
+from review_summary.query.structured_search.local_search.mixed_content import (
+    LocalSearchMixedContext,
+)
+from review_summary.tokenizer.tokenizer import Tokenizer
+
+MODULE = "review_summary.query.structured_search.local_search.mixed_content"
+
+
+class WhitespaceTokenizer(Tokenizer):
+    """Offline tokenizer counting one token per word."""
+
+    def encode(self, text: str) -> list[int]:
+        return [len(word) for word in text.split()]
+
+    def decode(self, tokens: list[int]) -> str:
+        return " ".join("x" * token for token in tokens)
+
+
+ENTITIES = [
+    Entity(id="e1", title="TRON", description="Roller coaster", text_unit_ids=["t1"]),
+    Entity(id="e2", title="TOMORROWLAND", description="Land", text_unit_ids=["t2"]),
+]
+RELATIONSHIPS = [
+    Relationship(id="r1", source="TRON", target="TOMORROWLAND", description="In")
+]
+TEXT_UNITS = [
+    TextUnit(id="t1", readable_id="1", text="TRON is fast"),
+    TextUnit(id="t2", readable_id="2", text="Tomorrowland is fun"),
+]
+
+
+def _context_builder(mocker: MockerFixture) -> LocalSearchMixedContext:
+    embedding_model = mocker.MagicMock()
+    embedding_model.aembed_documents = mocker.AsyncMock(return_value=[[0.1, 0.2]])
+    entity_vector_store = mocker.MagicMock()
+    entity_vector_store.search_by_vector = mocker.AsyncMock(return_value=ENTITIES)
+    text_unit_vector_store = mocker.MagicMock()
+    text_unit_vector_store.retrieve_by_ids = mocker.AsyncMock(return_value=TEXT_UNITS)
+    return LocalSearchMixedContext(
+        entity_vector_store=entity_vector_store,
+        text_unit_vector_store=text_unit_vector_store,
+        embedding_model=embedding_model,
+        tokenizer=WhitespaceTokenizer(),
+        neo4j_driver=mocker.MagicMock(),
+    )
+
+
+class TestLocalSearchMixedContext:
+    """Test suite for the concurrent retrieval of build_context."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_referenced_text_units(self, mocker: MockerFixture) -> None:
+        mocker.patch(
+            f"{MODULE}.fetch_relationships_for_entities",
+            mocker.AsyncMock(return_value=RELATIONSHIPS),
+        )
+        context_builder = _context_builder(mocker)
+
+        result = await context_builder.build_context("Is TRON fun?", target_id="a1")
+
+        retrieve = context_builder.text_unit_vector_store.retrieve_by_ids
+        assert retrieve.await_args.args[0] == ["t1", "t2"]  # type: ignore
+        assert len(result.context_records["sources"]) == 2
+        assert len(result.context_records["relationships"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_relationships_fall_back(self, mocker: MockerFixture) -> None:
+        async def _slow_fetch(**_: object) -> list[Relationship]:
+            await asyncio.sleep(10)
+            return RELATIONSHIPS
+
+        mocker.patch(f"{MODULE}.fetch_relationships_for_entities", _slow_fetch)
+        context_builder = _context_builder(mocker)
+
+        result = await asyncio.wait_for(
+            context_builder.build_context(
+                "Is TRON fun?", target_id="a1", relationship_timeout=0.05
+            ),
+            timeout=2,
+        )
+
+        assert len(result.context_records["sources"]) == 2
+        assert "TRON" in result.context_chunks
+        assert 0.05 <= result.timings["relationships"] < 2
+
+    @pytest.mark.asyncio
+    async def test_reports_stage_timings(self, mocker: MockerFixture) -> None:
+        mocker.patch(
+            f"{MODULE}.fetch_relationships_for_entities",
+            mocker.AsyncMock(return_value=RELATIONSHIPS),
+        )
+        context_builder = _context_builder(mocker)
+
+        result = await context_builder.build_context("Is TRON fun?", target_id="a1")
+
+        assert set(result.timings) == {
+            "query_embedding",
+            "entity_search",
+            "relationships",
+            "text_units",
+            "context.community",
+            "context.local",
+            "context.text_units",
+        }
+        assert all(elapsed >= 0 for elapsed in result.timings.values())
+
+
+class TestEntityFusion:
+    """Test suite for the fused entity search knob."""
+
+    @pytest.mark.asyncio
+    async def test_uses_fused_search(self, mocker: MockerFixture) -> None:
+        mocker.patch(
+            f"{MODULE}.fetch_relationships_for_entities",
+            mocker.AsyncMock(return_value=RELATIONSHIPS),
+        )
+        context_builder = _context_builder(mocker)
+        context_builder.entity_fusion = "weighted"
+        context_builder.entity_title_weight = 0.3
+        vector_store = context_builder.entity_vector_store
+        search_by_vector = mocker.patch.object(vector_store, "search_by_vector")
+        search_fused = mocker.patch.object(
+            vector_store, "search_fused", mocker.AsyncMock(return_value=ENTITIES)
+        )
+
+        result = await context_builder.build_context("Is TRON fun?", target_id="a1")
+
+        search_by_vector.assert_not_awaited()
+        assert search_fused.await_args is not None
+        assert search_fused.await_args.kwargs["fusion"] == "weighted"
+        assert search_fused.await_args.kwargs["title_weight"] == 0.3
+        assert len(result.context_records["entities"]) == 2
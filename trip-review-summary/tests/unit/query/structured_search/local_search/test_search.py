@@ -0,0 +1,216 @@
+"""Unit tests for LocalSearch answer caching, streaming and telemetry."""
+
+import pytest
+from pytest_mock import MockerFixture, MockType
+
+from review_summary.callbacks.query_callbacks import QueryCallbacks
+from review_summary.query.answer_cache import SemanticAnswerCache
+from review_summary.query.base import SearchResult
+from review_summary.query.context_builder.builders import ContextBuilderResult
+from review_summary.query.structured_search.local_search.search import LocalSearch
+from review_summary.tokenizer.tokenizer import Tokenizer
+
+
+class WhitespaceTokenizer(Tokenizer):
+    """Offline tokenizer counting one token per word."""
+
+    def encode(self, text: str) -> list[int]:
+        return [len(word) for word in text.split()]
+
+    def decode(self, tokens: list[int]) -> str:
+        return " ".join("x" * token for token in tokens)
+
+
+@pytest.fixture
+def context_builder(mocker: MockerFixture) -> MockType:
+    context_builder: MockType = mocker.MagicMock()
+    context_builder.query_embedder.aembed_query = mocker.AsyncMock(
+        return_value=[1.0, 0.0]
+    )
+    context_builder.entity_vector_store.get_index_version = mocker.AsyncMock(
+        return_value=1
+    )
+    context_builder.build_context = mocker.AsyncMock(
+        return_value=ContextBuilderResult(context_chunks="-----Sources-----")
+    )
+    return context_builder
+
+
+@pytest.fixture
+def chat_model(mocker: MockerFixture) -> MockType:
+    async def _astream(*_: object, **__: object) -> object:
+        for text in ["Worth ", "visiting"]:
+            yield mocker.MagicMock(text=text, usage_metadata=None)
+
+    model: MockType = mocker.MagicMock()
+    model.astream = mocker.MagicMock(side_effect=_astream)
+    return model
+
+
+class TestLocalSearchAnswerCache:
+    """Test suite for the semantic answer cache of LocalSearch."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_skips_llm(
+        self, chat_model: MockType, context_builder: MockType
+    ) -> None:
+        search = LocalSearch(
+            chat_model=chat_model,
+            context_builder=context_builder,
+            tokenizer=WhitespaceTokenizer(),
+            answer_cache=SemanticAnswerCache(),
+        )
+
+        first = await search.search("Is it worth visiting?", target_id="a1")
+        second = await search.search("is it worth visiting", target_id="a1")
+
+        assert isinstance(first, SearchResult)
+        assert first.llm_calls == 1
+        assert second.response == "Worth visiting"
+        assert second.llm_calls == 0
+        assert second.prompt_tokens == 0
+        assert first.answer_cache_similarity is None
+        assert second.answer_cache_similarity == pytest.approx(1.0)
+        assert chat_model.astream.call_count == 1
+        context_builder.build_context.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_new_index_version_misses(
+        self, chat_model: MockType, context_builder: MockType
+    ) -> None:
+        search = LocalSearch(
+            chat_model=chat_model,
+            context_builder=context_builder,
+            tokenizer=WhitespaceTokenizer(),
+            answer_cache=SemanticAnswerCache(),
+            version_check_interval=0,
+        )
+
+        await search.search("Is it worth visiting?", target_id="a1")
+        context_builder.entity_vector_store.get_index_version.return_value = 2
+        await search.search("Is it worth visiting?", target_id="a1")
+
+        assert chat_model.astream.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_index_version_is_rechecked_after_interval(
+        self, chat_model: MockType, context_builder: MockType
+    ) -> None:
+        search = LocalSearch(
+            chat_model=chat_model,
+            context_builder=context_builder,
+            tokenizer=WhitespaceTokenizer(),
+            answer_cache=SemanticAnswerCache(),
+        )
+
+        first = await search.search("Is it worth visiting?", target_id="a1")
+        await search.search("Is it worth visiting?", target_id="a1")
+
+        get_index_version = context_builder.entity_vector_store.get_index_version
+        get_index_version.assert_awaited_once_with("a1")
+        assert first.timings is not None
+        assert "index_version" in first.timings
+
+    @pytest.mark.asyncio
+    async def test_index_version_failure_skips_cache(
+        self, chat_model: MockType, context_builder: MockType
+    ) -> None:
+        context_builder.entity_vector_store.get_index_version.side_effect = (
+            RuntimeError("No payload index for attributes.index_version")
+        )
+        answer_cache = SemanticAnswerCache()
+        search = LocalSearch(
+            chat_model=chat_model,
+            context_builder=context_builder,
+            tokenizer=WhitespaceTokenizer(),
+            answer_cache=answer_cache,
+        )
+
+        result = await search.search("Is it worth visiting?", target_id="a1")
+
+        assert result.response == "Worth visiting"
+        assert len(answer_cache) == 0
+
+
+class TestLocalSearchStreaming:
+    """Test suite for streaming answer tokens out of LocalSearch.search."""
+
+    @pytest.mark.asyncio
+    async def test_on_token_receives_chunks(
+        self, chat_model: MockType, context_builder: MockType
+    ) -> None:
+        search = LocalSearch(
+            chat_model=chat_model,
+            context_builder=context_builder,
+            tokenizer=WhitespaceTokenizer(),
+            answer_cache=SemanticAnswerCache(),
+        )
+        tokens: list[str] = []
+
+        async def _on_token(token: str) -> None:
+            tokens.append(token)
+
+        result = await search.search("Is it worth visiting?", on_token=_on_token)
+        cached = await search.search("Is it worth visiting?", on_token=_on_token)
+
+        assert tokens == ["Worth ", "visiting", "Worth visiting"]
+        assert result.response == cached.response == "Worth visiting"
+        assert result.output_tokens == 2
+
+
+class TestLocalSearchTelemetry:
+    """Test suite for the stage timings and token usage of LocalSearch."""
+
+    @pytest.mark.asyncio
+    async def test_result_and_callbacks_carry_timings(
+        self, mocker: MockerFixture, chat_model: MockType, context_builder: MockType
+    ) -> None:
+        context_builder.build_context.return_value = ContextBuilderResult(
+            context_chunks="-----Sources-----",
+            timings={"entity_search": 0.25, "context.local": 0.5},
+        )
+        callback = mocker.MagicMock(spec=QueryCallbacks)
+        search = LocalSearch(
+            chat_model=chat_model,
+            context_builder=context_builder,
+            tokenizer=WhitespaceTokenizer(),
+            callbacks=[callback],
+        )
+
+        result = await search.search("Is it worth visiting?")
+
+        assert result.timings is not None
+        assert result.timings["entity_search"] == 0.25
+        assert result.timings["context.local"] == 0.5
+        assert result.timings["llm_total"] >= result.timings["llm_first_token"] >= 0
+        callback.on_timings.assert_called_once_with(result.timings)
+
+    @pytest.mark.asyncio
+    async def test_reported_usage_replaces_estimates(
+        self, mocker: MockerFixture, context_builder: MockType
+    ) -> None:
+        async def _astream(*_: object, stream_usage: bool = False) -> object:
+            yield mocker.MagicMock(text="Worth visiting", usage_metadata=None)
+            if stream_usage:
+                yield mocker.MagicMock(
+                    text="",
+                    usage_metadata={
+                        "input_tokens": 120,
+                        "output_tokens": 3,
+                        "total_tokens": 123,
+                    },
+                )
+
+        chat_model: MockType = mocker.MagicMock()
+        chat_model.astream = mocker.MagicMock(side_effect=_astream)
+        search = LocalSearch(
+            chat_model=chat_model,
+            context_builder=context_builder,
+            tokenizer=WhitespaceTokenizer(),
+        )
+
+        result = await search.search("Is it worth visiting?")
+
+        assert result.response == "Worth visiting"
+        assert result.prompt_tokens == 120
+        assert result.output_tokens == 3
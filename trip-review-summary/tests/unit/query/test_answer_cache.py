@@ -0,0 +1,74 @@
+"""Unit tests for the semantic answer cache."""
+
+from review_summary.query.answer_cache import SemanticAnswerCache
+from review_summary.query.base import SearchResult
+
+
+def _result(response: str) -> SearchResult:
+    return SearchResult(
+        response=response,
+        context_data={},
+        context_text="",
+        completion_time=1.0,
+        llm_calls=1,
+        prompt_tokens=100,
+        output_tokens=10,
+    )
+
+
+class TestSemanticAnswerCache:
+    """Test suite for SemanticAnswerCache."""
+
+    def test_hit_above_threshold(self) -> None:
+        cache = SemanticAnswerCache(similarity_threshold=0.9)
+        cache.store("a1", 1, [1.0, 0.0], _result("Worth it"))
+
+        hit, similarity = cache.lookup("a1", 1, [0.99, 0.05])
+
+        assert hit is not None
+        assert hit.response == "Worth it"
+        assert similarity is not None and similarity > 0.9
+        assert cache.metrics.hits == 1
+        assert cache.metrics.hit_rate == 1.0
+
+    def test_miss_below_threshold_or_other_target(self) -> None:
+        cache = SemanticAnswerCache(similarity_threshold=0.9)
+        cache.store("a1", 1, [1.0, 0.0], _result("Worth it"))
+
+        assert cache.lookup("a1", 1, [0.0, 1.0]) == (None, 0.0)
+        assert cache.lookup("a2", 1, [1.0, 0.0]) == (None, None)
+        assert cache.metrics.hit_rate == 0.0
+
+    def test_new_index_version_invalidates(self) -> None:
+        cache = SemanticAnswerCache()
+        cache.store("a1", 1, [1.0, 0.0], _result("Old"))
+        cache.store("a2", 1, [1.0, 0.0], _result("Other"))
+
+        assert cache.lookup("a1", 2, [1.0, 0.0])[0] is None
+        cache.store("a1", 2, [0.0, 1.0], _result("New"))
+
+        assert cache.lookup("a1", 1, [1.0, 0.0])[0] is None
+        assert len(cache) == 2
+        assert cache.metrics.invalidations == 1
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = SemanticAnswerCache(max_entries=2)
+        cache.store("a1", 1, [1.0, 0.0], _result("First"))
+        cache.store("a2", 1, [1.0, 0.0], _result("Second"))
+        assert cache.lookup("a1", 1, [1.0, 0.0])[0] is not None
+
+        cache.store("a3", 1, [1.0, 0.0], _result("Third"))
+
+        assert len(cache) == 2
+        assert cache.lookup("a2", 1, [1.0, 0.0])[0] is None
+        assert cache.lookup("a1", 1, [1.0, 0.0])[0] is not None
+        assert cache.metrics.evictions == 1
+
+    def test_invalidate_target(self) -> None:
+        cache = SemanticAnswerCache()
+        cache.store("a1", 1, [1.0, 0.0], _result("Worth it"))
+
+        cache.invalidate("a1")
+
+        assert len(cache) == 0
+        assert cache.lookup("a1", 1, [1.0, 0.0])[0] is None
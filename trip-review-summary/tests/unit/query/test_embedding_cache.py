@@ -0,0 +1,106 @@
+"""Unit tests for the cached and coalescing query embedder."""
+
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture, MockType
+
+from review_summary.query.embedding_cache import CachedQueryEmbedder, normalize_query
+
+
+@pytest.fixture
+def embedding_model(mocker: MockerFixture) -> MockType:
+    async def _embed(texts: list[str]) -> list[list[float]]:
+        await asyncio.sleep(0)
+        return [[float(len(text)), 0.5] for text in texts]
+
+    model: MockType = mocker.MagicMock()
+    model.aembed_documents = mocker.AsyncMock(side_effect=_embed)
+    return model
+
+
+class TestCachedQueryEmbedder:
+    """Test suite for CachedQueryEmbedder."""
+
+    def test_normalize_query(self) -> None:
+        assert normalize_query("  Is it  WORTH\nvisiting? ") == "is it worth visiting?"
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_model(self, embedding_model: MockType) -> None:
+        embedder = CachedQueryEmbedder(embedding_model, batch_window=0)
+
+        first = await embedder.aembed_query("Is it worth visiting?")
+        second = await embedder.aembed_query("is it  worth visiting?")
+
+        assert first == second == [21.0, 0.5]
+        embedding_model.aembed_documents.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_coalesces_concurrent_misses(self, embedding_model: MockType) -> None:
+        embedder = CachedQueryEmbedder(embedding_model, batch_window=0.01)
+
+        results = await asyncio.gather(
+            embedder.aembed_query("a"),
+            embedder.aembed_query("bb"),
+            embedder.aembed_query("A"),
+        )
+
+        assert list(results) == [[1.0, 0.5], [2.0, 0.5], [1.0, 0.5]]
+        embedding_model.aembed_documents.assert_awaited_once_with(["a", "bb"])
+
+    @pytest.mark.asyncio
+    async def test_embeds_original_query_text(self, embedding_model: MockType) -> None:
+        embedder = CachedQueryEmbedder(embedding_model, batch_window=0.01)
+
+        await asyncio.gather(
+            embedder.aembed_query("Is it  WORTH visiting?"),
+            embedder.aembed_query("is it worth visiting?"),
+        )
+
+        embedding_model.aembed_documents.assert_awaited_once_with(
+            ["Is it  WORTH visiting?"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_max_batch_size_flushes_early(
+        self, embedding_model: MockType
+    ) -> None:
+        embedder = CachedQueryEmbedder(
+            embedding_model, batch_window=10, max_batch_size=2
+        )
+
+        results = await asyncio.wait_for(
+            asyncio.gather(embedder.aembed_query("a"), embedder.aembed_query("bb")),
+            timeout=1,
+        )
+
+        assert list(results) == [[1.0, 0.5], [2.0, 0.5]]
+
+    @pytest.mark.asyncio
+    async def test_expired_and_evicted_entries(self, embedding_model: MockType) -> None:
+        embedder = CachedQueryEmbedder(
+            embedding_model, max_size=1, ttl=-1, batch_window=0
+        )
+
+        await embedder.aembed_query("a")
+        await embedder.aembed_query("a")
+
+        assert embedding_model.aembed_documents.await_count == 2
+        assert len(embedder._cache) == 1  # pyright: ignore[reportPrivateUsage]
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_all_waiters(
+        self, mocker: MockerFixture, embedding_model: MockType
+    ) -> None:
+        embedding_model.aembed_documents = mocker.AsyncMock(
+            side_effect=RuntimeError("boom")
+        )
+        embedder = CachedQueryEmbedder(embedding_model, batch_window=0.01)
+
+        results = await asyncio.gather(
+            embedder.aembed_query("a"),
+            embedder.aembed_query("b"),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,196 @@
+"""Unit tests for in-memory target snapshots."""
+
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture, MockType
+
+from review_summary.models import Entity, Relationship, TextUnit
+from review_summary.query.context_builder.local_context import (
+    build_relationship_context,
+)
+from review_summary.query.target_snapshot import TargetSnapshot, TargetSnapshotCache
+from review_summary.tokenizer.tokenizer import Tokenizer
+
+MODULE = "review_summary.query.target_snapshot"
+
+ENTITIES = [
+    Entity(
+        id="e1",
+        title="TRON",
+        description_embedding=np.array([1.0, 0.0], dtype=np.float32),
+        text_unit_ids=["t1"],
+    ),
+    Entity(
+        id="e2",
+        title="TOMORROWLAND",
+        description_embedding=np.array([0.6, 0.8], dtype=np.float32),
+    ),
+    Entity(
+        id="e3",
+        title="PEPPA PIG",
+        description_embedding=np.array([0.0, 1.0], dtype=np.float32),
+    ),
+    Entity(id="e4", title="NO EMBEDDING"),
+]
+RELATIONSHIPS = [
+    Relationship(id="r1", source="TRON", target="TOMORROWLAND"),
+    Relationship(id="r2", source="PEPPA PIG", target="TOMORROWLAND"),
+]
+TEXT_UNITS = [TextUnit(id="t1", text="TRON is fast")]
+
+
+class WhitespaceTokenizer(Tokenizer):
+    """Offline tokenizer counting one token per word."""
+
+    def encode(self, text: str) -> list[int]:
+        return [len(word) for word in text.split()]
+
+    def decode(self, tokens: list[int]) -> str:
+        return " ".join("x" * token for token in tokens)
+
+
+def _snapshot() -> TargetSnapshot:
+    return TargetSnapshot.create("a1", 1, ENTITIES, RELATIONSHIPS, TEXT_UNITS)
+
+
+class TestTargetSnapshot:
+    """Test suite for TargetSnapshot lookups."""
+
+    def test_search_entities(self) -> None:
+        snapshot = _snapshot()
+
+        entities = snapshot.search_entities([2.0, 0.0], top_k=2)
+
+        assert [entity.title for entity in entities] == ["TRON", "TOMORROWLAND"]
+        assert [entity.rank for entity in entities] == [100, 60]
+        assert entities[0].description_embedding is None
+        assert snapshot.embeddings.shape == (3, 2)
+
+    def test_search_entities_keeps_stored_rank(self) -> None:
+        stored = Entity.from_store(
+            {"id": "e5", "title": "SPACE", "rank": 7, "description_embedding": [1, 0]}
+        )
+        snapshot = TargetSnapshot.create("a1", 1, [stored], [], [])
+
+        entities = snapshot.search_entities([1.0, 0.0], top_k=1)
+
+        assert [entity.rank for entity in entities] == [7]
+
+    def test_relationships_for_entities(self) -> None:
+        snapshot = _snapshot()
+
+        relationships = snapshot.relationships_for_entities([ENTITIES[1], ENTITIES[0]])
+
+        assert [relationship.id for relationship in relationships] == ["r1", "r2"]
+
+    def test_queries_do_not_share_links(self) -> None:
+        snapshot = _snapshot()
+        tokenizer = WhitespaceTokenizer()
+
+        # TOMORROWLAND links TRON and PEPPA PIG as an out-of-network entity
+        first = [ENTITIES[0], ENTITIES[2]]
+        build_relationship_context(
+            first, snapshot.relationships_for_entities(first), tokenizer
+        )
+        # TRON to TOMORROWLAND is in network, without links
+        second = [ENTITIES[0], ENTITIES[1]]
+        text, _ = build_relationship_context(
+            second, snapshot.relationships_for_entities(second), tokenizer
+        )
+
+        assert all(
+            "links" not in (relationship.attributes or {})
+            for relationships in snapshot.relationships_by_entity.values()
+            for relationship in relationships
+        )
+        assert "links" not in text
+
+    def test_text_units_by_ids(self) -> None:
+        snapshot = _snapshot()
+
+        assert snapshot.text_units_by_ids(["t1", "t2", "t1"]) == TEXT_UNITS
+
+
+@pytest.fixture
+def cache(mocker: MockerFixture) -> TargetSnapshotCache:
+    entity_vector_store: MockType = mocker.MagicMock()
+    entity_vector_store.get_index_version = mocker.AsyncMock(return_value=1)
+    entity_vector_store.find_by_target = mocker.AsyncMock(return_value=ENTITIES)
+    text_unit_vector_store: MockType = mocker.MagicMock()
+    text_unit_vector_store.retrieve_by_ids = mocker.AsyncMock(return_value=TEXT_UNITS)
+    mocker.patch(
+        f"{MODULE}.fetch_relationships_for_entities",
+        mocker.AsyncMock(return_value=RELATIONSHIPS),
+    )
+    return TargetSnapshotCache(
+        entity_vector_store=entity_vector_store,
+        text_unit_vector_store=text_unit_vector_store,
+        neo4j_driver=mocker.MagicMock(),
+        hot_threshold=2,
+        version_check_interval=0,
+    )
+
+
+class TestTargetSnapshotCache:
+    """Test suite for TargetSnapshotCache."""
+
+    @pytest.mark.asyncio
+    async def test_loads_hot_targets(self, cache: TargetSnapshotCache) -> None:
+        assert await cache.get("a1") is None
+        await cache.wait_loaded()
+        assert "a1" not in cache
+
+        assert await cache.get("a1") is None
+        await cache.wait_loaded()
+
+        snapshot = await cache.get("a1")
+        assert snapshot is not None
+        assert snapshot.index_version == 1
+        assert cache.nbytes == snapshot.nbytes
+
+    @pytest.mark.asyncio
+    async def test_drops_snapshot_of_rebuilt_index(
+        self, cache: TargetSnapshotCache
+    ) -> None:
+        await cache.get("a1")
+        await cache.get("a1")
+        await cache.wait_loaded()
+
+        cache.entity_vector_store.get_index_version.return_value = 2  # type: ignore
+
+        assert await cache.get("a1") is None
+        await cache.wait_loaded()
+        snapshot = await cache.get("a1")
+        assert snapshot is not None
+        assert snapshot.index_version == 2
+
+    @pytest.mark.asyncio
+    async def test_evicts_beyond_max_bytes(self, cache: TargetSnapshotCache) -> None:
+        for target_id in ["a1", "a2"]:
+            await cache.get(target_id)
+            await cache.get(target_id)
+            await cache.wait_loaded()
+        assert "a1" in cache and "a2" in cache
+
+        cache.max_bytes = cache.nbytes - 1
+        for _ in range(2):
+            await cache.get("a3")
+        await cache.wait_loaded()
+
+        assert "a1" not in cache
+        assert "a2" not in cache
+        assert "a3" in cache
+
+    @pytest.mark.asyncio
+    async def test_forgets_least_recently_queried_targets(
+        self, cache: TargetSnapshotCache
+    ) -> None:
+        cache.max_tracked_targets = 2
+        await cache.get("a1")
+        await cache.get("a2")
+        await cache.get("a3")
+
+        # a1 was forgotten, its next query counts from one again
+        assert await cache.get("a1") is None
+        await cache.wait_loaded()
+        assert "a1" not in cache
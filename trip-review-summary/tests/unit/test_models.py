@@ -0,0 +1,40 @@
+"""Unit tests for building models from store records."""
+
+import numpy as np
+
+from review_summary.models import ENTITIES_ADAPTER, Entity, Relationship, TextUnit
+
+
+class TestFromStore:
+    """Test suite for the trusted store read path."""
+
+    def test_matches_validation(self) -> None:
+        entity = Entity(
+            title="TRON",
+            description="Roller coaster",
+            description_embedding=np.array([0.1, 0.2], dtype=np.float32),
+            text_unit_ids=["t1"],
+            attributes={"target_id": "a1"},
+        )
+        payload = entity.model_dump()
+
+        assert Entity.from_store(payload) == Entity.model_validate(payload)
+
+    def test_missing_fields_take_defaults(self) -> None:
+        text_unit = TextUnit.from_store({"id": "t1", "text": ""})
+        relationship = Relationship.from_store(
+            {"id": "r1", "source": "TRON", "target": "TOMORROWLAND"}
+        )
+
+        assert text_unit.embedding is None
+        assert text_unit.model_dump()["attributes"] is None
+        assert relationship.weight == 1.0
+        assert relationship.rank == 1
+
+    def test_bulk_validation(self) -> None:
+        entities = ENTITIES_ADAPTER.validate_python(
+            [{"title": "TRON", "rank": "2"}, {"title": "TOMORROWLAND"}]
+        )
+
+        assert [entity.rank for entity in entities] == [2, 1]
+        assert entities[0].id != entities[1].id
@@ -0,0 +1,69 @@
+"""Unit tests for vector utilities."""
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from review_summary.models import Entity, TextUnit
+from review_summary.utils.vector import vectors_from_arrow, vectors_to_arrow
+
+
+class TestVectorField:
+    """Test suite for the float32 vector field of the models."""
+
+    def test_converts_lists_to_float32(self) -> None:
+        text_unit = TextUnit.model_validate(
+            {"text": "Great view", "embedding": [0.5, 0.25]}
+        )
+
+        assert isinstance(text_unit.embedding, np.ndarray)
+        assert text_unit.embedding.dtype == np.float32
+        assert text_unit.model_dump_json().startswith('{"id"')
+        assert '"embedding":[0.5,0.25]' in text_unit.model_dump_json()
+
+    def test_keeps_float32_arrays(self) -> None:
+        vector = np.ones(4, dtype=np.float32)
+        entity = Entity(title="TRON", description_embedding=vector)
+
+        assert entity.description_embedding is vector
+        assert entity.model_dump()["description_embedding"] is vector
+
+    def test_round_trips_json(self) -> None:
+        entity = Entity.model_validate(
+            {"title": "TRON", "description_embedding": [0.1, 0.2]}
+        )
+
+        assert Entity.model_validate_json(entity.model_dump_json()) == entity
+        assert entity != entity.model_copy(
+            update={"description_embedding": np.zeros(2, dtype=np.float32)}
+        )
+
+    def test_rejects_matrices(self) -> None:
+        with pytest.raises(ValueError):
+            TextUnit.model_validate(
+                {"text": "Great view", "embedding": [[0.5], [0.25]]}
+            )
+
+
+class TestArrowConversion:
+    """Test suite for fixed_size_list conversion."""
+
+    def test_round_trip_with_nulls(self) -> None:
+        array = vectors_to_arrow([[1.0, 2.0], None, np.array([3.0, 4.0])], dim=2)
+
+        matrix, valid = vectors_from_arrow(array)
+
+        assert array.type == pa.list_(pa.float32(), 2)
+        assert array.null_count == 1
+        assert valid.tolist() == [True, False, True]
+        assert matrix.tolist() == [[1.0, 2.0], [0.0, 0.0], [3.0, 4.0]]
+
+    def test_reads_without_copy(self) -> None:
+        array = vectors_to_arrow([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]], dim=2)
+        sliced = pa.chunked_array([array.slice(1)])
+
+        matrix, valid = vectors_from_arrow(sliced)
+
+        assert valid.all()
+        assert matrix.tolist() == [[3.0, 4.0], [5.0, 6.0]]
+        assert not matrix.flags.owndata
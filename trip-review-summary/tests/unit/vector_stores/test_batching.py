@@ -0,0 +1,91 @@
+"""Unit tests for coalescing concurrent Qdrant searches."""
+
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture, MockType
+from qdrant_client import models
+from qdrant_client.conversions.common_types import QueryResponse
+
+from review_summary.vector_stores.batching import QueryBatcher
+
+
+@pytest.fixture
+def client(mocker: MockerFixture) -> MockType:
+    async def _query_batch_points(
+        collection_name: str, requests: list[models.QueryRequest]
+    ) -> list[QueryResponse]:
+        await asyncio.sleep(0)
+        return [
+            QueryResponse(
+                points=[models.ScoredPoint(id=request.limit or 0, version=0, score=1.0)]
+            )
+            for request in requests
+        ]
+
+    client: MockType = mocker.MagicMock()
+    client.query_batch_points = mocker.AsyncMock(side_effect=_query_batch_points)
+    return client
+
+
+class TestQueryBatcher:
+    """Test suite for QueryBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_concurrent_searches(self, client: MockType) -> None:
+        batcher = QueryBatcher(client, "entities", batch_window=0.01)
+
+        results = await asyncio.gather(
+            *(batcher.query(models.QueryRequest(limit=limit)) for limit in (1, 2, 3))
+        )
+
+        assert [[point.id for point in points] for points in results] == [[1], [2], [3]]
+        client.query_batch_points.assert_awaited_once()
+        assert len(client.query_batch_points.await_args.kwargs["requests"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_splits_at_max_batch_size(self, client: MockType) -> None:
+        batcher = QueryBatcher(client, "entities", batch_window=10, max_batch_size=2)
+
+        results = await asyncio.gather(
+            *(batcher.query(models.QueryRequest(limit=limit)) for limit in (1, 2))
+        )
+
+        assert len(results) == 2
+        client.query_batch_points.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_without_window_sends_alone(self, client: MockType) -> None:
+        batcher = QueryBatcher(client, "entities", batch_window=None)
+
+        await asyncio.gather(
+            *(batcher.query(models.QueryRequest(limit=limit)) for limit in (1, 2))
+        )
+
+        assert client.query_batch_points.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_propagates_errors(self, client: MockType) -> None:
+        client.query_batch_points.side_effect = RuntimeError("unavailable")
+        batcher = QueryBatcher(client, "entities", batch_window=0)
+
+        results = await asyncio.gather(
+            batcher.query(models.QueryRequest(limit=1)),
+            batcher.query(models.QueryRequest(limit=2)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_skips_cancelled_searches(self, client: MockType) -> None:
+        batcher = QueryBatcher(client, "entities", batch_window=0.01)
+
+        cancelled = asyncio.create_task(batcher.query(models.QueryRequest(limit=1)))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        points = await batcher.query(models.QueryRequest(limit=2))
+
+        assert [point.id for point in points] == [2]
+        requests = client.query_batch_points.await_args.kwargs["requests"]
+        assert [request.limit for request in requests] == [2]
@@ -0,0 +1,100 @@
+"""Unit tests for Qdrant collection options and migration."""
+
+import pytest
+from pytest_mock import MockerFixture, MockType
+from qdrant_client import AsyncQdrantClient, models
+
+from review_summary.config.embedding import CollectionConfig, EmbeddingProfile
+from review_summary.vector_stores.entity import EntityVectorStore
+from review_summary.vector_stores.text_unit import TextUnitVectorStore
+
+
+@pytest.fixture
+def client(mocker: MockerFixture) -> MockType:
+    client: MockType = mocker.MagicMock()
+    client.collection_exists = mocker.AsyncMock(return_value=True)
+    client.update_collection = mocker.AsyncMock()
+    client.create_payload_index = mocker.AsyncMock()
+    client.get_collection = mocker.AsyncMock(
+        return_value=mocker.MagicMock(
+            payload_schema={"attributes.target_type": mocker.MagicMock()}
+        )
+    )
+    return client
+
+
+class TestCollectionConfig:
+    """Test suite for CollectionConfig."""
+
+    def test_scalar_quantization_rescores(self) -> None:
+        config = CollectionConfig()
+
+        quantization = config.quantization_config()
+        search_params = config.search_params()
+
+        assert isinstance(quantization, models.ScalarQuantization)
+        assert quantization.scalar.type == models.ScalarType.INT8
+        assert search_params is not None
+        assert search_params.quantization == models.QuantizationSearchParams(
+            rescore=True, oversampling=2.0
+        )
+        assert config.vector_params(8).on_disk is True
+
+    def test_without_quantization_uses_defaults(self) -> None:
+        config = CollectionConfig(quantization="none")
+
+        assert config.quantization_config() is None
+        assert config.search_params() is None
+        assert CollectionConfig(quantization="none", hnsw_ef=64).search_params() == (
+            models.SearchParams(hnsw_ef=64)
+        )
+
+
+class TestMigrateCollection:
+    """Test suite for migrating existing collections."""
+
+    @pytest.mark.asyncio
+    async def test_entity_collection(self, client: MockType) -> None:
+        config = CollectionConfig(quantization="binary")
+
+        await EntityVectorStore.migrate(client, config)
+
+        kwargs = client.update_collection.await_args.kwargs
+        assert set(kwargs["vectors_config"]) == {"description", "title"}
+        assert isinstance(kwargs["quantization_config"], models.BinaryQuantization)
+        created = [
+            call.kwargs["field_name"]
+            for call in client.create_payload_index.await_args_list
+        ]
+        # The existing target_type index is kept as is
+        assert created == ["attributes.target_id", EntityVectorStore.INDEX_VERSION_KEY]
+
+    @pytest.mark.asyncio
+    async def test_disables_quantization(self, client: MockType) -> None:
+        await TextUnitVectorStore.migrate(client, CollectionConfig(quantization="none"))
+
+        kwargs = client.update_collection.await_args.kwargs
+        assert set(kwargs["vectors_config"]) == {""}
+        assert kwargs["quantization_config"] == models.Disabled.DISABLED
+
+    @pytest.mark.asyncio
+    async def test_skips_missing_collection(self, client: MockType) -> None:
+        client.collection_exists.return_value = False
+
+        await TextUnitVectorStore.migrate(client)
+
+        client.update_collection.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_with_quantization() -> None:
+    client = AsyncQdrantClient(":memory:")
+
+    store = await TextUnitVectorStore.create_vector_store(
+        client, profile=EmbeddingProfile(dimensions=4)
+    )
+
+    info = await client.get_collection(store.collection_name)
+    assert isinstance(info.config.params.vectors, models.VectorParams)
+    assert info.config.params.vectors.on_disk is True
+    assert store.search_params is not None
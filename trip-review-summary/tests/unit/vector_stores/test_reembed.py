@@ -0,0 +1,99 @@
+"""Unit tests for re-embedding collections into another embedding profile."""
+
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+from pytest_mock import MockerFixture
+from qdrant_client import AsyncQdrantClient, models
+
+from review_summary.config.embedding import CollectionConfig, EmbeddingProfile
+from review_summary.vector_stores.entity import EntityVectorStore
+from review_summary.vector_stores.reembed import reembed_collections
+from review_summary.vector_stores.text_unit import TextUnitVectorStore
+
+SOURCE = EmbeddingProfile(dimensions=4)
+TARGET = EmbeddingProfile(dimensions=2, dtype="float16")
+CONFIG = CollectionConfig(quantization="none")
+
+
+@pytest.fixture
+def embed_text(mocker: MockerFixture) -> Any:
+    async def _embed(
+        texts: list[str], embedding_model_config: dict[str, Any]
+    ) -> list[npt.NDArray[np.float32]]:
+        assert embedding_model_config["dimensions"] == 2
+        return [np.array([len(text), 1.0], dtype=np.float32) for text in texts]
+
+    return mocker.patch(
+        "review_summary.vector_stores.reembed.embed_text", side_effect=_embed
+    )
+
+
+class TestReembedCollections:
+    """Test suite for reembed_collections."""
+
+    @pytest.mark.asyncio
+    async def test_copies_points_into_target_collections(self, embed_text: Any) -> None:
+        client = AsyncQdrantClient(":memory:")
+        entity_store = await EntityVectorStore.create_vector_store(
+            client, CONFIG, SOURCE
+        )
+        text_unit_store = await TextUnitVectorStore.create_vector_store(
+            client, CONFIG, SOURCE
+        )
+        entity_id = "0198c2a4-0000-7000-8000-000000000001"
+        text_unit_id = "0198c2a4-0000-7000-8000-000000000002"
+        await client.upsert(
+            entity_store.collection_name,
+            points=[
+                models.PointStruct(
+                    id=entity_id,
+                    vector={"description": [0.1, 0.2, 0.3, 0.4]},
+                    payload={"title": "LAKE", "description": "A calm lake"},
+                )
+            ],
+        )
+        await client.upsert(
+            text_unit_store.collection_name,
+            points=[
+                models.PointStruct(
+                    id=text_unit_id,
+                    vector=[0.4, 0.3, 0.2, 0.1],
+                    payload={"text": "Great view"},
+                )
+            ],
+        )
+
+        await reembed_collections(client, SOURCE, TARGET)
+
+        target_entity_store = EntityVectorStore(client, CONFIG, TARGET)
+        [entity] = await client.retrieve(
+            target_entity_store.collection_name, [entity_id], with_vectors=True
+        )
+        # Only the description vector existed in the source point
+        assert isinstance(entity.vector, dict)
+        assert set(entity.vector) == {"description"}
+        assert entity.vector["description"] == pytest.approx([0.9957, 0.0905], 1e-3)
+        assert entity.payload == {"title": "LAKE", "description": "A calm lake"}
+
+        target_text_unit_store = TextUnitVectorStore(client, CONFIG, TARGET)
+        info = await client.get_collection(target_text_unit_store.collection_name)
+        assert isinstance(info.config.params.vectors, models.VectorParams)
+        assert info.config.params.vectors.size == 2
+        assert info.points_count == 1
+        # The source collections are left in place
+        assert (
+            await client.get_collection(text_unit_store.collection_name)
+        ).points_count == 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_same_collections(self, embed_text: Any) -> None:
+        client = AsyncQdrantClient(":memory:")
+
+        with pytest.raises(ValueError):
+            await reembed_collections(
+                client, EmbeddingProfile(), EmbeddingProfile(dimensions=3072)
+            )
+        embed_text.assert_not_called()